@@ -1,20 +1,112 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
+import asyncio
+import base64
+import hashlib
+import json
 import time
 import sys
 import os
 
 sys.path.append(os.path.dirname(__file__))
 
-from src.graph import build_medical_graph
-from src.data.patient_database import PATIENTS, get_patient
+from src.batch import BatchStats, cohort_patient_ids, run_batch
+from src.checkpoints import (
+    AnalysisRunningError,
+    analysis_config,
+    analysis_status,
+    checkpoint_ttl,
+    claim_analysis,
+    delete_analysis,
+    prepare_rerun,
+    prepare_resume,
+    prune_analyses
+)
+from src.graph import initial_state
+from src.http_clients import CONNECTION_STATS, close_http_clients
+from src.jobs import Job, JobQueue, JobStore
+from src.llm_cache import get_llm_cache
+from src.registry import aclose as registry_aclose, get_resumable_graph, warm_up
+from src.resilience import (
+    CircuitOpenError,
+    ainvoke_resumable,
+    astream_resumable,
+    get_llm_breaker,
+    with_thread_id
+)
+from src.singleflight import SingleFlight
+from src.streaming import format_sse
+from src.telemetry import METRICS, SpanCollector
+from src.data.patient_database import (
+    count_patients,
+    get_patient,
+    get_patient_version,
+    list_patients_page,
+    patients_revision,
+    record_version
+)
+from src.data.medications import interaction_report
+
+# Concurrent /api/analyze calls for the same patient record and intake mode
+# share one pipeline run (ANALYZE_COALESCE=0 turns this off).
+ANALYZE_COALESCE = os.getenv("ANALYZE_COALESCE", "1") not in ("0", "false", "no")
+analysis_flights = SingleFlight("analyze")
+
+# Expired analysis checkpoints and finished jobs are deleted this often.
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+async def prune_expired(job_store: JobStore) -> None:
+    """Delete analyses past CHECKPOINT_TTL_HOURS and jobs past JOB_TTL_HOURS, periodically."""
+    while True:
+        try:
+            analyses = await prune_analyses(get_resumable_graph().checkpointer, checkpoint_ttl())
+            jobs = job_store.prune(float(os.getenv("JOB_TTL_HOURS", "168")) * 3600)
+            if analyses or jobs:
+                print(f"Pruned {analyses} expired analyses and {jobs} finished jobs")
+        except Exception as e:
+            print(f"Pruning failed: {str(e)}")
+        await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        timings = warm_up()
+        print(
+            "Warm-up complete: "
+            + ", ".join(f"{name} {ms:.1f}ms" for name, ms in timings.items())
+        )
+    except Exception as e:
+        print(f"Warm-up failed, graph will be built on first request: {str(e)}")
+
+    app.state.job_queue = JobQueue(
+        JobStore(os.getenv("JOB_DB_PATH", "jobs.sqlite3")),
+        run_analysis_job,
+        concurrency=int(os.getenv("JOB_WORKERS", "4"))
+    )
+    recovered = await app.state.job_queue.start()
+    if recovered:
+        print(f"Re-queued {recovered} unfinished analysis job(s)")
+    pruner = asyncio.create_task(prune_expired(app.state.job_queue.store))
+
+    yield
+
+    pruner.cancel()
+    await asyncio.gather(pruner, return_exceptions=True)
+    await app.state.job_queue.stop()
+    await close_http_clients()
+    await registry_aclose()
+
 
 app = FastAPI(
     title="Medical AI Assistant API",
     description="Multi-agent medical diagnosis system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -23,6 +115,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Analysis-Id"],
 )
 
 class PatientBasic(BaseModel):
@@ -43,10 +136,69 @@ class PatientDetailed(BaseModel):
     recent_labs: dict
     visit_history: List[dict]
 
+PATIENT_FIELDS = list(PatientDetailed.model_fields)
+DEFAULT_PATIENT_FIELDS = list(PatientBasic.model_fields)
+
+class PatientPage(BaseModel):
+    items: List[dict]
+    next_cursor: Optional[str] = None
+
+class NormalizedMedication(BaseModel):
+    raw: str
+    names: List[str]
+    dose: Optional[str] = None
+    frequency: Optional[str] = None
+
+class DrugInteraction(BaseModel):
+    drug_a: str
+    drug_b: str
+    severity: str
+    description: str
+
+class InteractionReport(BaseModel):
+    patient_id: str
+    medications: List[NormalizedMedication]
+    unrecognized: List[str]
+    interactions: List[DrugInteraction]
+
 class AnalysisRequest(BaseModel):
     patient_id: str
+    intake_mode: Literal["llm", "template"] = "llm"
+
+class BatchAnalysisRequest(BaseModel):
+    patient_ids: Optional[List[str]] = None
+    condition: Optional[str] = None
+    concurrency: int = Field(4, ge=1, le=32)
+    intake_mode: Literal["llm", "template"] = "llm"
+
+class JobSubmission(BaseModel):
+    job_id: str
+    status: str
+    coalesced: bool
+
+class JobStatus(BaseModel):
+    id: str
+    patient_id: str
+    record_version: Optional[str] = None
+    intake_mode: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+class TimingSpan(BaseModel):
+    id: str
+    parent_id: Optional[str] = None
+    kind: Literal["graph", "node", "llm", "tool"]
+    name: str
+    node: Optional[str] = None
+    start_ms: float
+    duration_ms: float
+    attributes: dict = {}
 
 class AnalysisResponse(BaseModel):
+    analysis_id: Optional[str] = None
     patient_info: PatientDetailed
     intake_summary: str
     diagnosis: str
@@ -55,6 +207,127 @@ class AnalysisResponse(BaseModel):
     search_results: Optional[str] = None
     processing_time: float
     agent_logs: List[str]
+    spans: List[TimingSpan] = []
+    coalesced: bool = False
+
+class AnalysisStatus(BaseModel):
+    analysis_id: str
+    patient_id: Optional[str] = None
+    status: Literal["complete", "incomplete", "running"]
+    next_nodes: List[str]
+    completed_stages: List[str]
+    updated_at: Optional[str] = None
+
+class RerunRequest(BaseModel):
+    stage: Literal["diagnosis", "care_plan"] = "care_plan"
+    clinician_notes: Optional[str] = None
+
+
+def build_patient_detailed(patient: dict) -> PatientDetailed:
+    return PatientDetailed(
+        id=patient["id"],
+        name=patient["name"],
+        age=patient["age"],
+        sex=patient["sex"],
+        conditions=patient["conditions"],
+        medications=patient["medications"],
+        allergies=patient["allergies"],
+        recent_labs=patient["recent_labs"],
+        visit_history=patient["visit_history"]
+    )
+
+def build_analysis_response(
+    patient: dict,
+    result: dict,
+    processing_time: float,
+    spans: Optional[List[dict]] = None,
+    analysis_id: Optional[str] = None
+) -> AnalysisResponse:
+    return AnalysisResponse(
+        analysis_id=analysis_id,
+        patient_info=build_patient_detailed(patient),
+        intake_summary=result.get("intake_summary", ""),
+        diagnosis=result.get("diagnosis", ""),
+        care_plan=result.get("care_plan", ""),
+        drug_interactions=result.get("drug_interactions"),
+        search_results=result.get("search_results"),
+        processing_time=processing_time,
+        agent_logs=result.get("messages", []),
+        spans=spans or []
+    )
+
+def analysis_error(e: Exception, collector: SpanCollector, analysis_id: str) -> HTTPException:
+    """Map a failed run to an HTTP error that carries the analysis ID for resuming."""
+    collector.finish("error")
+    headers = {"X-Analysis-Id": analysis_id}
+    if isinstance(e, CircuitOpenError):
+        print(f"Analysis rejected: {str(e)}")
+        headers["Retry-After"] = str(max(1, round(e.retry_after)))
+        return HTTPException(status_code=503, detail=f"Analysis failed: {str(e)}", headers=headers)
+    print(f"Error during analysis {analysis_id}: {str(e)}")
+    return HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}", headers=headers)
+
+async def continue_analysis(analysis_id: str, config: dict, collector: SpanCollector) -> AnalysisResponse:
+    """Run a stored analysis on from its checkpoint and build the response."""
+    start_time = time.time()
+    try:
+        result = await ainvoke_resumable(get_resumable_graph(), None, config=config)
+    except Exception as e:
+        raise analysis_error(e, collector, analysis_id)
+    patient = result.get("patient_record") or get_patient(result.get("patient_id", ""))
+    if not patient:
+        collector.finish("error")
+        raise HTTPException(status_code=404, detail=f"Patient for analysis {analysis_id} not found")
+    processing_time = time.time() - start_time
+    spans = collector.finish()
+    print(f"Analysis {analysis_id} continued in {processing_time:.2f}s: {collector.summary()}")
+    return build_analysis_response(patient, result, processing_time, spans, analysis_id)
+
+async def run_analysis_job(job: Job, publish) -> dict:
+    start_time = time.time()
+    collector = SpanCollector()
+    graph = get_resumable_graph()
+    config = analysis_config(job.id, {"callbacks": [collector]})
+
+    # A job re-queued after a restart continues its own checkpoint thread
+    # (the job ID) with the record it started on.
+    snapshot = await graph.aget_state(analysis_config(job.id))
+    if snapshot.values:
+        patient = snapshot.values.get("patient_record") or get_patient(job.patient_id)
+        inputs = None
+    else:
+        patient = get_patient(job.patient_id)
+        inputs = initial_state(job.patient_id, patient_record=patient, intake_mode=job.intake_mode)
+    if not patient:
+        raise ValueError(f"Patient {job.patient_id} not found")
+    if job.record_version is not None and record_version(patient) != job.record_version:
+        raise ValueError(
+            f"Patient {job.patient_id}'s record changed after the job was submitted "
+            f"(version {job.record_version}, now {record_version(patient)}); submit a new job"
+        )
+
+    if snapshot.values and not snapshot.next:
+        # The pipeline finished before the restart; only the job row was not updated.
+        response = build_analysis_response(
+            patient, snapshot.values, time.time() - start_time, collector.finish(), job.id
+        )
+        return response.model_dump()
+
+    async for event in astream_resumable(graph, inputs, config=config):
+        if event["type"] == "result":
+            response = build_analysis_response(
+                patient, event["state"], time.time() - start_time, collector.finish(), job.id
+            )
+            return response.model_dump()
+        publish({"job_id": job.id, **event})
+    collector.finish("error")
+    raise RuntimeError("Pipeline finished without a result")
+
+def get_job_or_404(job_id: str) -> Job:
+    job = app.state.job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 
 @app.get("/")
@@ -65,18 +338,63 @@ def root():
         "status": "running"
     }
 
-@app.get("/api/patients", response_model=List[PatientBasic])
-def list_patients():
-    patients = []
-    for patient_data in PATIENTS.values():
-        patients.append(PatientBasic(
-            id=patient_data["id"],
-            name=patient_data["name"],
-            age=patient_data["age"],
-            sex=patient_data["sex"],
-            conditions=patient_data["conditions"]
-        ))
-    return patients
+@app.get("/api/patients", response_model=PatientPage)
+def list_patients(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    condition: Optional[str] = None,
+    min_age: Optional[int] = Query(None, ge=0),
+    max_age: Optional[int] = Query(None, ge=0),
+    sex: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else DEFAULT_PATIENT_FIELDS
+    unknown = [f for f in selected if f not in PATIENT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(PATIENT_FIELDS)}"
+        )
+
+    # The ETag covers the store revision and the query, so it is known
+    # before touching any records and unchanged pages cost no query at all.
+    etag_source = json.dumps(
+        [patients_revision(), cursor, limit, condition, min_age, max_age, sex, selected]
+    )
+    etag = f'W/"{hashlib.sha1(etag_source.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    try:
+        after = base64.urlsafe_b64decode(cursor.encode()).decode() if cursor else None
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        patients, has_more = list_patients_page(
+            after=after,
+            limit=limit,
+            condition=condition,
+            min_age=min_age,
+            max_age=max_age,
+            sex=sex
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers.update(headers)
+    return PatientPage(
+        items=[{f: p[f] for f in selected} for p in patients],
+        next_cursor=(
+            base64.urlsafe_b64encode(patients[-1]["id"].encode()).decode()
+            if has_more else None
+        )
+    )
 
 @app.get("/api/patient/{patient_id}", response_model=PatientDetailed)
 def get_patient_details(patient_id: str):
@@ -85,76 +403,274 @@ def get_patient_details(patient_id: str):
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient {patient_id} not found")
     
-    return PatientDetailed(
-        id=patient["id"],
-        name=patient["name"],
-        age=patient["age"],
-        sex=patient["sex"],
-        conditions=patient["conditions"],
-        medications=patient["medications"],
-        allergies=patient["allergies"],
-        recent_labs=patient["recent_labs"],
-        visit_history=patient["visit_history"]
+    return build_patient_detailed(patient)
+
+@app.get("/api/patient/{patient_id}/interactions", response_model=InteractionReport)
+def get_patient_interactions(patient_id: str):
+    patient = get_patient(patient_id)
+
+    if not patient:
+        raise HTTPException(status_code=404, detail=f"Patient {patient_id} not found")
+
+    report = interaction_report(patient["medications"])
+    return InteractionReport(
+        patient_id=patient_id,
+        medications=[
+            NormalizedMedication(raw=m.raw, names=list(m.names), dose=m.dose, frequency=m.frequency)
+            for m in report["medications"]
+        ],
+        unrecognized=report["unrecognized"],
+        interactions=[DrugInteraction(**ix) for ix in report["interactions"]]
     )
 
-@app.post("/api/analyze", response_model=AnalysisResponse)
-async def analyze_patient(request: AnalysisRequest):
+async def run_analysis(patient: dict, intake_mode: str) -> AnalysisResponse:
     start_time = time.time()
-    
+    collector = SpanCollector()
+    config = with_thread_id({"callbacks": [collector]})
+    analysis_id = config["configurable"]["thread_id"]
+
     try:
-        patient = get_patient(request.patient_id)
-        if not patient:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Patient {request.patient_id} not found"
-            )
+        print(f"Starting analysis for patient {patient['id']}...")
+        graph = get_resumable_graph()
         
-        print(f"Starting analysis for patient {request.patient_id}...")
-        graph = build_medical_graph()
-        
-        result = graph.invoke({
-            "patient_input": request.patient_id,
-            "messages": []
-        })
+        result = await ainvoke_resumable(graph, initial_state(
+            patient["id"],
+            patient_record=patient,
+            intake_mode=intake_mode
+        ), config=config)
         
         processing_time = time.time() - start_time
-        print(f"Analysis complete in {processing_time:.2f}s")
+        spans = collector.finish()
+        print(f"Analysis complete in {processing_time:.2f}s: {collector.summary()}")
         
-        return AnalysisResponse(
-            patient_info=PatientDetailed(
-                id=patient["id"],
-                name=patient["name"],
-                age=patient["age"],
-                sex=patient["sex"],
-                conditions=patient["conditions"],
-                medications=patient["medications"],
-                allergies=patient["allergies"],
-                recent_labs=patient["recent_labs"],
-                visit_history=patient["visit_history"]
-            ),
-            intake_summary=result.get("intake_summary", ""),
-            diagnosis=result.get("diagnosis", ""),
-            care_plan=result.get("care_plan", ""),
-            drug_interactions=result.get("drug_interactions"),
-            search_results=result.get("search_results"),
-            processing_time=processing_time,
-            agent_logs=result.get("messages", [])
-        )
+        return build_analysis_response(patient, result, processing_time, spans, analysis_id)
     
-    except HTTPException:
-        raise
     except Exception as e:
-        print(f"Error during analysis: {str(e)}")
+        raise analysis_error(e, collector, analysis_id)
+
+@app.post("/api/analyze", response_model=AnalysisResponse)
+async def analyze_patient(request: AnalysisRequest):
+    patient = get_patient(request.patient_id)
+    if not patient:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Patient {request.patient_id} not found"
+        )
+    if not ANALYZE_COALESCE:
+        return await run_analysis(patient, request.intake_mode)
+
+    # Keyed on the record this run will analyze, not a second lookup that
+    # could already see a newer version.
+    key = (request.patient_id, record_version(patient), request.intake_mode)
+    response, coalesced = await analysis_flights.do(
+        key, lambda: run_analysis(patient, request.intake_mode)
+    )
+    if coalesced:
+        print(f"Analysis request for patient {request.patient_id} joined the run in flight")
+        return response.model_copy(update={"coalesced": True})
+    return response
+
+@app.post("/api/analyze/stream")
+async def analyze_patient_stream(request: AnalysisRequest):
+    patient = get_patient(request.patient_id)
+    if not patient:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Patient {request.patient_id} not found"
+        )
+
+    async def event_stream():
+        start_time = time.time()
+        collector = SpanCollector()
+        config = with_thread_id({"callbacks": [collector]})
+        analysis_id = config["configurable"]["thread_id"]
+        yield format_sse({"type": "start", "patient_id": request.patient_id, "analysis_id": analysis_id})
+
+        try:
+            async for event in astream_resumable(get_resumable_graph(), initial_state(
+                request.patient_id,
+                patient_record=patient,
+                intake_mode=request.intake_mode
+            ), config=config):
+                if event["type"] == "result":
+                    response = build_analysis_response(
+                        patient, event["state"], time.time() - start_time, collector.finish(), analysis_id
+                    )
+                    yield format_sse({"type": "complete", **response.model_dump()})
+                else:
+                    yield format_sse(event)
+        except Exception as e:
+            collector.finish("error")
+            print(f"Error during streamed analysis: {str(e)}")
+            yield format_sse({"type": "error", "detail": f"Analysis failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/analyze/batch")
+async def analyze_patient_batch(request: BatchAnalysisRequest):
+    if not request.patient_ids and not request.condition:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide patient_ids or a condition to select the cohort"
+        )
+
+    patient_ids = request.patient_ids or cohort_patient_ids(request.condition)
+
+    async def result_lines():
+        stats = BatchStats()
+        async for outcome in run_batch(
+            patient_ids,
+            concurrency=request.concurrency,
+            intake_mode=request.intake_mode,
+            stats=stats
+        ):
+            if outcome["status"] == "ok":
+                state = outcome["state"]
+                line = {
+                    "type": "result",
+                    "patient_id": outcome["patient_id"],
+                    "stage_ms": outcome["stage_ms"],
+                    "analysis": build_analysis_response(
+                        state["patient_record"], state, outcome["duration_ms"] / 1000,
+                        analysis_id=outcome["analysis_id"]
+                    ).model_dump()
+                }
+            else:
+                line = {
+                    "type": "error",
+                    "patient_id": outcome["patient_id"],
+                    "detail": outcome["error"]
+                }
+            yield json.dumps(line, default=str) + "\n"
+        yield json.dumps({"type": "summary", **stats.summary()}) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+@app.post("/api/jobs", response_model=JobSubmission, status_code=202)
+async def submit_analysis_job(request: AnalysisRequest):
+    version = get_patient_version(request.patient_id)
+    if version is None:
         raise HTTPException(
-            status_code=500, 
-            detail=f"Analysis failed: {str(e)}"
+            status_code=404,
+            detail=f"Patient {request.patient_id} not found"
         )
 
+    job, coalesced = app.state.job_queue.submit(request.patient_id, version, request.intake_mode)
+    return JobSubmission(job_id=job.id, status=job.status, coalesced=coalesced)
+
+@app.get("/api/analyses/{analysis_id}", response_model=AnalysisStatus)
+async def get_analysis_status(analysis_id: str):
+    status = await analysis_status(get_resumable_graph(), analysis_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Analysis {analysis_id} not found")
+    return AnalysisStatus(**status)
+
+@app.post("/api/analyses/{analysis_id}/resume", response_model=AnalysisResponse)
+async def resume_analysis(analysis_id: str):
+    collector = SpanCollector()
+    try:
+        with claim_analysis(analysis_id):
+            config = await prepare_resume(get_resumable_graph(), analysis_id)
+            print(f"Resuming analysis {analysis_id}...")
+            return await continue_analysis(analysis_id, {**config, "callbacks": [collector]}, collector)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Analysis {analysis_id} not found")
+    except (AnalysisRunningError, ValueError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.post("/api/analyses/{analysis_id}/rerun", response_model=AnalysisResponse)
+async def rerun_analysis(analysis_id: str, request: RerunRequest):
+    collector = SpanCollector()
+    updates = {"clinician_notes": request.clinician_notes} if request.clinician_notes is not None else {}
+    try:
+        # Claimed before the stored state is rewound, not only for the run.
+        with claim_analysis(analysis_id):
+            config = await prepare_rerun(get_resumable_graph(), analysis_id, request.stage, updates)
+            print(f"Re-running analysis {analysis_id} from {request.stage}...")
+            return await continue_analysis(analysis_id, {**config, "callbacks": [collector]}, collector)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Analysis {analysis_id} not found")
+    except (AnalysisRunningError, ValueError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.delete("/api/analyses/{analysis_id}", status_code=204)
+async def delete_stored_analysis(analysis_id: str):
+    graph = get_resumable_graph()
+    try:
+        with claim_analysis(analysis_id):
+            if await analysis_status(graph, analysis_id) is None:
+                raise HTTPException(status_code=404, detail=f"Analysis {analysis_id} not found")
+            await delete_analysis(graph.checkpointer, analysis_id)
+    except AnalysisRunningError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/api/jobs/stats")
+def job_stats():
+    return app.state.job_queue.stats()
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+def get_job_status(job_id: str):
+    return JobStatus(**get_job_or_404(job_id).summary())
+
+@app.get("/api/jobs/{job_id}/result", response_model=AnalysisResponse)
+def get_job_result(job_id: str):
+    job = get_job_or_404(job_id)
+
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {job.error}")
+    if not job.done:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+
+    return job.result
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    get_job_or_404(job_id)
+
+    async def event_stream():
+        async for event in app.state.job_queue.subscribe(job_id):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "backend": type(cache).__name__,
+        "entries": len(cache),
+        **cache.stats.as_dict()
+    }
+
+@app.delete("/api/cache/patients/{patient_id}")
+def invalidate_patient_cache(patient_id: str):
+    cache = get_llm_cache()
+    removed = cache.invalidate_patient(patient_id) if cache is not None else 0
+    return {"patient_id": patient_id, "entries_removed": removed}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 def health_check():
     return {
         "status": "healthy",
-        "patients_available": len(PATIENTS),
+        "patients_available": count_patients(),
+        "llm_connections": CONNECTION_STATS.summary(),
+        "llm_circuit": get_llm_breaker().snapshot(),
+        "analyze_coalescing": analysis_flights.stats(),
         "timestamp": time.time()
     }
 
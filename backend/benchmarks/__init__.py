@@ -0,0 +1 @@
+"""Micro-benchmarks for the medical pipeline. Run from ``backend/``."""
@@ -0,0 +1,197 @@
+"""Benchmark per-worker memory of the memory-mapped article store against ARTICLES dicts.
+
+Writes a synthetic corpus (bench_literature_search's generator) to an
+``ArticleStore`` on disk, then measures fresh worker processes, as uvicorn
+would start them:
+
+    dict   the corpus loaded as a list of article dicts plus the by-ID map,
+           the layout of ``ARTICLES`` / ``_ARTICLES_BY_ID``
+    store  ``ArticleStore`` opened in ``n_workers`` processes at once,
+           measured after serving random lookups (only hits are
+           materialized) and again after every row has been read once,
+           as building the BM25 index at startup does
+    serving the real worker startup: ``LITERATURE_STORE_PATH`` set and
+           ``medical_articles.build_indexes()`` called, as ``warm_up``
+           does, for BM25 only, for hybrid search embedding every article
+           (no saved ``LITERATURE_VECTOR_INDEX``), and for hybrid search
+           mapping the vectors that run saved
+
+The store itself costs a worker almost nothing; the search indexes built
+over it at startup are what dominate per-worker memory.
+
+Memory comes from /proc/self/smaps_rollup, minus an idle worker that has
+imported the same modules: RSS counts every resident page, PSS divides
+shared pages between the processes mapping them, and USS counts only the
+process's private pages, i.e. what each extra worker costs.
+
+Usage:
+    python -m benchmarks.bench_article_store [n_articles] [n_workers]
+    python -m benchmarks.bench_article_store 1000000 4
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_literature_search import synthetic_corpus
+from src.batch import percentile
+from src.data import medical_articles
+from src.data.article_store import ArticleStore, write_article_store
+
+N_LOOKUPS = 1000
+_CHUNK = 100_000
+
+
+def corpus(n: int):
+    """Yield ``n`` synthetic articles with unique IDs, generated a chunk at a time."""
+    for chunk, start in enumerate(range(0, n, _CHUNK)):
+        for i, article in enumerate(synthetic_corpus(min(_CHUNK, n - start), seed=7 + chunk)):
+            article["id"] = f"SYN-{start + i}"
+            yield article
+
+
+def memory() -> dict:
+    """Resident, proportional and private set sizes of this process, in MB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) / 1024
+    return {
+        "rss_mb": fields["Rss"],
+        "pss_mb": fields["Pss"],
+        "uss_mb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def _lookups(get, n_articles: int) -> dict:
+    rng = random.Random(1)
+    samples = []
+    for doc_id in (f"SYN-{rng.randrange(n_articles)}" for _ in range(N_LOOKUPS)):
+        start = time.perf_counter()
+        get(doc_id)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"lookup_p50_ms": percentile(samples, 50), "lookup_p95_ms": percentile(samples, 95)}
+
+
+def _idle_worker(path: str, results) -> None:
+    results.put(("idle", memory()))
+
+
+def _dict_worker(path: str, results) -> None:
+    start = time.perf_counter()
+    articles = list(ArticleStore(path))
+    by_id = {article["id"]: article for article in articles}
+    load_s = time.perf_counter() - start
+    gc.collect()
+    report = {"load_s": load_s, **_lookups(by_id.get, len(articles)), **memory()}
+    results.put(("dict", report))
+
+
+def _store_worker(path: str, results, barrier) -> None:
+    start = time.perf_counter()
+    store = ArticleStore(path)
+    load_s = time.perf_counter() - start
+    report = {"load_s": load_s, **_lookups(store.get, len(store)), **memory()}
+    for _ in store:
+        pass
+    barrier.wait()  # every worker has the whole corpus mapped before measuring
+    results.put(("store", {"lookups": report, "scanned": memory()}))
+    barrier.wait()
+
+
+def _serving_worker(path: str, vector_dir: str, search: str, results) -> None:
+    os.environ.update(
+        LITERATURE_STORE_PATH=path, LITERATURE_VECTOR_INDEX=vector_dir, LITERATURE_SEARCH=search
+    )
+    start = time.perf_counter()
+    medical_articles.build_indexes()
+    build_s = time.perf_counter() - start
+    gc.collect()
+    results.put(("serving", {"build_s": build_s, **memory()}))
+
+
+SERVING_CASES = [
+    ("bm25", "bm25"),
+    ("hybrid", "hybrid"),  # no saved vectors yet: embeds and saves them
+    ("mapped", "hybrid"),  # maps the vectors the previous case saved
+]
+
+
+def run(n_articles: int = 1_000_000, n_workers: int = 2) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    report: dict = {"n_articles": n_articles, "n_workers": n_workers}
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "articles")
+        start = time.perf_counter()
+        write_article_store(path, corpus(n_articles))
+        report["write_s"] = time.perf_counter() - start
+        report["file_mb"] = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 2**20
+
+        results = ctx.Queue()
+        for target in (_idle_worker, _dict_worker):
+            process = ctx.Process(target=target, args=(path, results))
+            process.start()
+            name, measured = results.get()
+            process.join()
+            report[name] = measured
+
+        barrier = ctx.Barrier(n_workers)
+        workers = [ctx.Process(target=_store_worker, args=(path, results, barrier)) for _ in range(n_workers)]
+        for process in workers:
+            process.start()
+        report["store"] = [results.get()[1] for _ in workers]
+        for process in workers:
+            process.join()
+
+        vector_dir = os.path.join(workdir, "vectors")
+        report["serving"] = {}
+        for case, search in SERVING_CASES:
+            process = ctx.Process(target=_serving_worker, args=(path, vector_dir, search, results))
+            process.start()
+            report["serving"][case] = results.get()[1]
+            process.join()
+
+    idle = report["idle"]
+    serving = list(report["serving"].values())
+    for measured in [report["dict"], *serving] + [m for s in report["store"] for m in s.values()]:
+        for key in ("rss_mb", "pss_mb", "uss_mb"):
+            measured[key] -= idle[key]
+    return report
+
+
+def _mean(rows: list[dict], key: str) -> float:
+    return sum(row[key] for row in rows) / len(rows)
+
+
+def main() -> None:
+    n_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    r = run(n_articles, n_workers)
+    d = r["dict"]
+    lookups = [s["lookups"] for s in r["store"]]
+    scanned = [s["scanned"] for s in r["store"]]
+    print(f"Corpus size:          {r['n_articles']:,} articles ({r['file_mb']:.0f} MB store, written in {r['write_s']:.1f} s)")
+    print(f"Per worker, above an idle worker ({r['idle']['rss_mb']:.0f} MB RSS):")
+    print(f"  dict layout:        RSS {d['rss_mb']:7.0f} MB  PSS {d['pss_mb']:7.0f} MB  USS {d['uss_mb']:7.0f} MB"
+          f"  load {d['load_s']:.1f} s")
+    print(f"  store, lookups:     RSS {_mean(lookups, 'rss_mb'):7.1f} MB  PSS {_mean(lookups, 'pss_mb'):7.1f} MB"
+          f"  USS {_mean(lookups, 'uss_mb'):7.1f} MB  open {_mean(lookups, 'load_s') * 1000:.1f} ms")
+    print(f"  store, full scan:   RSS {_mean(scanned, 'rss_mb'):7.0f} MB  PSS {_mean(scanned, 'pss_mb'):7.0f} MB"
+          f"  USS {_mean(scanned, 'uss_mb'):7.1f} MB  ({r['n_workers']} workers sharing the mapping)")
+    for case, m in r["serving"].items():
+        print(f"  {'serving ' + case + ':':<20}RSS {m['rss_mb']:7.0f} MB  PSS {m['pss_mb']:7.0f} MB"
+              f"  USS {m['uss_mb']:7.0f} MB  build_indexes {m['build_s']:.1f} s")
+    print(f"Lookup by ID:         dict p50 {d['lookup_p50_ms'] * 1000:.1f} us, "
+          f"store p50 {_mean(lookups, 'lookup_p50_ms') * 1000:.1f} us / p95 {_mean(lookups, 'lookup_p95_ms') * 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
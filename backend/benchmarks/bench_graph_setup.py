@@ -0,0 +1,75 @@
+"""Benchmark the per-request setup cost removed by the graph/LLM registry.
+
+Before the registry, every analysis compiled the graph, and every agent node
+constructed a fresh ``ChatOpenAI`` and re-bound its tool schemas. This script
+times that cold path against registry lookups. No network calls are made; a
+placeholder API key is used if none is configured.
+
+Usage:
+    python -m benchmarks.bench_graph_setup [iterations]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+
+from src import registry
+from src.agents import diagnosis, intake
+from src.config import get_llm
+from src.graph import build_medical_graph
+
+
+def cold_setup() -> None:
+    """Replicate the setup one analysis used to pay."""
+    build_medical_graph()
+    get_llm().bind_tools(intake.TOOLS)
+    get_llm().bind_tools(diagnosis.TOOLS)
+    get_llm()
+
+
+def warm_setup() -> None:
+    """The equivalent lookups through the registry."""
+    registry.get_graph()
+    registry.get_bound_llm(intake.TOOLS)
+    registry.get_bound_llm(diagnosis.TOOLS)
+    registry.get_shared_llm()
+
+
+def time_per_call(fn, iterations: int) -> float:
+    """Return the mean wall-clock time of ``fn`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def run(iterations: int = 50) -> dict:
+    registry.reset()
+    warm_up_ms = registry.warm_up()
+    cold_ms = time_per_call(cold_setup, iterations)
+    warm_ms = time_per_call(warm_setup, iterations * 100)
+    return {
+        "iterations": iterations,
+        "warm_up_ms": warm_up_ms,
+        "cold_setup_ms": cold_ms,
+        "registry_lookup_ms": warm_ms,
+        "saved_per_request_ms": cold_ms - warm_ms,
+    }
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    result = run(iterations)
+    print(f"One-time warm-up:          {sum(result['warm_up_ms'].values()):8.2f} ms")
+    print(f"Per-request setup (old):   {result['cold_setup_ms']:8.2f} ms")
+    print(f"Per-request registry:      {result['registry_lookup_ms']:8.4f} ms")
+    print(f"Saved per request:         {result['saved_per_request_ms']:8.2f} ms")
+    print(f"Saved per 1000 requests:   {result['saved_per_request_ms']:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
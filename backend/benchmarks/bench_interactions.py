@@ -0,0 +1,94 @@
+"""Benchmark the pair-indexed interaction check against the old list scan.
+
+Loads a synthetic interaction table of the requested size through
+``load_interactions`` and times ``check_interactions`` for regimens of
+several sizes, next to the original O(|interactions| x |meds|) scan.
+
+Usage:
+    python -m benchmarks.bench_interactions [n_interactions]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from src.data import drug_database
+from src.data.drug_database import INTERACTIONS, check_interactions, load_interactions
+
+REGIMEN_SIZES = [2, 5, 10, 20]
+
+
+def synthetic_interactions(n: int, n_drugs: int = 5000, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    drugs = [f"drug{i}" for i in range(n_drugs)]
+    rows = []
+    for _ in range(n):
+        drug_a, drug_b = rng.sample(drugs, 2)
+        rows.append({
+            "drug_a": drug_a,
+            "drug_b": drug_b,
+            "severity": rng.choice(["Minor", "Moderate", "Major"]),
+            "description": "Synthetic interaction.",
+        })
+    return rows
+
+
+def linear_check(interactions: list[dict], drug_names: list[str]) -> list[dict]:
+    """The original check_interactions implementation."""
+    normalized = [d.lower() for d in drug_names]
+    found = []
+    for interaction in interactions:
+        if interaction["drug_a"] in normalized and interaction["drug_b"] in normalized:
+            found.append(interaction)
+    return found
+
+
+def mean_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def run(n_interactions: int = 50_000) -> dict:
+    rows = synthetic_interactions(n_interactions)
+    original_count = len(INTERACTIONS)
+
+    start = time.perf_counter()
+    load_interactions(rows)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(3)
+    drugs = sorted(drug_database._ADJACENCY)
+    results = {"n_interactions": len(INTERACTIONS), "load_ms": load_ms, "regimens": []}
+    for size in REGIMEN_SIZES:
+        regimen = rng.sample(drugs, size)
+        assert sorted(map(id, check_interactions(regimen))) == sorted(map(id, linear_check(INTERACTIONS, regimen)))
+        results["regimens"].append({
+            "size": size,
+            "indexed_us": mean_us(lambda: check_interactions(regimen), 2000),
+            "linear_us": mean_us(lambda: linear_check(INTERACTIONS, regimen), 5),
+        })
+
+    del INTERACTIONS[original_count:]
+    drug_database._PAIR_INDEX.clear()
+    drug_database._ADJACENCY.clear()
+    for interaction in INTERACTIONS:
+        drug_database._index_interaction(interaction)
+    return results
+
+
+def main() -> None:
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    result = run(n_interactions)
+    print(f"Interaction rows:  {result['n_interactions']:,} (bulk load {result['load_ms']:.0f} ms)")
+    print(f"{'regimen':>8} {'indexed':>12} {'linear scan':>14} {'speedup':>9}")
+    for r in result["regimens"]:
+        print(f"{r['size']:>8} {r['indexed_us']:>10.2f}us {r['linear_us']:>12.0f}us "
+              f"{r['linear_us'] / r['indexed_us']:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
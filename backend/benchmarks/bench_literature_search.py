@@ -0,0 +1,124 @@
+"""Benchmark BM25 inverted-index search against the old linear substring scan.
+
+Generates a synthetic corpus of PubMed-style abstracts whose vocabulary is
+seeded from the real sample articles plus generated terms with a Zipf-like
+frequency distribution, then times both search strategies on the same
+queries.
+
+Usage:
+    python -m benchmarks.bench_literature_search [n_articles] [n_queries]
+    python -m benchmarks.bench_literature_search 1000000
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+import time
+
+from src.data.medical_articles import ARTICLES
+from src.data.search_index import BM25Index, tokenize
+
+QUERIES = [
+    "diabetes metformin",
+    "heart attack chest pain",
+    "pneumonia antibiotic",
+    "hypertension ACE inhibitor",
+    "asthma inhaled corticosteroid",
+    "chronic kidney disease eGFR",
+    "migraine triptan",
+    "depression SSRI",
+]
+
+
+def synthetic_corpus(n: int, seed: int = 7) -> list[dict]:
+    """Return ``n`` article dicts shaped like ``ARTICLES``."""
+    rng = random.Random(seed)
+    base_vocab = sorted({t for a in ARTICLES for t in tokenize(a["abstract"] + " " + a["title"])})
+    vocab = base_vocab + [f"term{i}" for i in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    rng.shuffle(weights)
+    cum_weights = list(itertools.accumulate(weights))
+
+    articles = []
+    for i in range(n):
+        words = rng.choices(vocab, cum_weights=cum_weights, k=60)
+        articles.append({
+            "id": f"SYN-{i}",
+            "title": " ".join(words[:8]),
+            "abstract": " ".join(words[8:]),
+            "keywords": words[:4],
+            "year": 2000 + i % 25,
+        })
+    return articles
+
+
+def linear_search(articles: list[dict], query: str) -> list[dict]:
+    """The original search_articles implementation."""
+    query_terms = query.lower().split()
+    results = []
+    for article in articles:
+        searchable = (
+            article["title"].lower()
+            + " "
+            + article["abstract"].lower()
+            + " "
+            + " ".join(article["keywords"]).lower()
+        )
+        if any(term in searchable for term in query_terms):
+            results.append(article)
+    return results
+
+
+def run(n_articles: int = 100_000, n_queries: int = 8) -> dict:
+    corpus = synthetic_corpus(n_articles)
+    queries = (QUERIES * (n_queries // len(QUERIES) + 1))[:n_queries]
+
+    start = time.perf_counter()
+    index = BM25Index()
+    for article in corpus:
+        index.add(article["id"], " ".join([article["title"], article["abstract"], " ".join(article["keywords"])]))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, 5)
+    bm25_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    for query in queries:
+        linear_search(corpus, query)
+    linear_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.add(f"NEW-{i}", corpus[i]["abstract"])
+    for i in range(1000):
+        index.remove(f"NEW-{i}")
+    update_us = (time.perf_counter() - start) * 1e6 / 2000
+
+    return {
+        "n_articles": n_articles,
+        "index_build_s": build_s,
+        "bm25_query_ms": bm25_ms,
+        "linear_query_ms": linear_ms,
+        "speedup": linear_ms / bm25_ms if bm25_ms else float("inf"),
+        "incremental_update_us": update_us,
+    }
+
+
+def main() -> None:
+    n_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    result = run(n_articles, n_queries)
+    print(f"Corpus size:            {result['n_articles']:,} articles")
+    print(f"Index build:            {result['index_build_s']:.2f} s")
+    print(f"BM25 top-5 query:       {result['bm25_query_ms']:.2f} ms")
+    print(f"Linear scan query:      {result['linear_query_ms']:.2f} ms")
+    print(f"Speedup:                {result['speedup']:.1f}x")
+    print(f"Incremental add/remove: {result['incremental_update_us']:.1f} us/op")
+
+
+if __name__ == "__main__":
+    main()
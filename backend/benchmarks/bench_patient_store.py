@@ -0,0 +1,112 @@
+"""Benchmark the SQLite patient store against the old in-memory dict scan.
+
+For each census size a synthetic population is bulk-loaded into a fresh
+on-disk ``PatientStore``; ID lookup and name/condition search latencies are
+measured next to the original ``PATIENTS`` dict implementation.
+
+Usage:
+    python -m benchmarks.bench_patient_store [size ...]
+    python -m benchmarks.bench_patient_store 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.data.patient_database import record_version
+from src.data.patient_store import PatientStore
+
+FIRST_NAMES = ["Maria", "James", "Aisha", "Robert", "Wei", "Fatima", "John", "Priya", "Carlos", "Emma"]
+LAST_NAMES = [f"Surname{i}" for i in range(5000)] + ["Garcia", "Chen", "Johnson", "Williams"]
+CONDITIONS = [
+    "Type 2 Diabetes Mellitus", "Hypertension", "Hyperlipidemia", "Asthma", "Atrial Fibrillation",
+    "Chronic Kidney Disease Stage 3a", "Major Depressive Disorder", "Chronic Migraine", "COPD",
+    "Osteoarthritis", "Hypothyroidism", "Heart Failure",
+] + [f"Rare Condition {i}" for i in range(500)]
+
+
+def synthetic_patients(n: int, seed: int = 5):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": f"P-{i:07d}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "age": rng.randint(18, 95),
+            "sex": rng.choice(["Female", "Male"]),
+            "conditions": rng.sample(CONDITIONS[:12], 1) + rng.sample(CONDITIONS[12:], 1),
+            "medications": ["metformin 1000mg BID", "lisinopril 20mg daily"],
+            "allergies": [],
+            "recent_labs": {"HbA1c": "7.1%", "eGFR": "70 mL/min/1.73m2"},
+            "visit_history": [{"date": "2025-11-15", "reason": "Follow-up", "notes": "Stable."}],
+        }
+
+
+def dict_search(patients: dict, query: str) -> list[dict]:
+    """The original search_patients implementation."""
+    query_lower = query.lower()
+    results = []
+    for patient in patients.values():
+        if query_lower in patient["name"].lower():
+            results.append(patient)
+            continue
+        if any(query_lower in c.lower() for c in patient["conditions"]):
+            results.append(patient)
+    return results
+
+
+def mean_ms(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / len(args_list)
+
+
+def run_size(n: int, workdir: str) -> dict:
+    path = os.path.join(workdir, f"patients_{n}.sqlite3")
+    store = PatientStore(path)
+
+    start = time.perf_counter()
+    store.bulk_load((p, record_version(p)) for p in synthetic_patients(n))
+    load_s = time.perf_counter() - start
+
+    rng = random.Random(1)
+    ids = [(f"P-{rng.randrange(n):07d}",) for _ in range(2000)]
+    names = [("Surname" + str(rng.randrange(5000)),) for _ in range(50)]
+    conditions = [("rare condition " + str(rng.randrange(500)), 20) for _ in range(50)]
+
+    result = {
+        "patients": n,
+        "bulk_load_s": load_s,
+        "db_size_mb": os.path.getsize(path) / 1e6,
+        "get_ms": mean_ms(store.get, ids),
+        "search_name_ms": mean_ms(store.search, names),
+        "search_condition_top20_ms": mean_ms(store.search, conditions),
+    }
+
+    patients = {p["id"]: p for p in synthetic_patients(n)}
+    result["dict_search_ms"] = mean_ms(lambda q: dict_search(patients, q), names[:5])
+    return result
+
+
+def run(sizes: list[int]) -> list[dict]:
+    with tempfile.TemporaryDirectory() as workdir:
+        return [run_size(n, workdir) for n in sizes]
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'patients':>10} {'load':>8} {'db MB':>7} {'get':>8} {'name':>8} {'cond top20':>11} {'dict scan':>10}")
+    for r in run(sizes):
+        print(
+            f"{r['patients']:>10,} {r['bulk_load_s']:>7.1f}s {r['db_size_mb']:>7.0f} "
+            f"{r['get_ms']:>6.3f}ms {r['search_name_ms']:>6.2f}ms "
+            f"{r['search_condition_top20_ms']:>9.2f}ms {r['dict_search_ms']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
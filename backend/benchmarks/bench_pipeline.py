@@ -0,0 +1,94 @@
+"""Benchmark the full pipeline offline and separate orchestration from model time.
+
+Runs ``build_medical_graph()`` end to end on the scripted chat model (no
+network, LLM cache disabled) at several concurrency levels. Each analysis is
+traced with ``SpanCollector``; orchestrator overhead is the graph span minus
+the time spent inside model calls, i.e. everything LangGraph, the agents,
+tools and callbacks add on top of the model.
+
+Usage:
+    python -m benchmarks.bench_pipeline [llm_latency_seconds] [concurrency ...]
+    python -m benchmarks.bench_pipeline 0 1 10 100
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from src import registry
+from src.batch import percentile
+from src.data.patient_database import get_patient
+from src.graph import initial_state
+from src.llm_cache import get_llm_cache, set_llm_cache
+from src.scripted_llm import ScriptedChatModel
+from src.telemetry import SpanCollector
+
+PATIENT_IDS = ["P-1001", "P-1002", "P-1003", "P-1004"]
+
+
+async def one_analysis(graph, patient_id: str) -> tuple[float, float]:
+    """Return (end-to-end ms, model ms) for one traced analysis."""
+    collector = SpanCollector()
+    await graph.ainvoke(
+        initial_state(patient_id, patient_record=get_patient(patient_id)),
+        config={"callbacks": [collector]},
+    )
+    spans = collector.spans
+    total = next(s.duration_ms for s in spans if s.kind == "graph")
+    model = sum(s.duration_ms for s in spans if s.kind == "llm")
+    return total, model
+
+
+async def run_level(graph, concurrency: int, rounds: int) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        samples += await asyncio.gather(*(
+            one_analysis(graph, PATIENT_IDS[i % len(PATIENT_IDS)]) for i in range(concurrency)
+        ))
+    elapsed = time.perf_counter() - start
+
+    overhead = [total - model for total, model in samples]
+    return {
+        "concurrency": concurrency,
+        "analyses": len(samples),
+        "analyses_per_min": len(samples) / elapsed * 60,
+        "e2e_p50_ms": percentile([t for t, _ in samples], 50),
+        "model_p50_ms": percentile([m for _, m in samples], 50),
+        "overhead_p50_ms": percentile(overhead, 50),
+        "overhead_p99_ms": percentile(overhead, 99),
+    }
+
+
+async def run(latency: float = 0.0, levels: list[int] | None = None, rounds: int = 5) -> list[dict]:
+    registry.reset()
+    registry._llm = ScriptedChatModel(latency=latency)
+    registry.warm_up()
+    cache = get_llm_cache()
+    set_llm_cache(None)
+    try:
+        graph = registry.get_graph()
+        await one_analysis(graph, PATIENT_IDS[0])  # first-call imports and lazy indexes
+        return [await run_level(graph, c, rounds) for c in levels or [1, 10, 100]]
+    finally:
+        set_llm_cache(cache)
+        registry.reset()
+
+
+def main() -> None:
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.0
+    levels = [int(a) for a in sys.argv[2:]] or [1, 10, 100]
+    print(f"Scripted model latency: {latency * 1000:.0f} ms per call")
+    print(f"{'concurrency':>11} {'analyses/min':>13} {'e2e p50':>10} {'model p50':>10} "
+          f"{'overhead p50':>13} {'p99':>9}")
+    for r in asyncio.run(run(latency, levels)):
+        print(
+            f"{r['concurrency']:>11} {r['analyses_per_min']:>13,.0f} {r['e2e_p50_ms']:>8.1f}ms "
+            f"{r['model_p50_ms']:>8.1f}ms {r['overhead_p50_ms']:>11.1f}ms {r['overhead_p99_ms']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Benchmark the literature vector index: build, persistence, latency and recall.
+
+Embeds a synthetic topical corpus with the hashing encoder and times
+brute-force search against IVF partitioning at several probe counts.
+Articles draw most of their words from one of ``N_TOPICS`` topic
+vocabularies, because literature clusters by subject; the uniform corpus
+of bench_literature_search has no clusters and is the worst case for IVF.
+Recall@k for IVF is measured against the exact brute-force top-k for two
+query sets: short fragments (6 words of an indexed abstract, like a
+typed search) and passages (whole held-out articles, like a
+"more like this" lookup). The index is then saved,
+memory-mapped back in and queried, and hybrid BM25+vector search is timed
+against BM25 alone on the same corpus.
+
+Usage:
+    python -m benchmarks.bench_vector_search [n_articles] [n_queries]
+    python -m benchmarks.bench_vector_search 1000000 200
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_literature_search import QUERIES
+from src.batch import percentile
+from src.data import medical_articles
+from src.data.encoders import HashingEncoder
+from src.data.medical_articles import ARTICLES, _article_text
+from src.data.search_index import BM25Index, tokenize
+from src.data.vector_index import VectorIndex
+
+K = 10
+PROBES = (1, 4, 8, 16, 32)
+N_TOPICS = 500
+
+
+def topical_corpus(n: int, seed: int = 11) -> list[dict]:
+    """Return ``n`` article dicts, each mostly about one of ``N_TOPICS`` topics."""
+    rng = random.Random(seed)
+    base_vocab = sorted({t for a in ARTICLES for t in tokenize(a["abstract"] + " " + a["title"])})
+    vocab = base_vocab + [f"term{i}" for i in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    rng.shuffle(weights)
+    background = list(itertools.accumulate(weights))
+    topics = [rng.sample(vocab, 40) for _ in range(N_TOPICS)]
+
+    articles = []
+    for i in range(n):
+        topic = topics[rng.randrange(N_TOPICS)]
+        words = rng.choices(topic, k=45) + rng.choices(vocab, cum_weights=background, k=15)
+        rng.shuffle(words)
+        articles.append({
+            "id": f"SYN-{i}",
+            "title": " ".join(words[:8]),
+            "abstract": " ".join(words[8:]),
+            "keywords": words[:4],
+            "year": 2000 + i % 25,
+        })
+    return articles
+
+
+def query_fragments(corpus: list[dict], n: int, seed: int = 3) -> list[str]:
+    """Queries made of 6 consecutive abstract words from random articles."""
+    rng = random.Random(seed)
+    queries = []
+    for article in rng.sample(corpus, n):
+        words = article["abstract"].split()
+        start = rng.randrange(max(1, len(words) - 6))
+        queries.append(" ".join(words[start:start + 6]))
+    return queries
+
+
+def time_queries(search, queries: list) -> dict:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": percentile(samples, 50), "p95_ms": percentile(samples, 95)}
+
+
+def recall(results: list[list[tuple[str, float]]], exact: list[list[tuple[str, float]]]) -> float:
+    hits = sum(len({d for d, _ in r} & {d for d, _ in e}) for r, e in zip(results, exact))
+    return hits / sum(len(e) for e in exact)
+
+
+def run(n_articles: int = 100_000, n_queries: int = 200) -> dict:
+    corpus = topical_corpus(n_articles + n_queries)
+    corpus, held_out = corpus[:n_articles], corpus[n_articles:]
+    encoder = HashingEncoder()
+    report: dict = {"n_articles": n_articles, "dim": encoder.dim}
+
+    start = time.perf_counter()
+    vectors = encoder.encode([_article_text(a) for a in corpus])
+    report["encode_s"] = time.perf_counter() - start
+
+    index = VectorIndex(encoder.dim, encoder.name)
+    index.add_many([a["id"] for a in corpus], vectors)
+    del vectors
+
+    query_sets = {
+        "fragment": encoder.encode(query_fragments(corpus, n_queries)),
+        "passage": encoder.encode([_article_text(a) for a in held_out]),
+    }
+    exact = {name: [index.search(q, K) for q in queries] for name, queries in query_sets.items()}
+    queries = query_sets["fragment"]
+    report["brute_force"] = time_queries(lambda q: index.search(q, K), queries)
+
+    n_lists = int(math.sqrt(n_articles))
+    start = time.perf_counter()
+    index.build_ivf(n_lists)
+    report["ivf_lists"] = n_lists
+    report["ivf_build_s"] = time.perf_counter() - start
+    report["ivf"] = []
+    for n_probe in PROBES:
+        report["ivf"].append({
+            "n_probe": n_probe,
+            **{
+                f"recall@{K}_{name}": recall([index.search(q, K, n_probe) for q in qs], exact[name])
+                for name, qs in query_sets.items()
+            },
+            **time_queries(lambda q, p=n_probe: index.search(q, K, p), queries),
+        })
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "vectors")
+        start = time.perf_counter()
+        index.save(path)
+        report["save_s"] = time.perf_counter() - start
+        report["file_mb"] = sum(
+            os.path.getsize(os.path.join(path, f)) for f in os.listdir(path) if f.startswith("vectors")
+        ) / 2**20
+        start = time.perf_counter()
+        mapped = VectorIndex.load(path)
+        report["mmap_load_s"] = time.perf_counter() - start
+        report["mmap_ivf"] = time_queries(lambda q: mapped.search(q, K), queries)
+        del mapped
+
+    # Hybrid vs lexical search through search_articles, on the same corpus.
+    saved = medical_articles._INDEX, medical_articles._VECTOR_INDEX, dict(medical_articles._ARTICLES_BY_ID)
+    bm25 = BM25Index()
+    bm25.add_many((a["id"], _article_text(a)) for a in corpus)
+    medical_articles._INDEX = bm25
+    medical_articles._VECTOR_INDEX = index
+    medical_articles._ARTICLES_BY_ID.clear()
+    medical_articles._ARTICLES_BY_ID.update((a["id"], a) for a in corpus)
+    text_queries = QUERIES + query_fragments(corpus, min(n_queries, 50), seed=5)
+    try:
+        for mode in ("bm25", "hybrid"):
+            report[f"search_articles_{mode}"] = time_queries(
+                lambda q, m=mode: medical_articles.search_articles(q, 5, m), text_queries
+            )
+    finally:
+        medical_articles._INDEX, medical_articles._VECTOR_INDEX = saved[0], saved[1]
+        medical_articles._ARTICLES_BY_ID.clear()
+        medical_articles._ARTICLES_BY_ID.update(saved[2])
+    return report
+
+
+def main() -> None:
+    n_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    r = run(n_articles, n_queries)
+    print(f"Corpus size:            {r['n_articles']:,} articles, {r['dim']} dims ({r['file_mb']:.0f} MB on disk)")
+    print(f"Encode:                 {r['encode_s']:.1f} s")
+    print(f"Brute force top-{K}:     p50 {r['brute_force']['p50_ms']:.2f} ms, p95 {r['brute_force']['p95_ms']:.2f} ms")
+    print(f"IVF build ({r['ivf_lists']} lists):  {r['ivf_build_s']:.1f} s")
+    for row in r["ivf"]:
+        print(f"  n_probe {row['n_probe']:>3}:          p50 {row['p50_ms']:.2f} ms, p95 {row['p95_ms']:.2f} ms, "
+              f"recall@{K} fragment {row[f'recall@{K}_fragment']:.3f} / passage {row[f'recall@{K}_passage']:.3f}")
+    print(f"Save / mmap load:       {r['save_s']:.2f} s / {r['mmap_load_s']:.3f} s")
+    print(f"Memory-mapped IVF:      p50 {r['mmap_ivf']['p50_ms']:.2f} ms, p95 {r['mmap_ivf']['p95_ms']:.2f} ms")
+    for mode in ("bm25", "hybrid"):
+        t = r[f"search_articles_{mode}"]
+        print(f"search_articles {mode:<7} p50 {t['p50_ms']:.2f} ms, p95 {t['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Load test: /api/health latency while many analyses run concurrently.
+
+Swaps the registry's chat model for the scripted stand-in, answering after
+``llm_delay_seconds`` +/-25% (no network) with the LLM cache disabled, fires ``concurrency`` analyses at ``/api/analyze`` and
+polls ``/api/health`` throughout. If anything in the analysis path blocks the
+event loop, health-check latency climbs to the model delay.
+
+Usage:
+    python -m benchmarks.load_health [concurrency] [llm_delay_seconds]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from api import app
+from src import registry
+from src.batch import percentile
+from src.llm_cache import get_llm_cache, set_llm_cache
+from src.scripted_llm import ScriptedChatModel
+
+
+async def run(concurrency: int = 200, delay: float = 1.0) -> dict:
+    registry.reset()
+    registry._llm = ScriptedChatModel(latency=delay, jitter=0.25)
+    registry.warm_up()  # the API does this in its lifespan hook
+    cache = get_llm_cache()
+    set_llm_cache(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        patient_ids = ["P-1001", "P-1002", "P-1003", "P-1004"]
+        analyses = [
+            asyncio.create_task(
+                client.post("/api/analyze", json={"patient_id": patient_ids[i % len(patient_ids)]})
+            )
+            for i in range(concurrency)
+        ]
+
+        start = time.perf_counter()
+        health_ms = []
+        while not all(task.done() for task in analyses):
+            t0 = time.perf_counter()
+            await client.get("/api/health")
+            health_ms.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - start
+
+        responses = await asyncio.gather(*analyses)
+
+    registry.reset()
+    set_llm_cache(cache)
+    return {
+        "concurrency": concurrency,
+        "llm_delay_s": delay,
+        "analyses_ok": sum(r.status_code == 200 for r in responses),
+        "wall_clock_s": elapsed,
+        "health_samples": len(health_ms),
+        "health_p50_ms": statistics.median(health_ms),
+        "health_p99_ms": percentile(health_ms, 99),
+        "health_max_ms": max(health_ms),
+    }
+
+
+def main() -> None:
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    result = asyncio.run(run(concurrency, delay))
+    print(f"Analyses completed:   {result['analyses_ok']}/{result['concurrency']} "
+          f"in {result['wall_clock_s']:.2f}s (model delay {delay}s per call)")
+    print(f"Health checks:        {result['health_samples']} samples")
+    print(f"Health p50 / p99:     {result['health_p50_ms']:.2f} / {result['health_p99_ms']:.2f} ms")
+    print(f"Health max:           {result['health_max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""Benchmark suite for the data layer, tools and pipeline, recorded to JSON.
+
+Times every hot path on synthetic datasets of increasing size and writes
+one JSON file per run, tagged with the git commit, so results can be
+diffed across commits. ``--compare`` flags cases that got slower than a
+previous run by more than ``--threshold``.
+
+Cases:
+    search_articles          hybrid BM25+vector literature search over N articles
+    check_interactions       10-drug regimen against N interaction rows
+    search_patients          name and condition search over N patients
+    get_patient              ID lookup over N patients
+    tool:<name>              tool invocation and output formatting
+    graph_compile            build_medical_graph()
+    pipeline_ainvoke         graph.ainvoke, scripted model, 1 and 20 in flight
+    pipeline_run             src.main.run (sync entry point), scripted model
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 10000 100000] [--output FILE]
+    python -m benchmarks.suite --quick --compare benchmarks/results/abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_interactions import synthetic_interactions
+from benchmarks.bench_literature_search import QUERIES, synthetic_corpus
+from benchmarks.bench_patient_store import synthetic_patients
+from src import registry
+from src.batch import percentile
+from src.data import drug_database, medical_articles, patient_database
+from src.data.drug_database import INTERACTIONS, check_interactions, load_interactions
+from src.data.encoders import get_encoder
+from src.data.patient_database import PATIENTS, get_patient, record_version, search_patients
+from src.data.patient_store import PatientStore
+from src.data.search_index import BM25Index
+from src.data.vector_index import VectorIndex
+from src.graph import build_medical_graph, initial_state
+from src.llm_cache import get_llm_cache, set_llm_cache
+from src.scripted_llm import ScriptedChatModel
+from src.tools.drug_interactions import check_drug_interactions, lookup_drug_info
+from src.tools.medical_search import search_medical_literature
+from src.tools.patient_records import format_patient_record, get_patient_record, search_patient_records
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(fn, args_list: list[tuple], min_time: float = 0.2) -> dict:
+    """Call ``fn(*args)`` over ``args_list`` repeatedly for at least
+    ``min_time`` seconds; return per-call latency stats in milliseconds."""
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or not samples:
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "calls": len(samples),
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+    }
+
+
+# ── dataset swaps ──
+
+@contextlib.contextmanager
+def literature_corpus(n: int):
+    """Temporarily replace the literature indexes with ``n`` synthetic articles."""
+    saved = medical_articles._INDEX, medical_articles._VECTOR_INDEX, dict(medical_articles._ARTICLES_BY_ID)
+    corpus = synthetic_corpus(n)
+    texts = [medical_articles._article_text(a) for a in corpus]
+    index = BM25Index()
+    index.add_many((a["id"], text) for a, text in zip(corpus, texts))
+    encoder = get_encoder()
+    vectors = VectorIndex(encoder.dim, encoder.name)
+    vectors.add_many((a["id"] for a in corpus), encoder.encode(texts))
+    medical_articles._INDEX = index
+    medical_articles._VECTOR_INDEX = vectors
+    medical_articles._ARTICLES_BY_ID.clear()
+    medical_articles._ARTICLES_BY_ID.update((a["id"], a) for a in corpus)
+    try:
+        yield
+    finally:
+        medical_articles._INDEX, medical_articles._VECTOR_INDEX = saved[0], saved[1]
+        medical_articles._ARTICLES_BY_ID.clear()
+        medical_articles._ARTICLES_BY_ID.update(saved[2])
+
+
+@contextlib.contextmanager
+def interaction_table(n: int):
+    """Temporarily add ``n`` synthetic interaction rows."""
+    original_count = len(INTERACTIONS)
+    load_interactions(synthetic_interactions(n))
+    try:
+        yield
+    finally:
+        del INTERACTIONS[original_count:]
+        drug_database._PAIR_INDEX.clear()
+        drug_database._ADJACENCY.clear()
+        for interaction in INTERACTIONS:
+            drug_database._index_interaction(interaction)
+
+
+@contextlib.contextmanager
+def patient_census(n: int, workdir: str):
+    """Temporarily serve ``n`` synthetic patients (plus the samples) from a fresh store."""
+    saved = patient_database._store
+    store = PatientStore(os.path.join(workdir, f"suite_patients_{n}.sqlite3"))
+    store.bulk_load((p, record_version(p)) for p in synthetic_patients(n))
+    store.bulk_load((p, record_version(p)) for p in PATIENTS.values())
+    patient_database._store = store
+    try:
+        yield
+    finally:
+        patient_database._store = saved
+
+
+# ── cases ──
+
+def bench_data_layer(sizes: list[int], min_time: float) -> list[dict]:
+    results = []
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            with literature_corpus(n):
+                results.append({"case": "search_articles", "size": n,
+                                **measure(medical_articles.search_articles, [(q,) for q in QUERIES], min_time)})
+
+            with interaction_table(n):
+                drugs = sorted(drug_database._ADJACENCY)
+                regimens = [(rng.sample(drugs, 10),) for _ in range(20)]
+                results.append({"case": "check_interactions", "size": n,
+                                **measure(check_interactions, regimens, min_time)})
+
+            with patient_census(n, workdir):
+                names = [("Surname" + str(rng.randrange(5000)),) for _ in range(20)]
+                conditions = [("rare condition " + str(rng.randrange(500)), 20) for _ in range(20)]
+                ids = [(f"P-{rng.randrange(n):07d}",) for _ in range(200)]
+                results.append({"case": "search_patients:name", "size": n,
+                                **measure(search_patients, names, min_time)})
+                results.append({"case": "search_patients:condition_top20", "size": n,
+                                **measure(search_patients, conditions, min_time)})
+                results.append({"case": "get_patient", "size": n,
+                                **measure(get_patient, ids, min_time)})
+            print(f"  data layer: {n:,} done", file=sys.stderr)
+    return results
+
+
+def bench_tools(min_time: float) -> list[dict]:
+    patients = list(PATIENTS.values())
+    cases = {
+        "tool:format_patient_record": (format_patient_record, [(p,) for p in patients]),
+        "tool:get_patient_record": (get_patient_record.invoke, [({"patient_id": p["id"]},) for p in patients]),
+        "tool:search_patient_records": (search_patient_records.invoke, [({"query": "hypertension"},)]),
+        "tool:search_medical_literature": (search_medical_literature.invoke, [({"query": q},) for q in QUERIES]),
+        "tool:lookup_drug_info": (lookup_drug_info.invoke, [({"drug_name": d},) for d in ("warfarin", "metformin", "zoloft")]),
+        "tool:check_drug_interactions": (
+            check_drug_interactions.invoke,
+            [({"drug_names": p["medications"]},) for p in patients],
+        ),
+    }
+    return [
+        {"case": name, "size": None, **measure(fn, args, min_time)}
+        for name, (fn, args) in cases.items()
+    ]
+
+
+def bench_pipeline(min_time: float) -> list[dict]:
+    results = [{"case": "graph_compile", "size": None, **measure(build_medical_graph, [()], min_time)}]
+
+    registry.reset()
+    registry._llm = ScriptedChatModel()
+    registry.warm_up()
+    cache = get_llm_cache()
+    set_llm_cache(None)
+    try:
+        graph = registry.get_graph()
+        patient_ids = list(PATIENTS)
+
+        async def ainvoke_batch(concurrency: int) -> None:
+            await asyncio.gather(*(
+                graph.ainvoke(initial_state(pid, patient_record=get_patient(pid)))
+                for pid in (patient_ids * concurrency)[:concurrency]
+            ))
+
+        for concurrency in (1, 20):
+            stats = measure(lambda c=concurrency: asyncio.run(ainvoke_batch(c)), [()], min_time)
+            stats["analyses_per_s"] = concurrency / (stats["mean_ms"] / 1000)
+            results.append({"case": f"pipeline_ainvoke:x{concurrency}", "size": None, **stats})
+
+        from src.main import run
+
+        stats = measure(run, [(pid,) for pid in patient_ids], min_time)
+        stats["analyses_per_s"] = 1000 / stats["mean_ms"]
+        results.append({"case": "pipeline_run", "size": None, **stats})
+    finally:
+        set_llm_cache(cache)
+        registry.reset()
+    return results
+
+
+# ── recording ──
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: list[dict], previous_path: str, threshold: float) -> list[dict]:
+    """Return cases whose mean latency grew by more than ``threshold`` (fraction)."""
+    with open(previous_path) as f:
+        previous = {(r["case"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for result in current:
+        before = previous.get((result["case"], result["size"]))
+        if before and result["mean_ms"] > before["mean_ms"] * (1 + threshold):
+            regressions.append({
+                "case": result["case"],
+                "size": result["size"],
+                "before_ms": before["mean_ms"],
+                "after_ms": result["mean_ms"],
+                "change": result["mean_ms"] / before["mean_ms"] - 1,
+            })
+    return regressions
+
+
+def run(sizes: list[int], min_time: float = 0.2) -> dict:
+    results = bench_data_layer(sizes, min_time) + bench_tools(min_time) + bench_pipeline(min_time)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--quick", action="store_true", help="sizes 1000 and 10000, shorter timing")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent per case")
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="previous results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown flagged by --compare")
+    args = parser.parse_args()
+
+    sizes = [1_000, 10_000] if args.quick else args.sizes
+    report = run(sizes, 0.1 if args.quick else args.min_time)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['meta']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'case':<34} {'size':>9} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for r in report["results"]:
+        size = f"{r['size']:,}" if r["size"] else "-"
+        print(f"{r['case']:<34} {size:>9} {r['mean_ms']:>8.3f}ms {r['p50_ms']:>8.3f}ms {r['p95_ms']:>8.3f}ms")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(report["results"], args.compare, args.threshold)
+        for r in regressions:
+            size = f" @ {r['size']:,}" if r["size"] else ""
+            print(f"REGRESSION {r['case']}{size}: {r['before_ms']:.3f}ms -> {r['after_ms']:.3f}ms "
+                  f"(+{r['change']:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
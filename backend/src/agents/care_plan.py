@@ -2,7 +2,8 @@
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
-from src.config import get_llm
+from src.llm_cache import cached_ainvoke
+from src.registry import get_shared_llm
 from src.state import PatientState
 
 CARE_PLAN_SYSTEM_PROMPT = """\
@@ -34,9 +35,9 @@ the patient's specific data.
 """
 
 
-def run_care_plan(state: PatientState) -> dict:
+async def run_care_plan(state: PatientState) -> dict:
     """Execute the care plan generation agent node."""
-    llm = get_llm()
+    llm = get_shared_llm()
 
     intake_summary = state.get("intake_summary", "")
     diagnosis = state.get("diagnosis", "")
@@ -48,6 +49,8 @@ def run_care_plan(state: PatientState) -> dict:
         context_parts.append(f"DIAGNOSTIC ASSESSMENT:\n{diagnosis}")
     if drug_interactions:
         context_parts.append(f"DRUG INTERACTION ALERTS:\n{drug_interactions}")
+    if state.get("clinician_notes"):
+        context_parts.append(f"CLINICIAN NOTES (follow these):\n{state['clinician_notes']}")
 
     context = "\n\n".join(context_parts)
 
@@ -58,11 +61,11 @@ def run_care_plan(state: PatientState) -> dict:
         ),
     ]
 
-    response = llm.invoke(messages)
+    response = await cached_ainvoke(llm, messages, patient_id=state.get("patient_id"))
 
     care_plan = response.content if response.content else "Care plan could not be generated."
 
     return {
         "care_plan": care_plan,
-        "messages": [f"[Care Plan Agent] Completed care plan generation."],
+        "messages": ["[Care Plan Agent] Completed care plan generation."],
     }
@@ -1,10 +1,13 @@
 """Diagnosis Reasoning Agent — analyzes symptoms and evidence to produce diagnostic assessment."""
 
-from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
-from src.config import get_llm
+from src.context_budget import ContextBudget
+from src.llm_cache import cached_ainvoke
+from src.registry import get_bound_llm
 from src.state import PatientState
 from src.tools.drug_interactions import check_drug_interactions, lookup_drug_info
+from src.tools.executor import execute_tool_calls
 from src.tools.medical_search import search_medical_literature
 
 DIAGNOSIS_SYSTEM_PROMPT = """\
@@ -13,7 +16,10 @@ summary and patient history. Your role is to:
 
 1. Identify the key clinical problems and prioritize them.
 2. Search medical literature to find relevant evidence and guidelines.
-3. Check the patient's current medications for interactions and safety concerns.
+3. Review the medication safety check provided with the case (interactions
+   and drug information for the current regimen are precomputed — only use
+   the drug tools for medications you are considering adding or that are
+   not covered).
 4. Look up relevant drug information as needed.
 5. Formulate a differential diagnosis or clinical assessment, including:
    - Primary assessment for each active problem
@@ -32,9 +38,9 @@ Output ONLY the diagnostic assessment — no conversational filler.
 TOOLS = [search_medical_literature, lookup_drug_info, check_drug_interactions]
 
 
-def run_diagnosis(state: PatientState) -> dict:
+async def run_diagnosis(state: PatientState) -> dict:
     """Execute the diagnosis reasoning agent node."""
-    llm = get_llm().bind_tools(TOOLS)
+    llm = get_bound_llm(TOOLS)
 
     intake_summary = state.get("intake_summary", "No intake summary available.")
     patient_history = state.get("patient_history", "")
@@ -43,40 +49,66 @@ def run_diagnosis(state: PatientState) -> dict:
     if patient_history and patient_history != intake_summary:
         context += f"\n\nPATIENT HISTORY:\n{patient_history}"
 
+    precomputed_interactions = state.get("drug_interactions", "")
+    medication_info = state.get("medication_info", "")
+    if medication_info:
+        context += (
+            "\n\nMEDICATION SAFETY CHECK (current regimen):\n"
+            f"{precomputed_interactions or 'No known interactions among current medications.'}"
+            f"\n\nCURRENT MEDICATION INFORMATION:\n{medication_info}"
+        )
+    prefetched_literature = state.get("search_results", "")
+    if prefetched_literature:
+        context += (
+            "\n\nRELEVANT LITERATURE (already retrieved for the patient's conditions — "
+            "search only for topics not covered here):\n"
+            f"{prefetched_literature}"
+        )
+    if state.get("clinician_notes"):
+        context += f"\n\nCLINICIAN NOTES (follow these):\n{state['clinician_notes']}"
+
     messages = [
         SystemMessage(content=DIAGNOSIS_SYSTEM_PROMPT),
         HumanMessage(content=f"Analyze the following patient case:\n\n{context}"),
     ]
 
     # Agentic tool-use loop
-    search_results_parts = []
-    drug_interaction_parts = []
+    budget = ContextBudget.from_env()
+    search_results_parts = [prefetched_literature] if prefetched_literature else []
+    drug_interaction_parts = [precomputed_interactions] if precomputed_interactions else []
 
     for _ in range(8):  # max iterations
-        response = llm.invoke(messages)
+        budget.prepare(messages)
+        response = await cached_ainvoke(llm, messages, patient_id=state.get("patient_id"))
         messages.append(response)
 
         if not response.tool_calls:
             break
 
-        for tool_call in response.tool_calls:
-            tool_fn = {t.name: t for t in TOOLS}[tool_call["name"]]
-            result = tool_fn.invoke(tool_call["args"])
+        tool_messages = await execute_tool_calls(response.tool_calls)
 
+        for tool_call, tool_message in zip(response.tool_calls, tool_messages):
             if tool_call["name"] == "search_medical_literature":
-                search_results_parts.append(result)
-            elif tool_call["name"] == "check_drug_interactions":
-                drug_interaction_parts.append(result)
+                search_results_parts.append(tool_message.content)
+            elif (
+                tool_call["name"] == "check_drug_interactions"
+                and tool_message.content not in drug_interaction_parts
+            ):
+                drug_interaction_parts.append(tool_message.content)
 
-            messages.append(
-                ToolMessage(content=result, tool_call_id=tool_call["id"])
-            )
+        messages.extend(tool_messages)
 
     diagnosis = response.content if response.content else "Diagnosis reasoning could not be completed."
+    usage = budget.stats()
 
     return {
         "diagnosis": diagnosis,
         "search_results": "\n---\n".join(search_results_parts) if search_results_parts else "",
         "drug_interactions": "\n".join(drug_interaction_parts) if drug_interaction_parts else "",
-        "messages": [f"[Diagnosis Agent] Completed diagnostic assessment."],
+        "context_usage": usage,
+        "messages": [
+            "[Diagnosis Agent] Completed diagnostic assessment "
+            f"({usage['prompt_tokens_sent']} prompt tokens over {len(usage['turns'])} turns, "
+            f"{usage['tokens_saved']} saved by context compaction)."
+        ],
     }
@@ -1,10 +1,17 @@
 """Intake Agent — gathers and structures patient information."""
 
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
-from src.config import get_llm
+from src.data.patient_database import get_patient
+from src.llm_cache import cached_ainvoke
+from src.registry import get_bound_llm, get_shared_llm
 from src.state import PatientState
-from src.tools.patient_records import get_patient_record, search_patient_records
+from src.tools.executor import execute_tool_calls
+from src.tools.patient_records import (
+    format_patient_record,
+    get_patient_record,
+    search_patient_records,
+)
 
 INTAKE_SYSTEM_PROMPT = """\
 You are a Medical Intake Agent. Your role is to:
@@ -31,40 +38,101 @@ conversational filler.
 TOOLS = [get_patient_record, search_patient_records]
 
 
-def run_intake(state: PatientState) -> dict:
+def render_intake_template(patient: dict) -> str:
+    """Build a structured intake summary directly from a patient record."""
+    visits = patient["visit_history"]
+    reason = (
+        f"{visits[0]['reason']} (last visit {visits[0]['date']})" if visits else "Not documented"
+    )
+    labs = "\n".join(f"  - {k}: {v}" for k, v in patient["recent_labs"].items())
+    history = "\n".join(f"  - [{v['date']}] {v['reason']}: {v['notes']}" for v in visits)
+
+    return (
+        f"Patient: {patient['name']} (ID: {patient['id']}), {patient['age']}-year-old {patient['sex'].lower()}\n"
+        f"Reason for encounter: {reason}\n"
+        f"Active conditions: {', '.join(patient['conditions']) or 'None documented'}\n"
+        f"Current medications: {', '.join(patient['medications']) or 'None'}\n"
+        f"Allergies: {', '.join(patient['allergies']) or 'None known'}\n"
+        f"Recent labs:\n{labs or '  - None on file'}\n"
+        f"Visit history:\n{history or '  - None on file'}"
+    )
+
+
+async def _run_fast_path_intake(state: PatientState) -> dict:
+    """Intake for a record supplied up front: no tool loop.
+
+    The record is rendered with the ``get_patient_record`` formatter; the
+    summary comes from a single tool-free LLM call, or from a template when
+    ``intake_mode`` is ``"template"``.
+    """
+    patient = state["patient_record"]
+    patient_history = format_patient_record(patient)
+
+    if state.get("intake_mode") == "template":
+        intake_summary = render_intake_template(patient)
+    else:
+        response = await cached_ainvoke(
+            get_shared_llm(),
+            [
+                SystemMessage(content=INTAKE_SYSTEM_PROMPT),
+                HumanMessage(
+                    content=(
+                        f"Process intake for: {state.get('patient_input', patient['id'])}\n\n"
+                        "The patient record has already been retrieved:\n\n"
+                        f"{patient_history}"
+                    )
+                ),
+            ],
+            patient_id=patient["id"],
+        )
+        intake_summary = response.content or render_intake_template(patient)
+
+    return {
+        "patient_id": patient["id"],
+        "medications": patient["medications"],
+        "intake_summary": intake_summary,
+        "patient_history": patient_history,
+        "messages": ["[Intake Agent] Completed intake processing (record provided)."],
+    }
+
+
+async def run_intake(state: PatientState) -> dict:
     """Execute the intake agent node."""
-    llm = get_llm().bind_tools(TOOLS)
+    if state.get("patient_record"):
+        return await _run_fast_path_intake(state)
+
+    llm = get_bound_llm(TOOLS)
     messages = [
         SystemMessage(content=INTAKE_SYSTEM_PROMPT),
     ]
 
     patient_input = state.get("patient_input", "")
-    from langchain_core.messages import HumanMessage
     messages.append(HumanMessage(content=f"Process intake for: {patient_input}"))
-
     # Agentic tool-use loop
     patient_history = ""
+    patient = None
     for _ in range(6):  # max iterations to prevent infinite loops
-        response = llm.invoke(messages)
+        response = await cached_ainvoke(llm, messages, patient_id=patient["id"] if patient else None)
         messages.append(response)
 
         if not response.tool_calls:
             break
 
-        from langchain_core.messages import ToolMessage
-        for tool_call in response.tool_calls:
-            tool_fn = {t.name: t for t in TOOLS}[tool_call["name"]]
-            result = tool_fn.invoke(tool_call["args"])
+        tool_messages = await execute_tool_calls(response.tool_calls)
+        for tool_call, tool_message in zip(response.tool_calls, tool_messages):
             if tool_call["name"] == "get_patient_record":
-                patient_history = result
-            messages.append(
-                ToolMessage(content=result, tool_call_id=tool_call["id"])
-            )
+                patient_history = tool_message.content
+                patient = get_patient(tool_call["args"].get("patient_id", "")) or patient
+        messages.extend(tool_messages)
 
     intake_summary = response.content if response.content else "Intake could not be completed."
 
-    return {
+    result = {
         "intake_summary": intake_summary,
         "patient_history": patient_history or intake_summary,
-        "messages": [f"[Intake Agent] Completed intake processing."],
+        "messages": ["[Intake Agent] Completed intake processing."],
     }
+    if patient is not None:
+        result["patient_id"] = patient["id"]
+        result["medications"] = patient["medications"]
+    return result
@@ -0,0 +1,39 @@
+"""Literature Retrieval step — deterministic evidence search per condition.
+
+Used by the parallel graph topology, where it runs next to Medication
+Safety after intake. Each of the patient's conditions is searched in the
+literature index without calling the LLM, and the combined results are
+written to ``search_results`` so the diagnosis agent starts with the
+evidence instead of spending tool-calling turns to fetch it.
+"""
+
+import os
+
+from src.data.medical_articles import search_articles
+from src.data.patient_database import get_patient
+from src.state import PatientState
+from src.tools.medical_search import format_articles
+
+
+def run_literature_retrieval(state: PatientState) -> dict:
+    """Execute the literature retrieval node."""
+    patient = state.get("patient_record") or get_patient(state.get("patient_id", ""))
+    conditions = (patient or {}).get("conditions") or []
+    if not conditions:
+        return {
+            "messages": ["[Literature Retrieval] No structured condition list; skipped."],
+        }
+
+    per_condition = int(os.getenv("LITERATURE_PER_CONDITION", "2"))
+    articles = {}
+    for condition in conditions:
+        for article in search_articles(condition, limit=per_condition):
+            articles.setdefault(article["id"], article)
+
+    return {
+        "search_results": format_articles(list(articles.values())) if articles else "",
+        "messages": [
+            f"[Literature Retrieval] Searched {len(conditions)} condition(s); "
+            f"{len(articles)} article(s) retrieved."
+        ],
+    }
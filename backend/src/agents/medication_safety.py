@@ -0,0 +1,43 @@
+"""Medication Safety step — deterministic interaction and drug-info check.
+
+Runs between intake and diagnosis without calling the LLM. The patient's
+regimen is normalized against the drug database, and the resulting
+interaction alerts and drug monographs are written to the state so the
+diagnosis agent receives them up front instead of spending a tool-calling
+turn to fetch them.
+"""
+
+from src.data.drug_database import lookup_drug
+from src.data.medications import interaction_report
+from src.state import PatientState
+from src.tools.drug_interactions import format_drug_info, format_interactions
+
+
+def run_medication_safety(state: PatientState) -> dict:
+    """Execute the medication safety node."""
+    medications = state.get("medications") or []
+    if not medications:
+        return {
+            "messages": ["[Medication Safety] No structured medication list; skipped."],
+        }
+
+    report = interaction_report(medications)
+    names = [name for m in report["medications"] for name in m.names]
+
+    drug_info = "\n".join(
+        format_drug_info(name, lookup_drug(name))
+        for name in dict.fromkeys(names)
+        if name not in report["unrecognized"]
+    )
+    if report["unrecognized"]:
+        drug_info += f"\nNot in drug database: {', '.join(report['unrecognized'])}\n"
+
+    return {
+        "drug_interactions": format_interactions(report["interactions"], medications)
+        if report["interactions"] else "",
+        "medication_info": drug_info,
+        "messages": [
+            f"[Medication Safety] Checked {len(names)} drug(s); "
+            f"{len(report['interactions'])} interaction(s) found."
+        ],
+    }
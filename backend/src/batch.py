@@ -0,0 +1,153 @@
+"""Batch analysis of many patients on the shared graph.
+
+``run_batch`` runs one pipeline per patient ID with at most ``concurrency``
+in flight, and yields each outcome as soon as that patient finishes, so
+callers can write results out as JSON lines while the rest are still
+running. ``BatchStats`` collects throughput and per-stage latency
+percentiles across the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator, Iterable, Iterator
+
+from src.data.patient_database import get_patient, list_patients_page
+from src.graph import initial_state
+from src.registry import get_resumable_graph
+from src.resilience import astream_resumable, with_thread_id
+from src.telemetry import SpanCollector
+
+# PatientState keys included in each batch result.
+RESULT_KEYS = ("intake_summary", "drug_interactions", "diagnosis", "care_plan", "messages")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BatchStats:
+    """Running totals for a batch: outcomes, wall time and stage latencies."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.completed = 0
+        self.failed = 0
+        self.stage_ms: dict[str, list[float]] = {}
+
+    def record(self, outcome: dict) -> None:
+        if outcome["status"] == "ok":
+            self.completed += 1
+        else:
+            self.failed += 1
+        for stage, ms in outcome["stage_ms"].items():
+            self.stage_ms.setdefault(stage, []).append(ms)
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 3),
+            "analyses_per_min": round(self.completed / elapsed * 60, 2) if elapsed else 0.0,
+            "stage_latency_ms": {
+                stage: {
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99),
+                    "max": max(samples),
+                }
+                for stage, samples in self.stage_ms.items()
+            },
+        }
+
+
+def cohort_patient_ids(condition: str | None = None, page_size: int = 500) -> Iterator[str]:
+    """Yield the IDs of every patient (with ``condition``, if given) in ID order."""
+    after = None
+    while True:
+        patients, has_more = list_patients_page(after=after, limit=page_size, condition=condition)
+        for patient in patients:
+            yield patient["id"]
+        if not has_more:
+            return
+        after = patients[-1]["id"]
+
+
+async def analyze_one(graph, patient_id: str, intake_mode: str = "llm") -> dict:
+    """Run the pipeline for one patient and return a batch outcome dict.
+
+    The outcome has ``patient_id``, ``status`` ("ok" or "error"),
+    ``duration_ms`` and ``stage_ms`` (per node, plus "total"), and either
+    ``state`` (the final PatientState) or ``error``. Patients that exist
+    also get ``analysis_id``, the checkpoint thread of the run.
+    """
+    start = time.perf_counter()
+    outcome = {"patient_id": patient_id, "status": "error", "stage_ms": {}}
+
+    patient = get_patient(patient_id)
+    if patient is None:
+        outcome["error"] = f"Patient {patient_id} not found"
+    else:
+        collector = SpanCollector()
+        try:
+            config = with_thread_id({"callbacks": [collector]})
+            outcome["analysis_id"] = config["configurable"]["thread_id"]
+            async for event in astream_resumable(graph, initial_state(
+                patient_id, patient_record=patient, intake_mode=intake_mode
+            ), config=config):
+                if event["type"] == "node_end":
+                    outcome["stage_ms"][event["node"]] = event["duration_ms"]
+                elif event["type"] == "result":
+                    outcome["status"] = "ok"
+                    outcome["state"] = event["state"]
+        except Exception as e:
+            outcome["error"] = str(e)
+        collector.finish(outcome["status"])
+
+    outcome["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    if outcome["status"] == "ok":
+        outcome["stage_ms"]["total"] = outcome["duration_ms"]
+    return outcome
+
+
+async def run_batch(
+    patient_ids: Iterable[str],
+    concurrency: int = 4,
+    intake_mode: str = "llm",
+    stats: BatchStats | None = None,
+) -> AsyncIterator[dict]:
+    """Analyze ``patient_ids`` with bounded concurrency, yielding in completion order.
+
+    IDs are consumed lazily, so a large cohort iterator is never materialized.
+    Pass ``stats`` to collect throughput and latency figures as results arrive.
+    """
+    graph = get_resumable_graph()
+    ids = iter(patient_ids)
+    outcomes: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        for patient_id in ids:
+            await outcomes.put(await analyze_one(graph, patient_id.strip(), intake_mode))
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    remaining = len(workers)
+    for task in workers:
+        task.add_done_callback(lambda _: outcomes.put_nowait(None))
+
+    try:
+        while remaining:
+            outcome = await outcomes.get()
+            if outcome is None:
+                remaining -= 1
+                continue
+            if stats is not None:
+                stats.record(outcome)
+            yield outcome
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,263 @@
+"""Checkpoint storage for analyses, and resuming or re-running them.
+
+The resumable graph (``registry.get_resumable_graph``) saves the
+PatientState after every node under the analysis ID (its LangGraph
+``thread_id``). With a persistent checkpointer those states outlive the
+request, so a failed analysis can be resumed from the last completed node
+and a finished one can re-run only its later stages — e.g. regenerate the
+care plan with a clinician's notes without redoing intake and diagnosis.
+
+Backends are selected with ``CHECKPOINTER``:
+    sqlite  ``AsyncSqliteSaver`` at ``CHECKPOINT_DB_PATH`` (default
+            checkpoints.sqlite3); needs langgraph-checkpoint-sqlite
+    memory  in-process ``MemorySaver``; checkpoints are dropped when a run
+            ends, so only in-run resume (resilience.py) is available
+
+Stored analyses are deleted ``CHECKPOINT_TTL_HOURS`` (default 168) after
+their last checkpoint by ``prune_analyses``, which the API runs
+periodically; 0 keeps them forever.
+
+Every run holds ``claim_analysis`` on its analysis ID, so a resume or
+re-run cannot start a second run on a thread that is still being written
+(``AnalysisRunningError``). Claims are per process: with several workers,
+route an analysis's resumes to the worker that ran it.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+# Stage -> (node whose output the re-run starts after, state keys it needs).
+# A diagnosis re-run starts with the medication safety check: diagnosis
+# merges its own interaction checks into ``drug_interactions``, so the
+# stored value is no longer the check's output. The check is a
+# deterministic lookup and cheap to repeat.
+RERUN_STAGES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "diagnosis": ("intake_agent", ("intake_summary",)),
+    "care_plan": ("diagnosis_agent", ("intake_summary", "diagnosis")),
+}
+
+# Stage -> state cleared before it re-runs, so the previous run's outputs
+# are not fed back as inputs. Diagnosis treats existing search_results as
+# prefetched literature and drug_interactions as the current regimen's
+# check (which writes nothing for a patient without medications).
+RERUN_RESETS: dict[str, dict] = {
+    "diagnosis": {"search_results": "", "drug_interactions": "", "medication_info": ""},
+}
+
+COMPLETE = "complete"
+INCOMPLETE = "incomplete"
+RUNNING = "running"
+
+_running: set[str] = set()
+# Analysis IDs claimed by the current task, so nested claims (an endpoint
+# that claims before preparing a re-run, then runs it) do not conflict.
+_held: ContextVar[frozenset[str]] = ContextVar("held_analyses", default=frozenset())
+
+
+class AnalysisRunningError(RuntimeError):
+    """Raised when a run is started on an analysis that is already running."""
+
+
+@contextmanager
+def claim_analysis(analysis_id: str) -> Iterator[None]:
+    """Mark ``analysis_id`` as running for the duration of the block.
+
+    Raises ``AnalysisRunningError`` if another task holds it.
+    """
+    held = _held.get()
+    if analysis_id in held:
+        yield
+        return
+    if analysis_id in _running:
+        raise AnalysisRunningError(f"Analysis {analysis_id} is already running")
+    _running.add(analysis_id)
+    _held.set(held | {analysis_id})
+    try:
+        yield
+    finally:
+        _held.set(held)
+        _running.discard(analysis_id)
+
+
+def is_running(analysis_id: str) -> bool:
+    return analysis_id in _running
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """Build the checkpointer named by ``CHECKPOINTER``."""
+    backend = os.getenv("CHECKPOINTER", "sqlite").lower()
+    if backend == "memory":
+        return MemorySaver()
+    if backend == "sqlite":
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        # The connection thread starts, and tables are created, on first use.
+        # As a daemon it never holds up interpreter exit (every checkpoint is
+        # committed as it is written).
+        conn = aiosqlite.connect(os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite3"))
+        conn.daemon = True
+        return AsyncSqliteSaver(conn)
+    raise ValueError(f"Unknown CHECKPOINTER '{backend}' (expected sqlite or memory)")
+
+
+async def close_checkpointer(checkpointer: BaseCheckpointSaver | None) -> None:
+    """Close the database connection behind ``checkpointer``, if it has one."""
+    conn = getattr(checkpointer, "conn", None)
+    if conn is not None and conn.is_alive():
+        await conn.close()
+
+
+async def delete_analysis(checkpointer: BaseCheckpointSaver, analysis_id: str) -> None:
+    """Drop every checkpoint stored for ``analysis_id``."""
+    conn = getattr(checkpointer, "conn", None)
+    if conn is None:
+        await checkpointer.adelete_thread(analysis_id)
+        return
+    # AsyncSqliteSaver 2.0 has no adelete_thread; its two tables are keyed by thread_id.
+    await checkpointer.setup()
+    async with checkpointer.lock:
+        await conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (analysis_id,))
+        await conn.execute("DELETE FROM writes WHERE thread_id = ?", (analysis_id,))
+        await conn.commit()
+
+
+def _checkpoint_id_at(timestamp: float) -> str:
+    """The smallest checkpoint ID LangGraph can assign at ``timestamp``.
+
+    Checkpoint IDs are UUIDv6, whose leading fields are the creation time,
+    so they sort by time as strings.
+    """
+    ticks = int(timestamp * 10_000_000) + 0x01B21DD213814000  # 100 ns since 1582-10-15
+    value = ((ticks >> 12) & 0xFFFFFFFFFFFF) << 80 | 0x6 << 76 | (ticks & 0x0FFF) << 64
+    return str(uuid.UUID(int=value))
+
+
+def checkpoint_ttl() -> float:
+    """``CHECKPOINT_TTL_HOURS`` in seconds (0: keep stored analyses forever)."""
+    return float(os.getenv("CHECKPOINT_TTL_HOURS", "168")) * 3600
+
+
+async def prune_analyses(checkpointer: BaseCheckpointSaver, max_age: float) -> int:
+    """Delete analyses whose last checkpoint is older than ``max_age`` seconds.
+
+    Returns the number of analyses deleted. Only the SQLite backend keeps
+    checkpoints after a run, so other backends are left alone.
+    """
+    conn = getattr(checkpointer, "conn", None)
+    if conn is None or max_age <= 0:
+        return 0
+    cutoff = _checkpoint_id_at(time.time() - max_age)
+    await checkpointer.setup()
+    async with checkpointer.lock:
+        async with conn.execute(
+            "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(checkpoint_id) < ?",
+            (cutoff,),
+        ) as cursor:
+            stale = [(row[0],) for row in await cursor.fetchall()]
+        if stale:
+            await conn.executemany("DELETE FROM checkpoints WHERE thread_id = ?", stale)
+            await conn.executemany("DELETE FROM writes WHERE thread_id = ?", stale)
+            await conn.commit()
+    return len(stale)
+
+
+def is_persistent(checkpointer: BaseCheckpointSaver | None) -> bool:
+    """Whether checkpoints are kept after a run ends."""
+    return checkpointer is not None and not isinstance(checkpointer, MemorySaver)
+
+
+def analysis_config(analysis_id: str, config: dict | None = None) -> dict:
+    """``config`` with ``analysis_id`` as the LangGraph thread ID."""
+    config = dict(config or {})
+    config["configurable"] = {**(config.get("configurable") or {}), "thread_id": analysis_id}
+    return config
+
+
+async def analysis_status(graph, analysis_id: str) -> dict | None:
+    """Summary of the stored state for ``analysis_id``, or ``None`` if unknown."""
+    snapshot = await graph.aget_state(analysis_config(analysis_id))
+    if not snapshot.values:
+        return None
+    values = snapshot.values
+    return {
+        "analysis_id": analysis_id,
+        "patient_id": values.get("patient_id") or (values.get("patient_record") or {}).get("id"),
+        "status": RUNNING if is_running(analysis_id) else INCOMPLETE if snapshot.next else COMPLETE,
+        "next_nodes": list(snapshot.next),
+        "completed_stages": [
+            key for key in ("intake_summary", "drug_interactions", "diagnosis", "care_plan")
+            if values.get(key)
+        ],
+        "updated_at": snapshot.created_at,
+    }
+
+
+async def prepare_resume(graph, analysis_id: str) -> dict:
+    """Check that ``analysis_id`` can be resumed and return its run config.
+
+    Raises ``KeyError`` for an unknown analysis and ``ValueError`` if it
+    already completed.
+    """
+    config = analysis_config(analysis_id)
+    snapshot = await graph.aget_state(config)
+    if not snapshot.values:
+        raise KeyError(analysis_id)
+    if not snapshot.next:
+        raise ValueError(f"Analysis {analysis_id} already completed; re-run a stage instead")
+    return config
+
+
+async def prepare_rerun(graph, analysis_id: str, stage: str, updates: dict | None = None) -> dict:
+    """Rewind ``analysis_id`` so the next run starts at ``stage``.
+
+    ``updates`` (e.g. ``{"clinician_notes": ...}``) are merged into the
+    stored state. The earlier stages' outputs are reused as they are.
+    Raises ``KeyError`` for an unknown analysis and ``ValueError`` if the
+    stage is unknown or its inputs were never produced.
+    """
+    if stage not in RERUN_STAGES:
+        raise ValueError(f"Unknown stage '{stage}' (expected one of: {', '.join(RERUN_STAGES)})")
+    after_node, required = RERUN_STAGES[stage]
+
+    config = analysis_config(analysis_id)
+    snapshot = await graph.aget_state(config)
+    if not snapshot.values:
+        raise KeyError(analysis_id)
+    missing = [key for key in required if not snapshot.values.get(key)]
+    if missing:
+        raise ValueError(
+            f"Analysis {analysis_id} has no {', '.join(missing)} yet; resume it instead"
+        )
+
+    # Recording the update as ``after_node``'s output makes the graph
+    # continue with the node that follows it.
+    await graph.aupdate_state(
+        config,
+        {**RERUN_RESETS.get(stage, {}), **(updates or {}), "messages": [f"[Re-run] Restarting from {stage}."]},
+        as_node=_rerun_node(graph, after_node),
+    )
+    return config
+
+
+def _rerun_node(graph, after_node: str) -> str:
+    """The node to record a re-run update as, so the graph continues after ``after_node``.
+
+    When ``after_node`` is one branch of a join (the parallel topology), an
+    update from that branch alone never satisfies the join; rewind to the
+    node the branches fan out from instead, so they re-run together (they
+    are deterministic lookups) and the join fires.
+    """
+    builder = graph.builder
+    if not any(after_node in sources for sources, _ in builder.waiting_edges):
+        return after_node
+    return next(start for start, end in builder.edges if end == after_node)
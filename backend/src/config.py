@@ -1,14 +1,61 @@
+"""LLM configuration.
+
+The chat model backend is chosen with ``LLM_BACKEND``:
+    openai    ChatOpenAI with ``OPENAI_MODEL`` (default), on the shared
+              pooled HTTP clients from http_clients.py
+    scripted  offline, deterministic stand-in (see scripted_llm.py)
+
+Other backends can be added with ``register_llm_backend``.
+"""
+
 import os
+from typing import Callable
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 
 load_dotenv()
 
+LLM_BACKENDS: dict[str, Callable[[], BaseChatModel]] = {}
+
+
+def register_llm_backend(name: str):
+    """Register a zero-argument factory returning a chat model under ``name``."""
+    def decorator(factory: Callable[[], BaseChatModel]) -> Callable[[], BaseChatModel]:
+        LLM_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+@register_llm_backend("openai")
+def _openai_llm() -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    from src.http_clients import get_async_http_client, get_http_client, get_pool_config
 
-def get_llm() -> ChatOpenAI:
-    """Return the configured ChatOpenAI instance."""
     return ChatOpenAI(
         model=os.getenv("OPENAI_MODEL", "gpt-4"),
         temperature=0.2,
+        timeout=get_pool_config().timeouts(),
+        max_retries=0,  # retried by resilience.call_llm
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
     )
+
+
+@register_llm_backend("scripted")
+def _scripted_llm() -> BaseChatModel:
+    from src.scripted_llm import ScriptedChatModel
+
+    return ScriptedChatModel.from_env()
+
+
+def get_llm() -> BaseChatModel:
+    """Return a chat model from the backend named by ``LLM_BACKEND``."""
+    backend = os.getenv("LLM_BACKEND", "openai").lower()
+    factory = LLM_BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(
+            f"Unknown LLM_BACKEND '{backend}' (expected one of: {', '.join(sorted(LLM_BACKENDS))})"
+        )
+    return factory()
@@ -0,0 +1,206 @@
+"""Token budgeting for agent tool loops.
+
+A tool-using agent resends its whole message history on every iteration,
+so prompt size grows with each round of tool results. ``ContextBudget``
+keeps that history in check before each model call:
+
+1. A tool result identical to one already in the history is replaced by a
+   short back-reference.
+2. When the history is over ``budget_tokens``, tool results older than the
+   most recent ``keep_recent`` tool rounds are compacted, oldest first:
+   literature results keep only their article headlines, anything else
+   keeps its first lines.
+
+The model still sees every tool call and a pointer to what it returned,
+and the latest results stay intact. Token counts use tiktoken when its
+encoding is in the local tiktoken cache and fall back to a ~4 characters
+per token estimate otherwise. The encoding is only downloaded when
+``TIKTOKEN_DOWNLOAD=1``, since a fetch at startup stalls on its timeout
+when the host is offline.
+
+``DIAGNOSIS_CONTEXT_BUDGET`` (tokens, default 6000) sets the diagnosis
+agent's budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+DEFAULT_BUDGET_TOKENS = 6000
+COMPACT_KEEP_CHARS = 400
+
+_ENCODING_NAME = "cl100k_base"
+_ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _encoding_cached() -> bool:
+    """Whether tiktoken can load the encoding without a download (mirrors its cache lookup)."""
+    cache_dir = os.environ.get(
+        "TIKTOKEN_CACHE_DIR",
+        os.environ.get("DATA_GYM_CACHE_DIR", os.path.join(tempfile.gettempdir(), "data-gym-cache")),
+    )
+    cache_key = hashlib.sha1(_ENCODING_URL.encode()).hexdigest()
+    return bool(cache_dir) and os.path.exists(os.path.join(cache_dir, cache_key))
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                if _encoding_cached() or os.getenv("TIKTOKEN_DOWNLOAD", "0") == "1":
+                    try:
+                        import tiktoken
+
+                        _encoding = tiktoken.get_encoding(_ENCODING_NAME)
+                    except Exception as e:
+                        print(f"tiktoken encoding unavailable, estimating tokens from length: {str(e)[:80]}")
+                else:
+                    print("tiktoken encoding not cached (set TIKTOKEN_DOWNLOAD=1 to fetch it), "
+                          "estimating tokens from length")
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text`` (estimated if tiktoken is unavailable)."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _content_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Approximate prompt tokens for one message, including tool call arguments."""
+    tokens = count_tokens(_content_text(message)) + 4  # role and framing overhead
+    if isinstance(message, AIMessage):
+        for call in message.tool_calls:
+            tokens += count_tokens(call["name"]) + count_tokens(str(call["args"]))
+    return tokens
+
+
+def _compact_text(text: str, tool_name: str | None) -> str:
+    """Shorten an already-reviewed tool result."""
+    lines = text.splitlines()
+    if tool_name == "search_medical_literature":
+        # Article blocks start with "[ID] Title (Year)"; drop the abstracts.
+        kept = [line for line in lines if line.startswith("[")]
+    else:
+        kept, size = [], 0
+        for line in lines:
+            if size + len(line) > COMPACT_KEEP_CHARS:
+                break
+            kept.append(line)
+            size += len(line) + 1
+    kept = kept or [text[:COMPACT_KEEP_CHARS]]
+    return "\n".join(kept) + "\n[Earlier result shortened to save context; full text was reviewed above.]"
+
+
+class ContextBudget:
+    """Deduplicates and compacts tool results in an agent's message list.
+
+    Call ``prepare(messages)`` right before each model call; it edits the
+    list in place and records the prompt size for that turn. ``stats()``
+    reports per-turn prompt tokens and the total saved.
+    """
+
+    def __init__(self, budget_tokens: int = DEFAULT_BUDGET_TOKENS, keep_recent: int = 1):
+        self.budget_tokens = budget_tokens
+        self.keep_recent = keep_recent
+        self.turns: list[dict] = []
+        self.tokens_saved = 0
+        self.deduplicated = 0
+        self.compacted = 0
+        self._removed = 0  # tokens currently cut from the history
+        self._seen: dict[str, str] = {}  # content hash -> tool_call_id first returning it
+        self._checked: set[str] = set()
+        self._compacted_ids: set[str] = set()
+
+    @classmethod
+    def from_env(cls, var: str = "DIAGNOSIS_CONTEXT_BUDGET") -> "ContextBudget":
+        return cls(int(os.getenv(var, str(DEFAULT_BUDGET_TOKENS))))
+
+    def _replace(self, messages: list[BaseMessage], index: int, content: str) -> None:
+        old = messages[index]
+        new = old.model_copy(update={"content": content})
+        self._removed += message_tokens(old) - message_tokens(new)
+        messages[index] = new
+
+    def _dedupe(self, messages: list[BaseMessage]) -> None:
+        for i, message in enumerate(messages):
+            if not isinstance(message, ToolMessage) or message.tool_call_id in self._checked:
+                continue
+            self._checked.add(message.tool_call_id)
+            digest = hashlib.sha256(_content_text(message).encode()).hexdigest()
+            first = self._seen.setdefault(digest, message.tool_call_id)
+            if first != message.tool_call_id:
+                self._replace(messages, i, f"[Same result as tool call {first} above.]")
+                self._compacted_ids.add(message.tool_call_id)
+                self.deduplicated += 1
+
+    def _compact(self, messages: list[BaseMessage], total: int) -> int:
+        tool_names = {
+            call["id"]: call["name"]
+            for m in messages if isinstance(m, AIMessage)
+            for call in m.tool_calls
+        }
+        # Tool results following the last ``keep_recent`` AI messages stay intact.
+        ai_positions = [i for i, m in enumerate(messages) if isinstance(m, AIMessage)]
+        protected_from = ai_positions[-self.keep_recent] if len(ai_positions) >= self.keep_recent else 0
+
+        for i in range(protected_from):
+            if total <= self.budget_tokens:
+                break
+            message = messages[i]
+            if not isinstance(message, ToolMessage) or message.tool_call_id in self._compacted_ids:
+                continue
+            compacted = _compact_text(_content_text(message), tool_names.get(message.tool_call_id))
+            if count_tokens(compacted) >= count_tokens(_content_text(message)):
+                continue
+            before = message_tokens(message)
+            self._replace(messages, i, compacted)
+            total -= before - message_tokens(messages[i])
+            self._compacted_ids.add(message.tool_call_id)
+            self.compacted += 1
+        return total
+
+    def prepare(self, messages: list[BaseMessage]) -> int:
+        """Apply dedupe and compaction in place; return the prompt token count.
+
+        Tokens saved for a turn are everything cut from the history so far,
+        since each cut is avoided again on every later call.
+        """
+        self._dedupe(messages)
+        total = sum(message_tokens(m) for m in messages)
+        if total > self.budget_tokens:
+            total = self._compact(messages, total)
+        self.tokens_saved += self._removed
+        self.turns.append({
+            "turn": len(self.turns) + 1,
+            "prompt_tokens": total,
+            "saved_tokens": self._removed,
+        })
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "prompt_tokens_sent": sum(t["prompt_tokens"] for t in self.turns),
+            "tokens_saved": self.tokens_saved,
+            "deduplicated_results": self.deduplicated,
+            "compacted_results": self.compacted,
+            "turns": self.turns,
+        }
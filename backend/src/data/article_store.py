@@ -0,0 +1,158 @@
+"""Memory-mapped, columnar article store for large literature corpora.
+
+``write_article_store(path, articles)`` lays a corpus out as flat files in
+the directory ``path``:
+    text.bin             UTF-8 titles and abstracts, back to back
+    text_offsets.npy     int64, 2n+1 boundaries: row i's title is
+                         text[o[2i]:o[2i+1]], its abstract
+                         text[o[2i+1]:o[2i+2]]
+    ids.npy              fixed-width byte-string IDs, in row order
+    id_sorted.npy        the same IDs sorted, and
+    id_rows.npy          the row of each, for binary-search lookups
+    years.npy            int16 publication years
+    keyword_ids.npy      int32 keyword numbers for all rows, back to back
+    keyword_offsets.npy  int64, n+1 boundaries into keyword_ids
+    keyword_vocab.json   the distinct keywords
+    meta.json            row count
+
+``ArticleStore(path)`` memory-maps every file read-only. No per-article
+Python objects are kept: a dict is built only when ``get()`` asks for a
+row (e.g. a search hit). The pages are clean and file-backed, so the OS
+shares them between worker processes and can drop them under memory
+pressure, instead of every worker holding its own copy of the corpus.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+def write_article_store(path: str, articles: Iterable[dict]) -> int:
+    """Write ``articles`` (dicts shaped like ``ARTICLES``) to ``path``; returns the count.
+
+    Titles and abstracts are streamed to disk as they arrive; only the
+    per-row columns are held in memory until the end.
+    """
+    os.makedirs(path, exist_ok=True)
+    text_offsets = [0]
+    ids: list[bytes] = []
+    years: list[int] = []
+    keyword_numbers: dict[str, int] = {}
+    keyword_ids: list[int] = []
+    keyword_offsets = [0]
+
+    with open(os.path.join(path, "text.bin"), "wb") as text:
+        position = 0
+        for article in articles:
+            for field in ("title", "abstract"):
+                data = article[field].encode()
+                text.write(data)
+                position += len(data)
+                text_offsets.append(position)
+            ids.append(article["id"].encode())
+            years.append(article["year"])
+            for keyword in article["keywords"]:
+                keyword_ids.append(keyword_numbers.setdefault(keyword, len(keyword_numbers)))
+            keyword_offsets.append(len(keyword_ids))
+
+    id_array = np.array(ids, dtype=f"S{max(map(len, ids), default=1)}")
+    id_rows = np.argsort(id_array, kind="stable").astype(np.int32)
+    np.save(os.path.join(path, "text_offsets.npy"), np.array(text_offsets, dtype=np.int64))
+    np.save(os.path.join(path, "ids.npy"), id_array)
+    np.save(os.path.join(path, "id_sorted.npy"), id_array[id_rows])
+    np.save(os.path.join(path, "id_rows.npy"), id_rows)
+    np.save(os.path.join(path, "years.npy"), np.array(years, dtype=np.int16))
+    np.save(os.path.join(path, "keyword_ids.npy"), np.array(keyword_ids, dtype=np.int32))
+    np.save(os.path.join(path, "keyword_offsets.npy"), np.array(keyword_offsets, dtype=np.int64))
+    with open(os.path.join(path, "keyword_vocab.json"), "w") as f:
+        json.dump(list(keyword_numbers), f)
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"rows": len(ids)}, f)
+    return len(ids)
+
+
+class ArticleStore:
+    """Read-only view of a corpus written by ``write_article_store``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self._rows = json.load(f)["rows"]
+
+        def column(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        self._text_offsets = column("text_offsets")
+        self._ids = column("ids")
+        self._id_sorted = column("id_sorted")
+        self._id_rows = column("id_rows")
+        self.years = column("years")
+        self._keyword_ids = column("keyword_ids")
+        self._keyword_offsets = column("keyword_offsets")
+        if len(self._ids) != self._rows or len(self._text_offsets) != 2 * self._rows + 1:
+            raise ValueError(f"Article store at {path} is incomplete")
+        self._keyword_vocab: list[str] | None = None
+
+        with open(os.path.join(path, "text.bin"), "rb") as f:
+            # mmap cannot map an empty file; an empty corpus has no text to read.
+            self._text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._rows else b""
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __contains__(self, doc_id: str) -> bool:
+        return self.row(doc_id) is not None
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yield every article in row order, one materialized dict at a time."""
+        for row in range(self._rows):
+            yield self.article(row)
+
+    def row(self, doc_id: str) -> int | None:
+        """Row number of ``doc_id``, or ``None`` if absent."""
+        key = doc_id.encode()
+        if not self._rows or len(key) > self._id_sorted.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(self._id_sorted, key))
+        if i < self._rows and self._id_sorted[i] == key:
+            return int(self._id_rows[i])
+        return None
+
+    def _keywords(self) -> list[str]:
+        if self._keyword_vocab is None:
+            with open(os.path.join(self.path, "keyword_vocab.json")) as f:
+                self._keyword_vocab = json.load(f)
+        return self._keyword_vocab
+
+    def article(self, row: int) -> dict:
+        """Materialize row ``row`` as an article dict."""
+        offsets = self._text_offsets
+        title_start, abstract_start, end = (int(o) for o in offsets[2 * row:2 * row + 3])
+        vocab = self._keywords()
+        keyword_ids = self._keyword_ids[self._keyword_offsets[row]:self._keyword_offsets[row + 1]]
+        return {
+            "id": self._ids[row].decode(),
+            "title": self._text[title_start:abstract_start].decode(),
+            "abstract": self._text[abstract_start:end].decode(),
+            "keywords": [vocab[k] for k in keyword_ids],
+            "year": int(self.years[row]),
+        }
+
+    def get(self, doc_id: str) -> dict | None:
+        """The article with ID ``doc_id``, materialized, or ``None``."""
+        row = self.row(doc_id)
+        return None if row is None else self.article(row)
+
+    def close(self) -> None:
+        """Unmap the store. The column arrays are released with their last reference."""
+        if isinstance(self._text, mmap.mmap):
+            self._text.close()
+        self._text = b""
+        self._rows = 0
+        self._text_offsets = self._ids = self._id_sorted = self._id_rows = None
+        self.years = self._keyword_ids = self._keyword_offsets = None
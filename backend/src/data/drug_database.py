@@ -1,5 +1,7 @@
 """Simulated drug interaction database."""
 
+from typing import Iterable
+
 DRUGS: dict[str, dict] = {
     "metformin": {
         "class": "Biguanide",
@@ -97,16 +99,65 @@ INTERACTIONS: list[dict] = [
 ]
 
 
+# Interaction index: unordered drug pair -> interactions, plus each drug's
+# interaction partners, so a regimen check never scans INTERACTIONS.
+_PAIR_INDEX: dict[tuple[str, str], list[dict]] = {}
+_ADJACENCY: dict[str, set[str]] = {}
+
+
+def _pair_key(drug_a: str, drug_b: str) -> tuple[str, str]:
+    return (drug_a, drug_b) if drug_a <= drug_b else (drug_b, drug_a)
+
+
+def _index_interaction(interaction: dict) -> None:
+    drug_a = interaction["drug_a"].lower()
+    drug_b = interaction["drug_b"].lower()
+    _PAIR_INDEX.setdefault(_pair_key(drug_a, drug_b), []).append(interaction)
+    _ADJACENCY.setdefault(drug_a, set()).add(drug_b)
+    _ADJACENCY.setdefault(drug_b, set()).add(drug_a)
+
+
+for _interaction in INTERACTIONS:
+    _index_interaction(_interaction)
+
+
+def load_interactions(rows: Iterable[dict]) -> int:
+    """Bulk-load interaction rows into the database and index.
+
+    Each row needs ``drug_a``, ``drug_b``, ``severity`` and ``description``.
+    Returns the number of rows loaded.
+    """
+    count = 0
+    for row in rows:
+        INTERACTIONS.append(row)
+        _index_interaction(row)
+        count += 1
+    return count
+
+
+def interacting_drugs(name: str) -> set[str]:
+    """Return every drug with a known interaction with ``name``."""
+    return set(_ADJACENCY.get(name.lower(), ()))
+
+
 def lookup_drug(name: str) -> dict | None:
     """Look up a drug by name (case-insensitive)."""
     return DRUGS.get(name.lower())
 
 
 def check_interactions(drug_names: list[str]) -> list[dict]:
-    """Check for known interactions among a list of drug names."""
-    normalized = [d.lower() for d in drug_names]
+    """Check for known interactions among a list of drug names.
+
+    Uses the pair index, so the cost depends on the size of the regimen and
+    not on the size of the interaction database.
+    """
+    normalized = list(dict.fromkeys(d.lower() for d in drug_names))
     found = []
-    for interaction in INTERACTIONS:
-        if interaction["drug_a"] in normalized and interaction["drug_b"] in normalized:
-            found.append(interaction)
+    for i, drug_a in enumerate(normalized):
+        partners = _ADJACENCY.get(drug_a)
+        if not partners:
+            continue
+        for drug_b in normalized[i + 1:]:
+            if drug_b in partners:
+                found.extend(_PAIR_INDEX[_pair_key(drug_a, drug_b)])
     return found
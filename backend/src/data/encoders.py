@@ -0,0 +1,223 @@
+"""Local text encoders for the literature vector index.
+
+The encoder is chosen with ``LITERATURE_ENCODER``:
+    hashing                signed feature hashing of terms, adjacent-term
+                           pairs and clinical concepts (default; no model
+                           files, no network)
+    sentence-transformers  a local sentence-transformers model named by
+                           ``LITERATURE_ENCODER_MODEL`` (default
+                           all-MiniLM-L6-v2); needs the package and the
+                           model in the local cache
+
+Other encoders can be added with ``register_encoder``. An encoder has a
+``name``, a ``dim`` and ``encode(texts)``, which returns one L2-normalized
+float32 row per text, so a dot product is cosine similarity.
+
+A hashing encoder knows nothing about meaning, so lay and clinical terms
+for the same thing ("heart attack", "myocardial infarction") are mapped
+to a shared concept through ``CONCEPTS``. Each concept has a dimension of
+its own (terms are hashed into the rest), so queries and articles that
+name a concept differently land close together and two concepts never
+collide.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Protocol
+
+import numpy as np
+
+from src.data.search_index import tokenize
+
+# Concept -> phrases that name it. Matched on tokenized text, so plurals
+# and stopwords ("shortness of breath") are handled like the BM25 index.
+# Only unambiguous phrases: short abbreviations that are also ordinary
+# words ("MI", "CAP") would tag unrelated text with the concept.
+CONCEPTS: dict[str, list[str]] = {
+    "myocardial_infarction": ["myocardial infarction", "heart attack", "STEMI", "NSTEMI"],
+    "hypertension": ["hypertension", "high blood pressure", "elevated blood pressure", "HTN"],
+    "diabetes": ["diabetes", "diabetes mellitus", "T2DM", "high blood sugar", "hyperglycemia"],
+    "kidney_disease": [
+        "chronic kidney disease", "CKD", "kidney disease", "kidney failure",
+        "renal failure", "renal insufficiency",
+    ],
+    "heart_failure": ["heart failure", "congestive heart failure", "CHF", "HFrEF"],
+    "stroke": ["stroke", "cerebrovascular accident", "CVA"],
+    "atrial_fibrillation": ["atrial fibrillation", "AFib"],
+    "chest_pain": ["chest pain", "angina"],
+    "dyspnea": ["dyspnea", "shortness of breath", "breathlessness"],
+    "asthma": ["asthma", "wheezing", "reactive airway disease"],
+    "copd": ["COPD", "chronic obstructive pulmonary disease", "emphysema"],
+    "pneumonia": ["pneumonia", "community-acquired pneumonia", "lung infection", "chest infection"],
+    "depression": ["depression", "major depressive disorder", "MDD", "depressive"],
+    "antidepressant": ["antidepressant", "SSRI", "selective serotonin reuptake inhibitor"],
+    "migraine": ["migraine"],
+    "headache": ["headache", "cephalalgia"],
+    "hyperlipidemia": ["hyperlipidemia", "dyslipidemia", "high cholesterol"],
+    "anticoagulant": ["anticoagulant", "anticoagulation", "blood thinner"],
+    "nsaid": ["NSAID", "anti-inflammatory"],
+    "obesity": ["obesity", "obese", "overweight"],
+}
+
+CONCEPT_WEIGHT = 3.0
+
+
+class Encoder(Protocol):
+    name: str
+    dim: int
+
+    def encode(self, texts: list[str]) -> np.ndarray: ...
+
+
+ENCODERS: dict[str, Callable[[], Encoder]] = {}
+
+
+def register_encoder(name: str):
+    """Register a zero-argument factory returning an encoder under ``name``."""
+    def decorator(factory: Callable[[], Encoder]) -> Callable[[], Encoder]:
+        ENCODERS[name] = factory
+        return factory
+    return decorator
+
+
+def _phrase_table() -> dict[str, list[tuple[tuple[str, ...], str]]]:
+    """First term -> ``(phrase terms, concept)`` for every phrase starting with it."""
+    table: dict[str, list[tuple[tuple[str, ...], str]]] = {}
+    for concept, phrases in CONCEPTS.items():
+        for phrase in phrases:
+            terms = tuple(tokenize(phrase))
+            if terms:
+                table.setdefault(terms[0], []).append((terms, concept))
+    for candidates in table.values():
+        candidates.sort(key=lambda entry: -len(entry[0]))
+    return table
+
+
+_PHRASES = _phrase_table()
+_CONCEPT_COLUMNS = {concept: column for column, concept in enumerate(CONCEPTS)}
+# Part of the encoder name, so a saved index built with another table (or
+# matching rule) is rebuilt.
+_CONCEPTS_FINGERPRINT = f"{zlib.crc32(json.dumps(['longest', CONCEPTS], sort_keys=True).encode()):08x}"
+
+
+def concepts(terms: list[str]) -> list[str]:
+    """Concepts named anywhere in the tokenized ``terms``.
+
+    Matching is leftmost-longest and spans do not overlap, so "chronic
+    kidney disease" counts once rather than also as "kidney disease".
+    """
+    found = []
+    start = 0
+    while start < len(terms):
+        for phrase, concept in _PHRASES.get(terms[start], ()):
+            if tuple(terms[start:start + len(phrase)]) == phrase:
+                found.append(concept)
+                start += len(phrase)
+                break
+        else:
+            start += 1
+    return found
+
+
+@lru_cache(maxsize=1 << 18)
+def _bucket(term: str, buckets: int) -> tuple[int, float]:
+    # crc32 rather than hash(): buckets must be stable across processes
+    # for a saved index to match the queries encoded later.
+    h = zlib.crc32(term.encode())
+    return len(CONCEPTS) + h % buckets, 1.0 if h & 0x80000000 else -1.0
+
+
+class HashingEncoder:
+    """Signed feature hashing of terms and term pairs, plus one column per concept.
+
+    Weights are sublinear in frequency (1 + log count); concepts count
+    ``CONCEPT_WEIGHT`` times as much as a term.
+    """
+
+    def __init__(self, dim: int = 384):
+        if dim <= len(CONCEPTS):
+            raise ValueError(f"Encoder dimension must exceed the {len(CONCEPTS)} concept columns")
+        self.dim = dim
+        self.name = f"hashing-{dim}-{_CONCEPTS_FINGERPRINT}"
+
+    def features(self, text: str) -> dict[tuple[int, float], float]:
+        """Map ``(column, sign)`` to weight for one text."""
+        terms = tokenize(text)
+        counts = Counter(terms)
+        counts.update([a + " " + b for a, b in zip(terms, terms[1:])])
+        buckets = self.dim - len(CONCEPTS)
+        weights: dict[tuple[int, float], float] = {}
+        for term, count in counts.items():
+            key = _bucket(term, buckets)
+            weights[key] = weights.get(key, 0.0) + (1.0 if count == 1 else 1.0 + math.log(count))
+        for concept, count in Counter(concepts(terms)).items():
+            weights[(_CONCEPT_COLUMNS[concept], 1.0)] = CONCEPT_WEIGHT * (1.0 + math.log(count))
+        return weights
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        cells, values = [], []
+        for row, text in enumerate(texts):
+            offset = row * self.dim
+            for (col, sign), weight in self.features(text).items():
+                cells.append(offset + col)
+                values.append(sign * weight)
+        flat = np.bincount(cells, weights=values, minlength=len(texts) * self.dim)
+        return normalize(flat.astype(np.float32).reshape(len(texts), self.dim))
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (all-zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+@register_encoder("hashing")
+def _hashing_encoder() -> Encoder:
+    return HashingEncoder(int(os.getenv("LITERATURE_ENCODER_DIM", "384")))
+
+
+@register_encoder("sentence-transformers")
+def _sentence_transformer_encoder() -> Encoder:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise ImportError(
+            "LITERATURE_ENCODER=sentence-transformers needs 'pip install sentence-transformers'"
+        ) from e
+
+    model_name = os.getenv("LITERATURE_ENCODER_MODEL", "all-MiniLM-L6-v2")
+    model = SentenceTransformer(model_name, local_files_only=True)
+
+    class SentenceTransformerEncoder:
+        name = f"st-{model_name}"
+        dim = model.get_sentence_embedding_dimension()
+
+        def encode(self, texts: list[str]) -> np.ndarray:
+            vectors = model.encode(texts, batch_size=64, convert_to_numpy=True)
+            return normalize(vectors.astype(np.float32))
+
+    return SentenceTransformerEncoder()
+
+
+_encoder: Encoder | None = None
+
+
+def get_encoder() -> Encoder:
+    """Return the encoder named by ``LITERATURE_ENCODER``, created on first use."""
+    global _encoder
+    if _encoder is None:
+        name = os.getenv("LITERATURE_ENCODER", "hashing").lower()
+        factory = ENCODERS.get(name)
+        if factory is None:
+            raise ValueError(
+                f"Unknown LITERATURE_ENCODER '{name}' (expected one of: {', '.join(sorted(ENCODERS))})"
+            )
+        _encoder = factory()
+    return _encoder
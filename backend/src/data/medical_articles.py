@@ -1,4 +1,37 @@
-"""Simulated medical literature database (PubMed-style)."""
+"""Simulated medical literature database (PubMed-style).
+
+Searches blend two rankings. BM25 over title, abstract and keywords finds
+literal term matches. Cosine similarity between encoder embeddings (see
+encoders.py) finds articles that describe the query in other words, such
+as "heart attack" against "myocardial infarction".
+
+Configured with:
+    LITERATURE_SEARCH          hybrid (default), bm25 or vector
+    LITERATURE_VECTOR_WEIGHT   share of the vector score in hybrid mode (default 0.5)
+    LITERATURE_MIN_SIMILARITY  cosine below which a vector match is ignored (default 0.15)
+    LITERATURE_VECTOR_INDEX    directory to save the vector index to and
+                               memory-map it from on later starts (unset:
+                               built in memory)
+    LITERATURE_IVF_LISTS       IVF partitions for large corpora (default 0: brute force)
+    LITERATURE_IVF_PROBE       partitions scanned per query (default 8)
+    LITERATURE_STORE_PATH      article store written by ``write_article_store``
+                               to serve instead of ``ARTICLES`` (see article_store.py)
+
+``ARTICLES`` is the built-in sample corpus. With a store, the corpus stays
+on disk and memory-mapped, and only search hits are materialized as
+dicts. Articles added at runtime are kept in memory on top of either one.
+"""
+
+import os
+import threading
+from typing import Iterator
+
+import numpy as np
+
+from src.data.article_store import ArticleStore
+from src.data.encoders import get_encoder
+from src.data.search_index import BM25Index
+from src.data.vector_index import VectorIndex
 
 ARTICLES: list[dict] = [
     {
@@ -118,18 +151,202 @@ ARTICLES: list[dict] = [
 ]
 
 
-def search_articles(query: str) -> list[dict]:
-    """Search the simulated medical literature by keyword matching."""
-    query_terms = query.lower().split()
-    results = []
-    for article in ARTICLES:
-        searchable = (
-            article["title"].lower()
-            + " "
-            + article["abstract"].lower()
-            + " "
-            + " ".join(article["keywords"]).lower()
-        )
-        if any(term in searchable for term in query_terms):
-            results.append(article)
-    return results
+_ARTICLES_BY_ID: dict[str, dict] = {}
+_STORE: ArticleStore | None = None
+_REMOVED_FROM_STORE: set[str] = set()
+_INDEX: BM25Index | None = None
+_VECTOR_INDEX: VectorIndex | None = None
+# Guards building the indexes and changing the corpus. Re-entrant because
+# the builders and add/remove call one another.
+_lock = threading.RLock()
+
+SEARCH_MODES = ("hybrid", "bm25", "vector")
+
+
+def _article_text(article: dict) -> str:
+    return " ".join([article["title"], article["abstract"], " ".join(article["keywords"])])
+
+
+def _get_index() -> BM25Index:
+    """Open the corpus and build the inverted index over it on first use."""
+    global _INDEX, _STORE
+    if _INDEX is None:
+        with _lock:
+            if _INDEX is None:
+                store_path = os.getenv("LITERATURE_STORE_PATH")
+                if store_path and _STORE is None:
+                    _STORE = ArticleStore(store_path)
+                elif not store_path:
+                    for article in ARTICLES:
+                        _ARTICLES_BY_ID[article["id"]] = article
+                index = BM25Index()
+                try:
+                    index.add_many((article["id"], _article_text(article)) for article in _corpus())
+                except BaseException:
+                    close()
+                    raise
+                _INDEX = index
+    return _INDEX
+
+
+def close() -> None:
+    """Unmap the article store and drop the indexes built over it (on shutdown).
+
+    The next search reopens the store and rebuilds them. Articles added or
+    removed at runtime are kept.
+    """
+    global _INDEX, _VECTOR_INDEX, _STORE
+    with _lock:
+        store, _STORE = _STORE, None
+        _INDEX = _VECTOR_INDEX = None
+        if store is not None:
+            store.close()
+
+
+def _corpus() -> Iterator[dict]:
+    """Every live article: the store's rows (if any), then those held in memory."""
+    if _STORE is not None:
+        for article in _STORE:
+            if article["id"] not in _REMOVED_FROM_STORE:
+                yield article
+    yield from list(_ARTICLES_BY_ID.values())
+
+
+def _has_article(doc_id: str) -> bool:
+    if doc_id in _ARTICLES_BY_ID:
+        return True
+    return _STORE is not None and doc_id not in _REMOVED_FROM_STORE and doc_id in _STORE
+
+
+def _article_count() -> int:
+    stored = len(_STORE) - len(_REMOVED_FROM_STORE) if _STORE is not None else 0
+    return stored + len(_ARTICLES_BY_ID)
+
+
+def get_article(doc_id: str) -> dict | None:
+    """The article with ID ``doc_id``, or ``None``."""
+    _get_index()
+    article = _ARTICLES_BY_ID.get(doc_id)
+    if article is None and _STORE is not None and doc_id not in _REMOVED_FROM_STORE:
+        article = _STORE.get(doc_id)
+    return article
+
+
+def _get_vector_index() -> VectorIndex:
+    """Load the saved vector index, or embed every article, on first use.
+
+    A saved index is used only if it was built by the current encoder over
+    the current set of articles; otherwise it is rebuilt (and re-saved).
+    """
+    global _VECTOR_INDEX
+    if _VECTOR_INDEX is None:
+        with _lock:
+            if _VECTOR_INDEX is None:
+                _VECTOR_INDEX = _load_or_build_vector_index()
+    return _VECTOR_INDEX
+
+
+def _load_or_build_vector_index() -> VectorIndex:
+    _get_index()
+    encoder = get_encoder()
+    path = os.getenv("LITERATURE_VECTOR_INDEX")
+    if path and os.path.exists(os.path.join(path, "meta.json")):
+        index = VectorIndex.load(path)
+        if (index.encoder, index.dim) == (encoder.name, encoder.dim) and \
+                len(index) == _article_count() and all(_has_article(i) for i in index.doc_ids()):
+            return index
+    index = VectorIndex(encoder.dim, encoder.name)
+    doc_ids, chunks, batch = [], [], []
+    for article in _corpus():
+        doc_ids.append(article["id"])
+        batch.append(_article_text(article))
+        if len(batch) == 10_000:
+            chunks.append(encoder.encode(batch))
+            batch = []
+    if batch or not chunks:
+        chunks.append(encoder.encode(batch))
+    index.add_many(doc_ids, np.concatenate(chunks))
+    n_lists = int(os.getenv("LITERATURE_IVF_LISTS", "0"))
+    if n_lists:
+        index.build_ivf(n_lists)
+    if path:
+        index.save(path)
+    return index
+
+
+def build_indexes() -> None:
+    """Build the indexes ``LITERATURE_SEARCH`` needs now rather than on the first query.
+
+    Embedding a large corpus takes far longer than a tool call may, so the
+    API does this at startup (``registry.warm_up``).
+    """
+    _get_index()
+    if os.getenv("LITERATURE_SEARCH", "hybrid").lower() != "bm25":
+        _get_vector_index()
+
+
+def add_article(article: dict) -> None:
+    """Add or replace an article and update the search indexes incrementally."""
+    with _lock:
+        index = _get_index()
+        if _has_article(article["id"]):
+            remove_article(article["id"])
+        ARTICLES.append(article)
+        _ARTICLES_BY_ID[article["id"]] = article
+        index.add(article["id"], _article_text(article))
+        if _VECTOR_INDEX is not None:
+            _VECTOR_INDEX.add(article["id"], get_encoder().encode([_article_text(article)])[0])
+
+
+def remove_article(article_id: str) -> bool:
+    """Remove an article from the corpus and the search index."""
+    with _lock:
+        index = _get_index()
+        article = _ARTICLES_BY_ID.pop(article_id, None)
+        if article is not None:
+            ARTICLES.remove(article)
+        elif _STORE is not None and article_id not in _REMOVED_FROM_STORE and article_id in _STORE:
+            _REMOVED_FROM_STORE.add(article_id)
+        else:
+            return False
+        index.remove(article_id)
+        if _VECTOR_INDEX is not None:
+            _VECTOR_INDEX.remove(article_id)
+        return True
+
+
+def _vector_search(query: str, k: int) -> list[tuple[str, float]]:
+    min_similarity = float(os.getenv("LITERATURE_MIN_SIMILARITY", "0.15"))
+    n_probe = int(os.getenv("LITERATURE_IVF_PROBE", "8"))
+    hits = _get_vector_index().search(get_encoder().encode([query])[0], k, n_probe)
+    return [(doc_id, score) for doc_id, score in hits if score >= min_similarity]
+
+
+def search_articles(query: str, limit: int = 5, mode: str | None = None) -> list[dict]:
+    """Search the simulated medical literature, most relevant articles first.
+
+    ``mode`` (default ``LITERATURE_SEARCH``) is "bm25" for lexical
+    ranking only, "vector" for embedding similarity only, or "hybrid",
+    which adds the two with BM25 scores scaled to the best lexical match.
+    Stopwords in the query are ignored.
+    """
+    mode = (mode or os.getenv("LITERATURE_SEARCH", "hybrid")).lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown LITERATURE_SEARCH '{mode}' (expected one of: {', '.join(SEARCH_MODES)})")
+    if mode == "bm25":
+        ranked = _get_index().search(query, limit)
+    elif mode == "vector":
+        ranked = _vector_search(query, limit)
+    else:
+        weight = float(os.getenv("LITERATURE_VECTOR_WEIGHT", "0.5"))
+        pool = max(limit * 4, 20)
+        scores: dict[str, float] = {}
+        lexical = _get_index().search(query, pool)
+        if lexical:
+            best = lexical[0][1] or 1.0
+            for doc_id, score in lexical:
+                scores[doc_id] = (1 - weight) * score / best
+        for doc_id, score in _vector_search(query, pool):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * score
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [get_article(doc_id) for doc_id, _ in ranked]
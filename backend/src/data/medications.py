@@ -0,0 +1,146 @@
+"""Normalization of free-text medication entries to drug database keys.
+
+Patient records store regimens the way clinicians write them
+("metformin 1000mg BID", "fluticasone/salmeterol 250/50 BID"), while the
+drug database is keyed by bare lowercase generic names. This module parses
+dose and frequency, splits combination products ("a/b", "a + b", and
+"a-b" when every part is a known drug), drops release suffixes ("ER",
+"XR"), maps brand names and synonyms to generic names, and memoizes the
+result. Interaction checks run on these names, so a combination brand
+must expand to every ingredient.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.data.drug_database import check_interactions, lookup_drug
+
+# Brand names and synonyms -> generic name(s). Combination brands map to
+# every component.
+SYNONYMS: dict[str, tuple[str, ...]] = {
+    "glucophage": ("metformin",),
+    "zestril": ("lisinopril",),
+    "prinivil": ("lisinopril",),
+    "norvasc": ("amlodipine",),
+    "lipitor": ("atorvastatin",),
+    "asa": ("aspirin",),
+    "acetylsalicylic acid": ("aspirin",),
+    "bayer": ("aspirin",),
+    "zoloft": ("sertraline",),
+    "amoxil": ("amoxicillin",),
+    "salbutamol": ("albuterol",),
+    "ventolin": ("albuterol",),
+    "proair": ("albuterol",),
+    "imitrex": ("sumatriptan",),
+    "coumadin": ("warfarin",),
+    "jantoven": ("warfarin",),
+    "advair": ("fluticasone", "salmeterol"),
+    "zestoretic": ("lisinopril", "hydrochlorothiazide"),
+    "lisinopril-hydrochlorothiazide": ("lisinopril", "hydrochlorothiazide"),
+    "co-trimoxazole": ("sulfamethoxazole", "trimethoprim"),
+    "bactrim": ("sulfamethoxazole", "trimethoprim"),
+}
+
+_FREQUENCY_RE = re.compile(
+    r"\b(once daily|twice daily|daily|bid|tid|qid|qhs|qam|qpm|qd|prn|weekly|q\d+h)\b", re.IGNORECASE
+)
+_DOSE_RE = re.compile(
+    r"\b\d[\d.,]*(?:[/-]\d[\d.,]*)*\s*"
+    r"(?:mg|mcg|g|ml|units?|iu|%|puffs?|tabs?|tablets?|caps?|capsules?|drops?|sprays?)?"
+    r"(?:/(?:\d+\s*)?(?:ml|dose|hr|h))?(?=\s|$)",
+    re.IGNORECASE,
+)
+_COMBINATION_SPLIT_RE = re.compile(r"\s*(?:/|\+|\band\b)\s*")
+# Modified-release suffixes ("metformin ER") name the same ingredient.
+_RELEASE_SUFFIX_RE = re.compile(r"\s+(?:er|xr|xl|sr|dr|cr|la|ir)$")
+
+
+@dataclass(frozen=True)
+class NormalizedMedication:
+    """A parsed medication entry.
+
+    Attributes:
+        raw: The original text.
+        names: Generic drug names, one per component of a combination.
+        dose: Dose text (e.g. "1000mg", "250/50"), if present.
+        frequency: Frequency text (e.g. "BID", "daily"), if present.
+    """
+
+    raw: str
+    names: tuple[str, ...]
+    dose: str | None = None
+    frequency: str | None = None
+
+
+def _known(name: str) -> bool:
+    return name in SYNONYMS or lookup_drug(name) is not None
+
+
+def _canonical(name: str) -> tuple[str, ...]:
+    name = _RELEASE_SUFFIX_RE.sub("", " ".join(name.split()))
+    if name in SYNONYMS:
+        return SYNONYMS[name]
+    if "-" in name and not _known(name):
+        # "amlodipine-atorvastatin" is a combination product, but hyphens
+        # also occur inside single names, so split only into known drugs.
+        parts = [part.strip() for part in name.split("-")]
+        if all(part and _known(part) for part in parts):
+            return tuple(g for part in parts for g in _canonical(part))
+    return (name,)
+
+
+@lru_cache(maxsize=4096)
+def normalize_medication(text: str) -> NormalizedMedication:
+    """Parse one free-text medication entry. Results are memoized."""
+    stripped = text.strip()
+
+    # Every frequency term is kept: "q4h PRN" is a different regimen from "q4h".
+    frequency_matches = list(_FREQUENCY_RE.finditer(stripped))
+    dose_match = _DOSE_RE.search(stripped)
+
+    cut = min(
+        (m.start() for m in frequency_matches[:1] + [dose_match] if m is not None),
+        default=len(stripped),
+    )
+    name_part = stripped[:cut].lower().strip(" ,;")
+
+    names = tuple(
+        generic
+        for component in _COMBINATION_SPLIT_RE.split(name_part)
+        if component
+        for generic in _canonical(component)
+    )
+
+    return NormalizedMedication(
+        raw=text,
+        names=tuple(dict.fromkeys(names)),
+        dose=dose_match.group(0).strip() if dose_match else None,
+        frequency=" ".join(m.group(0) for m in frequency_matches) or None,
+    )
+
+
+def canonical_drug_names(medications: list[str]) -> list[str]:
+    """Return the de-duplicated generic names in a regimen, in order."""
+    names: list[str] = []
+    for medication in medications:
+        names.extend(normalize_medication(medication).names)
+    return list(dict.fromkeys(names))
+
+
+def interaction_report(medications: list[str]) -> dict:
+    """Compute a regimen's interaction report without any LLM involvement.
+
+    Returns a dict with the parsed ``medications``, the generic names not
+    found in the drug database (``unrecognized``) and the known
+    ``interactions`` among the regimen.
+    """
+    parsed = [normalize_medication(m) for m in medications]
+    names = canonical_drug_names(medications)
+    return {
+        "medications": parsed,
+        "unrecognized": [n for n in names if lookup_drug(n) is None],
+        "interactions": check_interactions(names),
+    }
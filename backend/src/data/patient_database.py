@@ -1,4 +1,16 @@
-"""Simulated patient records database."""
+"""Simulated patient records database.
+
+``PATIENTS`` holds the sample records used to seed the store; all reads and
+writes go through the SQLite-backed ``PatientStore`` (see patient_store.py).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable
+
+from src.data.patient_store import PatientStore
 
 PATIENTS: dict[str, dict] = {
     "P-1001": {
@@ -81,24 +93,86 @@ PATIENTS: dict[str, dict] = {
 }
 
 
+def record_version(patient: dict) -> str:
+    """Return a short content hash identifying this version of a record."""
+    encoded = json.dumps(patient, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+_store: PatientStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PatientStore:
+    """Return the process-wide patient store.
+
+    The store lives at ``PATIENT_DB_PATH`` (default: in memory) and is seeded
+    with the sample ``PATIENTS`` when empty.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = PatientStore(os.getenv("PATIENT_DB_PATH", ":memory:"))
+                if store.count() == 0:
+                    store.bulk_load((p, record_version(p)) for p in PATIENTS.values())
+                _store = store
+    return _store
+
+
 def get_patient(patient_id: str) -> dict | None:
     """Retrieve a patient record by ID."""
-    return PATIENTS.get(patient_id)
+    return get_store().get(patient_id)
+
+
+def get_patient_version(patient_id: str) -> str | None:
+    """Return the current record version for a patient, without loading it."""
+    return get_store().version(patient_id)
+
+
+def search_patients(query: str, limit: int | None = None) -> list[dict]:
+    """Search patients by name or condition (case-insensitive).
+
+    Matches are found through the store's word-prefix index, so the query
+    must start at a word boundary ("garc" matches Garcia, "arcia" does not).
+    """
+    return get_store().search(query, limit)
+
+
+def list_all_patient_ids(limit: int | None = None) -> list[str]:
+    """Return available patient IDs in order, optionally only the first ``limit``."""
+    return get_store().list_ids(limit)
+
+
+def list_patients_page(
+    after: str | None = None,
+    limit: int = 50,
+    condition: str | None = None,
+    min_age: int | None = None,
+    max_age: int | None = None,
+    sex: str | None = None,
+) -> tuple[list[dict], bool]:
+    """Return one ID-ordered page of patients and whether more follow."""
+    return get_store().list_page(after, limit, condition, min_age, max_age, sex)
+
+
+def patients_revision() -> int:
+    """Return a counter that changes whenever any patient record is written."""
+    return get_store().revision
+
+
+def count_patients() -> int:
+    """Return the number of stored patients."""
+    return get_store().count()
 
 
-def search_patients(query: str) -> list[dict]:
-    """Search patients by name or condition (case-insensitive)."""
-    query_lower = query.lower()
-    results = []
-    for patient in PATIENTS.values():
-        if query_lower in patient["name"].lower():
-            results.append(patient)
-            continue
-        if any(query_lower in c.lower() for c in patient["conditions"]):
-            results.append(patient)
-    return results
+def upsert_patient(patient: dict) -> str:
+    """Insert or update a patient record and return its new version."""
+    version = record_version(patient)
+    get_store().upsert(patient, version)
+    return version
 
 
-def list_all_patient_ids() -> list[str]:
-    """Return all available patient IDs."""
-    return list(PATIENTS.keys())
+def bulk_load_patients(patients: Iterable[dict], batch_size: int = 10_000) -> int:
+    """Load many patient records in batched transactions."""
+    return get_store().bulk_load(((p, record_version(p)) for p in patients), batch_size)
@@ -0,0 +1,343 @@
+"""SQLite-backed patient store with indexed name and condition lookup.
+
+Records are stored as JSON alongside indexed columns. Name and condition
+words are written to a term table whose primary key doubles as a prefix
+index, so searching for "garcia" or "diab" is a range scan rather than a
+pass over every patient.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from src.data.search_index import STOPWORDS
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Condition words matching fewer patients than this are looked up through
+# the condition index; commoner ones fill a page faster walking patients.
+_SELECTIVE_MATCHES = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    sex TEXT NOT NULL,
+    version TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS patient_terms (
+    term TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    PRIMARY KEY (term, patient_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS condition_terms (
+    term TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    PRIMARY KEY (term, patient_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_patient_terms_patient ON patient_terms(patient_id);
+CREATE INDEX IF NOT EXISTS idx_condition_terms_patient ON condition_terms(patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_age ON patients(age);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta VALUES ('revision', 0);
+"""
+
+
+def _words(text: str) -> list[str]:
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _terms(patient: dict) -> set[str]:
+    return set(_words(" ".join([patient["name"], *patient["conditions"]])))
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _prefixes_all(text: str, words: list[str]) -> bool:
+    """Whether every one of ``words`` starts some word of ``text``."""
+    text_words = _words(text)
+    return all(any(t.startswith(w) for t in text_words) for w in words)
+
+
+class PatientStore:
+    """Patient records in SQLite behind a small, thread-safe API.
+
+    ``path`` may be a file path or ``":memory:"``. ``revision`` increases on
+    every write, so callers can cheaply detect that the data changed.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ── writes ──
+
+    def _insert(self, patient: dict, version: str) -> None:
+        self._conn.execute("DELETE FROM patient_terms WHERE patient_id = ?", (patient["id"],))
+        self._conn.execute("DELETE FROM condition_terms WHERE patient_id = ?", (patient["id"],))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO patients VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                patient["id"],
+                patient["name"],
+                patient["age"],
+                patient["sex"],
+                version,
+                json.dumps(patient),
+            ),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO patient_terms VALUES (?, ?)",
+            [(term, patient["id"]) for term in _terms(patient)],
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO condition_terms VALUES (?, ?)",
+            [(term, patient["id"]) for term in set(_words(" ".join(patient["conditions"])))],
+        )
+
+    def _bump_revision(self) -> None:
+        self._conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'revision'")
+
+    def upsert(self, patient: dict, version: str) -> None:
+        """Insert or replace one patient record."""
+        with self._lock, self._conn:
+            self._insert(patient, version)
+            self._bump_revision()
+
+    def bulk_load(self, patients: Iterable[tuple[dict, str]], batch_size: int = 10_000) -> int:
+        """Insert ``(record, version)`` pairs in batched transactions."""
+        count = 0
+        with self._lock:
+            batch = []
+            for item in patients:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    count += self._load_batch(batch)
+                    batch = []
+            if batch:
+                count += self._load_batch(batch)
+        return count
+
+    def _load_batch(self, batch: list[tuple[dict, str]]) -> int:
+        with self._conn:
+            for patient, version in batch:
+                self._insert(patient, version)
+            self._bump_revision()
+        return len(batch)
+
+    def delete(self, patient_id: str) -> bool:
+        """Remove a patient. Returns False if it did not exist."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM patient_terms WHERE patient_id = ?", (patient_id,))
+            self._conn.execute("DELETE FROM condition_terms WHERE patient_id = ?", (patient_id,))
+            deleted = self._conn.execute("DELETE FROM patients WHERE id = ?", (patient_id,)).rowcount
+            self._bump_revision()
+        return bool(deleted)
+
+    # ── reads ──
+
+    @property
+    def revision(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'revision'"
+            ).fetchone()[0]
+
+    def get(self, patient_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM patients WHERE id = ?", (patient_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def version(self, patient_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM patients WHERE id = ?", (patient_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM patients").fetchone()[0]
+
+    def list_ids(self, limit: int | None = None) -> list[str]:
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM patients ORDER BY id LIMIT ?", (-1 if limit is None else limit,)
+                )
+            ]
+
+    def iter_patients(self, batch_size: int = 1000) -> Iterator[dict]:
+        """Yield every record in ID order without loading them all at once."""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, record FROM patients WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for _, record in rows:
+                yield json.loads(record)
+            last_id = rows[-1][0]
+
+    def list_page(
+        self,
+        after: str | None = None,
+        limit: int = 50,
+        condition: str | None = None,
+        min_age: int | None = None,
+        max_age: int | None = None,
+        sex: str | None = None,
+    ) -> tuple[list[dict], bool]:
+        """Return one page of patients in ID order, plus whether more exist.
+
+        Pagination is keyset-based: pass the last ID of the previous page as
+        ``after``. ``condition`` matches patients having a single condition
+        whose words start with every word of the filter ("diabetes", "kidney
+        disease"); a filter made only of stopwords raises ``ValueError``.
+
+        A selective condition drives the lookup from the condition index;
+        a common one walks patients in ID order, where a page fills quickly.
+        """
+        words = _words(condition or "")
+        if condition and condition.strip() and not words:
+            raise ValueError(f"Condition filter {condition!r} has no searchable words")
+
+        clauses = []
+        params: list = []
+        if min_age is not None:
+            clauses.append("age >= ?")
+            params.append(min_age)
+        if max_age is not None:
+            clauses.append("age <= ?")
+            params.append(max_age)
+        if sex:
+            clauses.append("sex = ? COLLATE NOCASE")
+            params.append(sex)
+
+        if not words:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT record FROM patients WHERE {' AND '.join(clauses + ['id > ?'])}"
+                    " ORDER BY id LIMIT ?",
+                    (*params, after or "", limit + 1),
+                ).fetchall()
+            return [json.loads(r[0]) for r in rows[:limit]], len(rows) > limit
+
+        with self._lock:
+            driver = min(words, key=lambda w: self._estimate_matches(w, table="condition_terms"))
+            selective = self._estimate_matches(driver, table="condition_terms") < _SELECTIVE_MATCHES
+        others = words
+        if selective:
+            others = [w for w in words if w != driver]
+            clauses.insert(
+                0, "id IN (SELECT patient_id FROM condition_terms WHERE term >= ? AND term < ?)"
+            )
+            params[:0] = [driver, _prefix_upper_bound(driver)]
+        for word in others:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM condition_terms c WHERE c.patient_id = patients.id"
+                " AND c.term >= ? AND c.term < ?)"
+            )
+            params += [word, _prefix_upper_bound(word)]
+
+        # The term index only says each word appears in some condition;
+        # candidates are confirmed to have one condition holding them all.
+        results: list[dict] = []
+        last_id = after or ""
+        batch = limit + 1
+        while len(results) <= limit:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, record FROM patients WHERE {' AND '.join(clauses + ['id > ?'])}"
+                    " ORDER BY id LIMIT ?",
+                    (*params, last_id, batch),
+                ).fetchall()
+            if not rows:
+                break
+            for _, record in rows:
+                patient = json.loads(record)
+                if any(_prefixes_all(c, words) for c in patient["conditions"]):
+                    results.append(patient)
+                    if len(results) > limit:
+                        break
+            last_id = rows[-1][0]
+            batch = min(batch * 2, 1000)
+        return results[:limit], len(results) > limit
+
+    def _estimate_matches(self, prefix: str, cap: int = 10_000, table: str = "patient_terms") -> int:
+        """Count ``table`` index entries for ``prefix``, stopping at ``cap``."""
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE term >= ? AND term < ? LIMIT ?)",
+            (prefix, _prefix_upper_bound(prefix), cap),
+        ).fetchone()[0]
+
+    def search(self, query: str, limit: int | None = None) -> list[dict]:
+        """Find patients whose name or a condition contains ``query``.
+
+        Candidates come from the term index (every query word must prefix a
+        word in the name or conditions); they are then confirmed with a
+        case-insensitive substring check on the full query.
+        """
+        query_lower = query.lower().strip()
+        words = _words(query_lower)
+        if not words:
+            return []
+
+        # Drive the lookup from the most selective word; the others are
+        # checked per candidate through the patient_id index.
+        with self._lock:
+            driver = min(words, key=self._estimate_matches)
+        others = [w for w in words if w != driver]
+        exists = "".join(
+            " AND EXISTS (SELECT 1 FROM patient_terms t WHERE t.patient_id = p.id"
+            " AND t.term >= ? AND t.term < ?)"
+            for _ in others
+        )
+        params: list = [driver, _prefix_upper_bound(driver)]
+        params += [bound for w in others for bound in (w, _prefix_upper_bound(w))]
+
+        results = []
+        last_id = ""
+        while limit is None or len(results) < limit:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT p.id, p.record FROM patients p WHERE p.id IN "
+                    "(SELECT patient_id FROM patient_terms WHERE term >= ? AND term < ?)"
+                    f"{exists} AND p.id > ? ORDER BY p.id LIMIT 500",
+                    (*params, last_id),
+                ).fetchall()
+            if not rows:
+                break
+            for _, record in rows:
+                patient = json.loads(record)
+                if query_lower in patient["name"].lower() or any(
+                    query_lower in c.lower() for c in patient["conditions"]
+                ):
+                    results.append(patient)
+                    if limit is not None and len(results) >= limit:
+                        break
+            last_id = rows[-1][0]
+        return results
@@ -0,0 +1,160 @@
+"""Inverted index with BM25 ranking for free-text document search."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Iterable
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can could did do does for from had has
+    have how i if in into is it its may might more most no nor not of on or
+    our should so such than that the their them then there these they this
+    those to was were what when where which while who whom why will with
+    would you your
+    """.split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Strip a plural 's' so "inhalers" and "inhaler" share a term."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and light-stem."""
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over an append-mostly inverted index.
+
+    Postings are stored per term as two parallel ``array('i')`` columns
+    (internal doc number, term frequency), which keeps a million-document
+    corpus within a few hundred megabytes. Removal is a tombstone: the
+    document stops matching immediately and its postings are dropped on the
+    next ``compact()``, which runs automatically once removed documents
+    outnumber live ones.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._doc_ids: list[str | None] = []
+        self._doc_numbers: dict[str, int] = {}
+        self._doc_lengths = array("i")
+        self._total_length = 0
+        self._deleted = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_numbers
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        if doc_id in self._doc_numbers:
+            self.remove(doc_id)
+
+        terms = tokenize(text)
+        number = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._doc_numbers[doc_id] = number
+        self._doc_lengths.append(len(terms))
+        self._total_length += len(terms)
+
+        for term, freq in Counter(terms).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("i"), array("i"))
+            postings[0].append(number)
+            postings[1].append(freq)
+
+    def add_many(self, docs: Iterable[tuple[str, str]]) -> None:
+        """Index an iterable of ``(doc_id, text)`` pairs."""
+        for doc_id, text in docs:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove ``doc_id`` from the index. Returns False if it was absent."""
+        number = self._doc_numbers.pop(doc_id, None)
+        if number is None:
+            return False
+        self._doc_ids[number] = None
+        self._total_length -= self._doc_lengths[number]
+        self._doc_lengths[number] = 0
+        self._deleted += 1
+        if self._deleted > len(self._doc_numbers):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop postings of removed documents and renumber the rest."""
+        if not self._deleted:
+            return
+        remap = array("i", [-1]) * len(self._doc_ids)
+        doc_ids: list[str | None] = []
+        lengths = array("i")
+        for number, doc_id in enumerate(self._doc_ids):
+            if doc_id is not None:
+                remap[number] = len(doc_ids)
+                doc_ids.append(doc_id)
+                lengths.append(self._doc_lengths[number])
+
+        postings: dict[str, tuple[array, array]] = {}
+        for term, (numbers, freqs) in self._postings.items():
+            new_numbers, new_freqs = array("i"), array("i")
+            for number, freq in zip(numbers, freqs):
+                if remap[number] >= 0:
+                    new_numbers.append(remap[number])
+                    new_freqs.append(freq)
+            if new_numbers:
+                postings[term] = (new_numbers, new_freqs)
+
+        self._postings = postings
+        self._doc_ids = doc_ids
+        self._doc_numbers = {doc_id: n for n, doc_id in enumerate(doc_ids)}
+        self._doc_lengths = lengths
+        self._deleted = 0
+
+    def search(self, query: str, k: int = 10) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(doc_id, score)`` pairs, best match first."""
+        n_docs = len(self._doc_numbers)
+        if not n_docs or k <= 0:
+            return []
+
+        avg_length = self._total_length / n_docs or 1.0
+        k1 = self.k1
+        base = k1 * (1 - self.b)
+        slope = k1 * self.b / avg_length
+        lengths = self._doc_lengths
+        doc_ids = self._doc_ids
+        has_deleted = self._deleted > 0
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            numbers, freqs = postings
+            df = len(numbers)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            weight = idf * (k1 + 1)
+            for number, freq in zip(numbers, freqs):
+                if has_deleted and doc_ids[number] is None:
+                    continue
+                score = weight * freq / (freq + base + slope * lengths[number])
+                scores[number] = scores.get(number, 0.0) + score
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(doc_ids[number], score) for number, score in top]
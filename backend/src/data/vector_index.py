@@ -0,0 +1,290 @@
+"""Dense vector index with optional IVF partitioning, saved as memory-mapped files.
+
+Rows are L2-normalized float32 vectors, so a dot product is cosine
+similarity. Search is brute force (one matrix-vector product over every
+row) until ``build_ivf(n_lists)`` partitions the rows with spherical
+k-means. After that a query scores only the rows of its ``n_probe``
+nearest partitions, trading a little recall for latency on large corpora.
+
+``save(path)`` writes a directory:
+    vectors-<gen>.npy   the rows, grouped by partition
+    ids-<gen>.json      the document ID of each row
+    ivf-<gen>.npz       centroids and per-partition row offsets (if partitioned)
+    meta.json           dimension, encoder name and current generation
+``VectorIndex.load(path)`` maps the vectors read-only, so rows are paged in
+as queries touch them and shared between processes through the page cache
+instead of being copied into each one.
+
+Each save writes a new generation of files and then swaps ``meta.json``
+in with ``os.replace``, so files never change under a process that has
+them mapped and a load never pairs rows with another save's IDs.
+
+Rows added after a load or build go to an in-memory tail that every query
+scans in full; removal is a tombstone. ``compact()`` folds both into the
+main matrix, assigning new rows to the existing partitions; it runs
+automatically once removed rows outnumber live ones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import uuid
+from typing import Iterable
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; concurrent saves are then not serialized
+    fcntl = None
+
+_ASSIGN_CHUNK = 65536
+DEFAULT_PROBE = 8
+_LOAD_ATTEMPTS = 5
+_GENERATION_FILE_RE = re.compile(r"(?:vectors|ids|ivf)(?:-([0-9a-f]+))?\.(?:npy|json|npz)")
+
+
+def _file(path: str, name: str, generation: str | None) -> str:
+    """Path of ``name`` ("vectors.npy", ...) in ``generation``; None is the unversioned layout."""
+    if generation:
+        stem, ext = os.path.splitext(name)
+        name = f"{stem}-{generation}{ext}"
+    return os.path.join(path, name)
+
+
+def _nearest(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row, in bounded-memory chunks."""
+    assign = np.empty(len(rows), dtype=np.int32)
+    for start in range(0, len(rows), _ASSIGN_CHUNK):
+        chunk = np.asarray(rows[start:start + _ASSIGN_CHUNK])
+        assign[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assign
+
+
+class VectorIndex:
+    """Cosine-similarity search over document vectors."""
+
+    def __init__(self, dim: int, encoder: str = ""):
+        self.dim = dim
+        self.encoder = encoder
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._doc_ids: list[str | None] = []  # main rows, then tail rows
+        self._doc_numbers: dict[str, int] = {}
+        self._tail: list[np.ndarray] = []
+        self._tail_matrix: np.ndarray | None = None
+        self._deleted = 0
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_numbers
+
+    @property
+    def n_lists(self) -> int:
+        """Number of IVF partitions (0 when searching brute force)."""
+        return 0 if self._centroids is None else len(self._centroids)
+
+    def doc_ids(self) -> list[str]:
+        return list(self._doc_numbers)
+
+    def add(self, doc_id: str, vector: np.ndarray) -> None:
+        """Index ``vector`` under ``doc_id``, replacing any previous version."""
+        if doc_id in self._doc_numbers:
+            self.remove(doc_id)
+        self._doc_numbers[doc_id] = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._tail.append(np.asarray(vector, dtype=np.float32).reshape(self.dim))
+        self._tail_matrix = None
+
+    def add_many(self, doc_ids: Iterable[str], vectors: np.ndarray) -> None:
+        """Index rows of ``vectors`` under ``doc_ids``; loads in bulk when empty."""
+        doc_ids = list(doc_ids)
+        if self._doc_ids or len(set(doc_ids)) != len(doc_ids):
+            for doc_id, vector in zip(doc_ids, vectors):
+                self.add(doc_id, vector)
+            return
+        self._matrix = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(doc_ids), self.dim)
+        self._doc_ids = doc_ids
+        self._doc_numbers = {doc_id: n for n, doc_id in enumerate(doc_ids)}
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove ``doc_id`` from the index. Returns False if it was absent."""
+        number = self._doc_numbers.pop(doc_id, None)
+        if number is None:
+            return False
+        self._doc_ids[number] = None
+        self._deleted += 1
+        if self._deleted > len(self._doc_numbers):
+            self.compact()
+        return True
+
+    def _tail_rows(self) -> np.ndarray:
+        if self._tail_matrix is None:
+            self._tail_matrix = (
+                np.stack(self._tail) if self._tail else np.zeros((0, self.dim), dtype=np.float32)
+            )
+        return self._tail_matrix
+
+    def compact(self) -> None:
+        """Fold the tail into the main matrix and drop removed rows."""
+        if not self._deleted and not self._tail:
+            return
+        numbers = np.fromiter(self._doc_numbers.values(), dtype=np.int64, count=len(self._doc_numbers))
+        numbers.sort()
+        n_main = len(self._matrix)
+        rows = np.concatenate([
+            np.asarray(self._matrix[numbers[numbers < n_main]]),
+            self._tail_rows()[numbers[numbers >= n_main] - n_main],
+        ])
+        doc_ids = [self._doc_ids[n] for n in numbers]
+        self._tail = []
+        self._tail_matrix = None
+        self._deleted = 0
+        if self._centroids is not None:
+            self._partition(rows, doc_ids, _nearest(rows, self._centroids))
+        else:
+            self._matrix = rows
+            self._doc_ids = doc_ids
+            self._doc_numbers = {doc_id: n for n, doc_id in enumerate(doc_ids)}
+
+    def _partition(self, rows: np.ndarray, doc_ids: list[str], assign: np.ndarray) -> None:
+        order = np.argsort(assign, kind="stable")
+        self._matrix = np.ascontiguousarray(rows[order])
+        self._doc_ids = [doc_ids[i] for i in order]
+        self._doc_numbers = {doc_id: n for n, doc_id in enumerate(self._doc_ids)}
+        counts = np.bincount(assign, minlength=len(self._centroids))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def build_ivf(self, n_lists: int, iterations: int = 10, sample_size: int = 50_000, seed: int = 0) -> None:
+        """Partition the rows into ``n_lists`` clusters with spherical k-means.
+
+        Centroids are trained on a sample of up to ``sample_size`` rows; every
+        row is then assigned to its nearest centroid.
+        """
+        self.compact()
+        rows = np.asarray(self._matrix)
+        n_lists = min(n_lists, len(rows))
+        if n_lists < 2:
+            self._centroids = self._offsets = None
+            return
+
+        rng = np.random.default_rng(seed)
+        sample = rows[np.sort(rng.choice(len(rows), min(len(rows), sample_size), replace=False))]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assign = _nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0  # an empty cluster keeps its old centroid
+            centroids[filled] = sums[filled] / norms[filled]
+
+        self._centroids = centroids
+        self._partition(rows, list(self._doc_ids), _nearest(rows, centroids))
+
+    def search(self, vector: np.ndarray, k: int = 10, n_probe: int | None = None) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(doc_id, cosine)`` pairs, most similar first.
+
+        With partitions, only the ``n_probe`` nearest ones are scanned
+        (default ``DEFAULT_PROBE``; ``n_probe >= n_lists`` is an exact search).
+        """
+        if not self._doc_numbers or k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        n_probe = n_probe or DEFAULT_PROBE
+
+        if self._centroids is not None and n_probe < len(self._centroids):
+            probe = np.argpartition(self._centroids @ query, -n_probe)[-n_probe:]
+            spans = [(self._offsets[p], self._offsets[p + 1]) for p in probe]
+            numbers = [np.arange(start, end) for start, end in spans]
+            scores = [self._matrix[start:end] @ query for start, end in spans]
+        else:
+            numbers = [np.arange(len(self._matrix))]
+            scores = [self._matrix @ query]
+        if self._tail:
+            numbers.append(np.arange(len(self._matrix), len(self._doc_ids)))
+            scores.append(self._tail_rows() @ query)
+        numbers = np.concatenate(numbers)
+        scores = np.concatenate(scores)
+
+        # Over-fetch by the tombstone count so removed rows cannot crowd out hits.
+        take = min(len(scores), k + self._deleted)
+        top = np.argpartition(scores, -take)[-take:]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for i in top:
+            doc_id = self._doc_ids[numbers[i]]
+            if doc_id is not None:
+                results.append((doc_id, float(scores[i])))
+                if len(results) == k:
+                    break
+        return results
+
+    def save(self, path: str) -> None:
+        """Write the index to the directory ``path`` (compacting it first).
+
+        The new files are complete before ``meta.json`` points at them.
+        Older generations are deleted afterwards; processes that mapped
+        them keep their pages until they unmap.
+        """
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # another worker may be saving too
+            generation = uuid.uuid4().hex[:12]
+            np.save(_file(path, "vectors.npy", generation), np.asarray(self._matrix))
+            with open(_file(path, "ids.json", generation), "w") as f:
+                json.dump(self._doc_ids, f)
+            if self._centroids is not None:
+                np.savez(_file(path, "ivf.npz", generation), centroids=self._centroids, offsets=self._offsets)
+            meta = {
+                "dim": self.dim,
+                "encoder": self.encoder,
+                "rows": len(self._doc_ids),
+                "generation": generation,
+                "ivf": self._centroids is not None,
+            }
+            with open(_file(path, "meta.json", generation), "w") as f:
+                json.dump(meta, f)
+            os.replace(_file(path, "meta.json", generation), os.path.join(path, "meta.json"))
+            for name in os.listdir(path):
+                match = _GENERATION_FILE_RE.fullmatch(name)
+                if match and match.group(1) != generation:
+                    os.remove(os.path.join(path, name))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorIndex":
+        """Open an index written by ``save``; rows are memory-mapped unless ``mmap`` is false."""
+        for attempt in range(_LOAD_ATTEMPTS):
+            try:
+                return cls._load(path, mmap)
+            except FileNotFoundError:
+                # A concurrent save replaced the generation between reading
+                # meta.json and opening its files; the new one is complete.
+                if attempt == _LOAD_ATTEMPTS - 1:
+                    raise
+
+    @classmethod
+    def _load(cls, path: str, mmap: bool) -> "VectorIndex":
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        generation = meta.get("generation")
+        index = cls(meta["dim"], meta.get("encoder", ""))
+        index._matrix = np.load(_file(path, "vectors.npy", generation), mmap_mode="r" if mmap else None)
+        with open(_file(path, "ids.json", generation)) as f:
+            index._doc_ids = json.load(f)
+        if len(index._doc_ids) != len(index._matrix) or len(index._doc_ids) != meta["rows"]:
+            raise ValueError(f"Vector index at {path} is incomplete")
+        index._doc_numbers = {doc_id: n for n, doc_id in enumerate(index._doc_ids)}
+        ivf_path = _file(path, "ivf.npz", generation)
+        if meta.get("ivf", os.path.exists(ivf_path)):
+            with np.load(ivf_path) as ivf:
+                index._centroids = ivf["centroids"]
+                index._offsets = ivf["offsets"]
+        return index
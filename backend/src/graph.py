@@ -1,33 +1,84 @@
 """LangGraph multi-agent orchestrator for the medical pipeline.
 
-The graph flows linearly through three stages:
-  Intake → Diagnosis → Care Plan
+``GRAPH_TOPOLOGY`` selects how the stages are wired:
+  linear    Intake → Medication Safety → Diagnosis → Care Plan (default)
+  parallel  Intake → {Medication Safety, Literature Retrieval} → Diagnosis → Care Plan
 
-Each node is a specialized agent that reads from and writes to the shared
-PatientState, passing structured data downstream.
+Intake, Diagnosis and Care Plan are LLM agents; Medication Safety and
+Literature Retrieval are deterministic lookups. In the parallel topology
+both lookups run concurrently after intake and Diagnosis waits for both;
+their outputs are disjoint state keys plus the append-only ``messages``
+log, so the branches join without conflicts. Every node reads from and
+writes to the shared PatientState, passing structured data downstream.
 """
 
+from __future__ import annotations
+
+import os
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 
 from src.agents.care_plan import run_care_plan
 from src.agents.diagnosis import run_diagnosis
 from src.agents.intake import run_intake
+from src.agents.literature_retrieval import run_literature_retrieval
+from src.agents.medication_safety import run_medication_safety
 from src.state import PatientState
 
+TOPOLOGIES = ("linear", "parallel")
+
+
+def initial_state(
+    patient_input: str,
+    patient_record: dict | None = None,
+    intake_mode: str = "llm",
+) -> PatientState:
+    """Build the graph input for one analysis.
+
+    Passing ``patient_record`` enables the intake fast path, which skips the
+    LLM tool loop that would otherwise fetch the same record again.
+    """
+    state: PatientState = {"patient_input": patient_input, "messages": []}
+    if patient_record is not None:
+        state["patient_record"] = patient_record
+        state["intake_mode"] = intake_mode
+    return state
+
+
+def build_medical_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+    topology: str | None = None,
+) -> StateGraph:
+    """Construct and compile the multi-agent medical graph.
+
+    ``topology`` is "linear" or "parallel" (default: ``GRAPH_TOPOLOGY``,
+    else "linear"). With a ``checkpointer`` the state is saved after every
+    node, so a run (identified by ``configurable.thread_id``) can resume
+    from the last completed node; see resilience.py.
+    """
+    topology = (topology or os.getenv("GRAPH_TOPOLOGY", "linear")).lower()
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown GRAPH_TOPOLOGY '{topology}' (expected one of: {', '.join(TOPOLOGIES)})")
 
-def build_medical_graph() -> StateGraph:
-    """Construct and compile the multi-agent medical graph."""
     graph = StateGraph(PatientState)
 
-    # Add agent nodes
-    graph.add_node("intake", run_intake)
-    graph.add_node("diagnosis", run_diagnosis)
-    graph.add_node("care_plan", run_care_plan)
+    # Add agent nodes (node names may not collide with PatientState keys)
+    graph.add_node("intake_agent", run_intake)
+    graph.add_node("medication_safety", run_medication_safety)
+    graph.add_node("diagnosis_agent", run_diagnosis)
+    graph.add_node("care_plan_agent", run_care_plan)
 
     # Define the pipeline flow
-    graph.set_entry_point("intake")
-    graph.add_edge("intake", "diagnosis")
-    graph.add_edge("diagnosis", "care_plan")
-    graph.add_edge("care_plan", END)
+    graph.set_entry_point("intake_agent")
+    graph.add_edge("intake_agent", "medication_safety")
+    if topology == "parallel":
+        graph.add_node("literature_retrieval", run_literature_retrieval)
+        graph.add_edge("intake_agent", "literature_retrieval")
+        graph.add_edge(["medication_safety", "literature_retrieval"], "diagnosis_agent")
+    else:
+        graph.add_edge("medication_safety", "diagnosis_agent")
+    graph.add_edge("diagnosis_agent", "care_plan_agent")
+    graph.add_edge("care_plan_agent", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
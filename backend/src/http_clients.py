@@ -0,0 +1,194 @@
+"""Shared, pooled HTTP clients for the model endpoint.
+
+``ChatOpenAI`` builds its own ``httpx`` clients unless it is handed some,
+and a fresh client means fresh TCP and TLS handshakes. These helpers
+create one sync and one async ``httpx`` client per process, with
+keep-alive pooling and explicit timeouts (and HTTP/2 when the ``h2``
+package is installed), for every chat model to share.
+
+Each request carries an ``httpcore`` trace hook that counts requests, new
+TCP connections and TLS handshakes, so connection reuse shows up in
+``/metrics`` (``llm_http_*``) and ``/api/health``.
+
+Configured with:
+    LLM_HTTP_MAX_CONNECTIONS   pool size per client (default 100)
+    LLM_HTTP_MAX_KEEPALIVE     idle connections kept open (default 20)
+    LLM_HTTP_KEEPALIVE_EXPIRY  seconds an idle connection is kept (default 30)
+    LLM_HTTP_CONNECT_TIMEOUT   seconds to establish a connection (default 5)
+    LLM_HTTP_TIMEOUT           read/write/pool timeout in seconds (default 60)
+    LLM_HTTP2                  auto (default: HTTP/2 if h2 is installed), 1 or 0
+
+The async client is tied to the event loop that first uses it, which is
+the server's loop under uvicorn.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+import httpx
+
+from src.telemetry import METRICS
+
+
+def _resolve_http2(setting: str) -> bool:
+    if setting in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if setting != "auto":
+            print("HTTP/2 disabled for the model endpoint: install 'httpx[http2]' to enable it")
+        return False
+    return True
+
+
+@dataclass
+class HttpPoolConfig:
+    max_connections: int = 100
+    max_keepalive: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    timeout: float = 60.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "HttpPoolConfig":
+        return cls(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+            connect_timeout=float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "5")),
+            timeout=float(os.getenv("LLM_HTTP_TIMEOUT", "60")),
+            http2=_resolve_http2(os.getenv("LLM_HTTP2", "auto").lower()),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+class ConnectionStats:
+    """Per-client counts of requests, new connections and TLS handshakes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, client: str, event: str) -> None:
+        # event is e.g. "connection.connect_tcp.complete" or "http11.send_request_headers.started"
+        if event.endswith("send_request_headers.started"):
+            key, metric, help = "requests", "llm_http_requests_total", "HTTP requests sent to the model endpoint"
+        elif event == "connection.connect_tcp.complete":
+            key, metric, help = "connections_opened", "llm_http_connections_opened_total", "New TCP connections to the model endpoint"
+        elif event == "connection.start_tls.complete":
+            key, metric, help = "tls_handshakes", "llm_http_tls_handshakes_total", "TLS handshakes with the model endpoint"
+        else:
+            return
+        with self._lock:
+            self._counts[client][key] += 1
+        METRICS.inc(metric, help=help, client=client)
+
+    def summary(self) -> dict:
+        with self._lock:
+            summary = {}
+            for client, counts in self._counts.items():
+                requests = counts["requests"]
+                opened = counts["connections_opened"]
+                summary[client] = {
+                    "requests": requests,
+                    "connections_opened": opened,
+                    "tls_handshakes": counts["tls_handshakes"],
+                    "reused_requests": max(0, requests - opened),
+                    "reuse_ratio": round(1 - opened / requests, 3) if requests else None,
+                }
+            return summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+CONNECTION_STATS = ConnectionStats()
+
+_lock = threading.Lock()
+_config: HttpPoolConfig | None = None
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+
+
+def get_pool_config() -> HttpPoolConfig:
+    """Return the pool settings read from the environment on first use."""
+    global _config
+    if _config is None:
+        with _lock:
+            if _config is None:
+                _config = HttpPoolConfig.from_env()
+    return _config
+
+
+def _trace_request(request: httpx.Request) -> None:
+    def trace(event: str, info: dict) -> None:
+        CONNECTION_STATS.record("sync", event)
+
+    request.extensions["trace"] = trace
+
+
+async def _atrace_request(request: httpx.Request) -> None:
+    async def trace(event: str, info: dict) -> None:
+        CONNECTION_STATS.record("async", event)
+
+    request.extensions["trace"] = trace
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled sync client."""
+    global _client
+    if _client is None:
+        config = get_pool_config()
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    limits=config.limits(),
+                    timeout=config.timeouts(),
+                    http2=config.http2,
+                    event_hooks={"request": [_trace_request]},
+                )
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled async client."""
+    global _async_client
+    if _async_client is None:
+        config = get_pool_config()
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    limits=config.limits(),
+                    timeout=config.timeouts(),
+                    http2=config.http2,
+                    event_hooks={"request": [_atrace_request]},
+                )
+    return _async_client
+
+
+async def close_http_clients() -> None:
+    """Close both clients and their pooled connections."""
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = _async_client = None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
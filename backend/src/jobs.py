@@ -0,0 +1,321 @@
+"""Background analysis jobs with a bounded worker pool.
+
+Submitting a job returns immediately with its ID; a fixed number of asyncio
+workers take queued jobs and run the analysis pipeline. Job state lives in
+SQLite, so jobs that were queued or running when the process stopped are
+queued again on the next start. A submission for a patient whose current
+record already has a queued or running job (same intake mode) is attached
+to that job instead of starting a new one.
+
+Configured with ``JOB_DB_PATH`` (default ``jobs.sqlite3``) and
+``JOB_WORKERS`` (default 4). Finished jobs are deleted ``JOB_TTL_HOURS``
+(default 168; 0 keeps them) after they finish, by ``JobStore.prune``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    record_version TEXT,
+    intake_mode TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_patient ON jobs(patient_id, record_version, intake_mode, status);
+"""
+
+_COLUMNS = (
+    "id, patient_id, record_version, intake_mode, status,"
+    " created_at, started_at, finished_at, error, result"
+)
+
+
+@dataclass
+class Job:
+    """One analysis job.
+
+    Attributes:
+        id: Job ID returned to the client.
+        patient_id: Patient being analyzed.
+        record_version: Version of the patient record at submission time.
+        intake_mode: "llm" or "template" (see ``initial_state``).
+        status: queued, running, complete or failed.
+        created_at, started_at, finished_at: Unix timestamps.
+        error: Failure message, if the job failed.
+        result: The analysis response, once complete.
+    """
+
+    id: str
+    patient_id: str
+    record_version: str | None
+    intake_mode: str
+    status: str
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    result: dict | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETE, FAILED)
+
+    def summary(self) -> dict:
+        """Job metadata without the (potentially large) result."""
+        data = asdict(self)
+        del data["result"]
+        return data
+
+
+def _row_to_job(row: tuple) -> Job:
+    *fields, result = row
+    return Job(*fields, result=json.loads(result) if result else None)
+
+
+class JobStore:
+    """Job rows in SQLite, safe to share between threads."""
+
+    def __init__(self, path: str = "jobs.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def create_or_get_active(
+        self, patient_id: str, record_version: str | None, intake_mode: str
+    ) -> tuple[Job, bool]:
+        """Create a queued job, or return the active one for the same input.
+
+        Returns ``(job, created)``.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE patient_id = ? AND record_version IS ?"
+                " AND intake_mode = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (patient_id, record_version, intake_mode, *ACTIVE_STATUSES),
+            ).fetchone()
+            if row is not None:
+                return _row_to_job(row), False
+
+            job = Job(
+                id=uuid.uuid4().hex,
+                patient_id=patient_id,
+                record_version=record_version,
+                intake_mode=intake_mode,
+                status=QUEUED,
+                created_at=time.time(),
+            )
+            self._conn.execute(
+                "INSERT INTO jobs (id, patient_id, record_version, intake_mode, status, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, patient_id, record_version, intake_mode, QUEUED, job.created_at),
+            )
+            return job, True
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def mark_running(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                (RUNNING, time.time(), job_id),
+            )
+
+    def mark_complete(self, job_id: str, result: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE id = ?",
+                (COMPLETE, time.time(), json.dumps(result), job_id),
+            )
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                (FAILED, time.time(), error, job_id),
+            )
+
+    def requeue_interrupted(self) -> list[str]:
+        """Reset jobs left running by a previous process and return every
+        queued job ID, oldest first."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (QUEUED, RUNNING),
+            )
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+                )
+            ]
+
+    def prune(self, max_age: float) -> int:
+        """Delete jobs that finished more than ``max_age`` seconds ago; returns the count."""
+        if max_age <= 0:
+            return 0
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (COMPLETE, FAILED, time.time() - max_age),
+            ).rowcount
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in (QUEUED, RUNNING, COMPLETE, FAILED)} | dict(rows)
+
+
+JobRunner = Callable[[Job, Callable[[dict], None]], Awaitable[dict]]
+
+
+class JobQueue:
+    """Runs stored jobs on ``concurrency`` asyncio workers.
+
+    ``runner(job, publish)`` performs the analysis and returns its result
+    dict; it may call ``publish(event)`` to forward progress events to
+    subscribers.
+    """
+
+    def __init__(self, store: JobStore, runner: JobRunner, concurrency: int = 4):
+        self.store = store
+        self.runner = runner
+        self.concurrency = concurrency
+        self.coalesced = 0
+        self._queue: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    async def start(self) -> int:
+        """Start the workers and re-queue unfinished jobs.
+
+        Returns the number of jobs recovered from the store.
+        """
+        self._queue = asyncio.Queue()
+        recovered = self.store.requeue_interrupted()
+        for job_id in recovered:
+            self._queue.put_nowait(job_id)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        return len(recovered)
+
+    async def stop(self) -> None:
+        """Cancel the workers. Jobs still running are re-queued on the next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, patient_id: str, record_version: str | None, intake_mode: str = "llm") -> tuple[Job, bool]:
+        """Queue an analysis, or join the active job for the same record.
+
+        Returns ``(job, coalesced)``.
+        """
+        job, created = self.store.create_or_get_active(patient_id, record_version, intake_mode)
+        if created:
+            self._queue.put_nowait(job.id)
+        else:
+            self.coalesced += 1
+        return job, not created
+
+    def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[dict]:
+        """Yield the job's current status, then its events until it finishes.
+
+        The last event is ``complete`` (with the result) or ``error``.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(events)
+        try:
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            if job.done:
+                yield self._final_event(job)
+                return
+            yield {"type": "status", "job_id": job_id, "status": job.status}
+            while True:
+                event = await events.get()
+                yield event
+                if event["type"] in ("complete", "error"):
+                    return
+        finally:
+            listeners = self._subscribers.get(job_id, [])
+            if events in listeners:
+                listeners.remove(events)
+            if not listeners:
+                self._subscribers.pop(job_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.concurrency,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "coalesced": self.coalesced,
+            "jobs": self.store.counts(),
+        }
+
+    def _publish(self, job_id: str, event: dict) -> None:
+        for listener in self._subscribers.get(job_id, []):
+            listener.put_nowait(event)
+
+    @staticmethod
+    def _final_event(job: Job) -> dict:
+        if job.status == COMPLETE:
+            return {"type": "complete", "job_id": job.id, "result": job.result}
+        return {"type": "error", "job_id": job.id, "detail": job.error}
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or job.done:
+            return
+
+        self.store.mark_running(job_id)
+        self._publish(job_id, {"type": "status", "job_id": job_id, "status": RUNNING})
+        try:
+            result = await self.runner(job, lambda event: self._publish(job_id, event))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job {job_id} failed: {str(e)}")
+            self.store.mark_failed(job_id, str(e))
+        else:
+            self.store.mark_complete(job_id, result)
+        self._publish(job_id, self._final_event(self.store.get(job_id)))
@@ -0,0 +1,286 @@
+"""Content-addressed cache for LLM responses.
+
+Every agent call is keyed by a hash of the model identity (type, name,
+temperature, ...), the bound tool schemas and the full message list, so an
+identical prompt returns the stored response without a model round trip.
+Entries can be tagged with the patient they were computed for; if that
+patient's record changes, the tagged entries stop matching.
+
+Backends are selected with ``LLM_CACHE``:
+    memory  in-process LRU (default)
+    sqlite  on-disk store at ``LLM_CACHE_PATH``, shared across processes
+    off     no caching
+``LLM_CACHE_TTL`` (seconds, default 3600; 0 disables caching like ``off``)
+and ``LLM_CACHE_MAX_ENTRIES`` (memory backend, default 1024) tune retention.
+
+Lookups and stores run in a worker thread, since the record version and
+the sqlite backend are both SQLite reads on the request path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.runnables import Runnable, RunnableBinding
+
+from src.data.patient_database import get_patient_version
+from src.resilience import call_llm
+
+
+class CacheStats:
+    """Hit/miss counters shared by every backend."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class LLMCache:
+    """Base class for cache backends.
+
+    ``get`` returns the stored value for ``key`` if it exists, is younger
+    than the TTL, and was stored under the same patient ``version``.
+    """
+
+    def __init__(self, ttl: float | None = 3600):
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def get(self, key: str, version: str | None = None) -> dict | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict, patient_id: str | None = None, version: str | None = None) -> None:
+        raise NotImplementedError
+
+    def invalidate_patient(self, patient_id: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+
+class InMemoryLLMCache(LLMCache):
+    """Thread-safe LRU cache held in the current process."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = 3600):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str | None, str | None, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: str | None = None) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            created_at, _, entry_version, value = entry
+            if self._expired(created_at) or entry_version != version:
+                del self._entries[key]
+                self.stats.misses += 1
+                self.stats.invalidations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: dict, patient_id: str | None = None, version: str | None = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), patient_id, version, value)
+            self._entries.move_to_end(key)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate_patient(self, patient_id: str) -> int:
+        with self._lock:
+            keys = [k for k, entry in self._entries.items() if entry[1] == patient_id]
+            for key in keys:
+                del self._entries[key]
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteLLMCache(LLMCache):
+    """Cache persisted in a SQLite file, usable across workers and restarts."""
+
+    def __init__(self, path: str, ttl: float | None = 3600):
+        super().__init__(ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " patient_id TEXT,"
+            " record_version TEXT,"
+            " created_at REAL NOT NULL,"
+            " value TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_patient ON llm_cache(patient_id)")
+
+    def get(self, key: str, version: str | None = None) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, record_version, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            created_at, entry_version, value = row
+            if self._expired(created_at) or entry_version != version:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.stats.misses += 1
+                self.stats.invalidations += 1
+                return None
+            self.stats.hits += 1
+            return json.loads(value)
+
+    def set(self, key: str, value: dict, patient_id: str | None = None, version: str | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                (key, patient_id, version, time.time(), json.dumps(value)),
+            )
+            self.stats.stores += 1
+
+    def invalidate_patient(self, patient_id: str) -> int:
+        with self._lock:
+            count = self._conn.execute(
+                "DELETE FROM llm_cache WHERE patient_id = ?", (patient_id,)
+            ).rowcount
+            self.stats.invalidations += count
+            return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+_cache: LLMCache | None = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def _create_cache_from_env() -> LLMCache | None:
+    backend = os.getenv("LLM_CACHE", "memory").lower()
+    ttl = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    if backend == "off" or ttl <= 0:
+        return None
+    if backend == "sqlite":
+        return SQLiteLLMCache(os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"), ttl=ttl)
+    if backend == "memory":
+        return InMemoryLLMCache(int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")), ttl=ttl)
+    raise ValueError(f"Unknown LLM_CACHE backend '{backend}' (expected memory, sqlite or off)")
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Return the process-wide cache configured from the environment."""
+    global _cache, _cache_configured
+    if not _cache_configured:
+        with _cache_lock:
+            if not _cache_configured:
+                _cache = _create_cache_from_env()
+                _cache_configured = True
+    return _cache
+
+
+def set_llm_cache(cache: LLMCache | None) -> None:
+    """Install ``cache`` as the process-wide cache (``None`` disables it)."""
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def cache_key(llm: Runnable, messages: Sequence[BaseMessage]) -> str:
+    """Hash model identity, bound tool schemas and the message list."""
+    model, bound_kwargs = llm, {}
+    if isinstance(llm, RunnableBinding):
+        model, bound_kwargs = llm.bound, llm.kwargs
+
+    payload = {
+        "model_type": getattr(model, "_llm_type", type(model).__name__),
+        "model": getattr(model, "_identifying_params", {}),
+        "bound": bound_kwargs,
+        "messages": [message_to_dict(m) for m in messages],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def cached_ainvoke(
+    llm: Runnable,
+    messages: Sequence[BaseMessage],
+    patient_id: str | None = None,
+) -> BaseMessage:
+    """``llm.ainvoke(messages)`` through the process-wide cache.
+
+    Cache misses are sent under the retry policy and circuit breaker in
+    resilience.py.
+
+    When ``patient_id`` is given, the entry is tied to the current version of
+    that patient's record and is ignored once the record changes.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return await call_llm(lambda: llm.ainvoke(messages))
+
+    key = cache_key(llm, messages)
+
+    def lookup() -> tuple[str | None, dict | None]:
+        version = get_patient_version(patient_id) if patient_id else None
+        return version, cache.get(key, version)
+
+    version, stored = await asyncio.to_thread(lookup)
+    if stored is not None:
+        return messages_from_dict([stored])[0]
+
+    response = await call_llm(lambda: llm.ainvoke(messages))
+    if isinstance(response, AIMessage):
+        await asyncio.to_thread(
+            cache.set, key, message_to_dict(response), patient_id if version else None, version
+        )
+    return response
@@ -4,13 +4,22 @@ Usage:
     python -m src.main "P-1001"
     python -m src.main "Patient Maria Garcia, complaining of increased thirst and frequent urination"
     python -m src.main  # interactive mode
+    python -m src.main --batch ids.txt --concurrency 8 > results.jsonl
+    python -m src.main --condition hypertension > results.jsonl
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import json
 import sys
 
-from src.graph import build_medical_graph
+from src.batch import RESULT_KEYS, BatchStats, cohort_patient_ids, run_batch
+from src.data.patient_database import get_patient
+from src.graph import initial_state
+from src.registry import get_resumable_graph
+from src.resilience import ainvoke_resumable
 
 
 def format_output(result: dict) -> str:
@@ -53,17 +62,83 @@ def format_output(result: dict) -> str:
     return "\n".join(sections)
 
 
-def run(patient_input: str) -> dict:
-    """Run the full medical pipeline and return raw results."""
-    graph = build_medical_graph()
-    result = graph.invoke({"patient_input": patient_input, "messages": []})
+async def arun(patient_input: str) -> dict:
+    """Run the full medical pipeline asynchronously and return raw results.
+
+    When the input is a known patient ID the record is passed straight to
+    the graph, skipping the intake agent's record-fetching tool loop.
+    """
+    graph = get_resumable_graph()
+    patient = get_patient(patient_input.strip())
+    result = await ainvoke_resumable(graph, initial_state(patient_input, patient_record=patient))
     return result
 
 
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run(patient_input: str) -> dict:
+    """Run the full medical pipeline and return raw results.
+
+    Calls share one event loop, so the checkpointer's database connection
+    is opened once rather than on every call.
+    """
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(arun(patient_input))
+
+
+def read_patient_ids(path: str) -> list[str]:
+    """Read one patient ID per line from ``path`` ("-" for stdin)."""
+    source = sys.stdin if path == "-" else open(path)
+    with source:
+        return [line.strip() for line in source if line.strip() and not line.startswith("#")]
+
+
+def format_batch_summary(summary: dict) -> str:
+    """Format ``BatchStats.summary()`` for display."""
+    lines = [
+        f"Batch: {summary['completed']} completed, {summary['failed']} failed "
+        f"in {summary['elapsed_s']:.1f}s ({summary['analyses_per_min']:.1f} analyses/min)",
+        f"  {'stage':<18} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}",
+    ]
+    for stage, pct in summary["stage_latency_ms"].items():
+        lines.append(
+            f"  {stage:<18} {pct['p50']:>7.0f}ms {pct['p95']:>7.0f}ms "
+            f"{pct['p99']:>7.0f}ms {pct['max']:>7.0f}ms"
+        )
+    return "\n".join(lines)
+
+
+async def arun_batch(patient_ids, concurrency: int) -> dict:
+    """Analyze many patients, writing one JSON line per patient to stdout
+    as each finishes. Returns the batch summary."""
+    stats = BatchStats()
+    async for outcome in run_batch(patient_ids, concurrency=concurrency, stats=stats):
+        state = outcome.pop("state", {})
+        outcome.update({key: state.get(key) for key in RESULT_KEYS if key in state})
+        print(json.dumps(outcome, default=str), flush=True)
+    return stats.summary()
+
+
 def main() -> None:
     """CLI entry point."""
-    if len(sys.argv) > 1:
-        patient_input = " ".join(sys.argv[1:])
+    parser = argparse.ArgumentParser(description="Medical Multi-Agent System")
+    parser.add_argument("patient_input", nargs="*", help="Patient ID or free-text case description")
+    parser.add_argument("--batch", metavar="FILE", help="Analyze the patient IDs listed in FILE ('-' for stdin)")
+    parser.add_argument("--condition", help="Analyze every patient with this condition")
+    parser.add_argument("--concurrency", type=int, default=4, help="Pipelines run at once in batch mode")
+    args = parser.parse_args()
+
+    if args.batch or args.condition:
+        patient_ids = read_patient_ids(args.batch) if args.batch else cohort_patient_ids(args.condition)
+        summary = asyncio.run(arun_batch(patient_ids, args.concurrency))
+        print(format_batch_summary(summary), file=sys.stderr)
+        return
+
+    if args.patient_input:
+        patient_input = " ".join(args.patient_input)
     else:
         print("Medical Multi-Agent System")
         print("-" * 40)
@@ -76,7 +151,7 @@ def main() -> None:
             sys.exit(1)
 
     print(f"\nProcessing: {patient_input}")
-    print("Running agents: Intake → Diagnosis → Care Plan ...\n")
+    print("Running agents: Intake → Medication Safety → Diagnosis → Care Plan ...\n")
 
     result = run(patient_input)
     print(format_output(result))
@@ -0,0 +1,176 @@
+"""Process-wide registry for the compiled graph and tool-bound LLMs.
+
+Compiling the LangGraph ``StateGraph``, constructing the chat model and
+binding tool schemas onto it are pure setup work whose result never changes
+for the lifetime of a process. The registry builds each of them once, on
+first use or via ``warm_up()``, and hands the same objects to every API
+request and CLI run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+
+from src.config import get_llm
+
+_lock = threading.RLock()
+_llm: BaseChatModel | None = None
+_bound_llms: dict[tuple[str, ...], Runnable] = {}
+_graph = None
+_resumable_graph = None
+_resumable_loop: asyncio.AbstractEventLoop | None = None
+_closing: set[asyncio.Task] = set()
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _discard(graph) -> None:
+    """Close the checkpointer of a resumable graph that is being replaced.
+
+    Inside a running loop the close is scheduled on it; otherwise it runs to
+    completion here. (aiosqlite connections can be closed from any loop.)
+    """
+    if graph is None:
+        return
+    from src.checkpoints import close_checkpointer
+
+    loop = _running_loop()
+    if loop is None:
+        asyncio.run(close_checkpointer(graph.checkpointer))
+        return
+    task = loop.create_task(close_checkpointer(graph.checkpointer))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_shared_llm() -> BaseChatModel:
+    """Return the process-wide chat model, creating it on first use."""
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                _llm = get_llm()
+    return _llm
+
+
+def get_bound_llm(tools: Sequence[BaseTool]) -> Runnable:
+    """Return the shared chat model with ``tools`` bound, binding only once."""
+    key = tuple(t.name for t in tools)
+    bound = _bound_llms.get(key)
+    if bound is None:
+        with _lock:
+            bound = _bound_llms.get(key)
+            if bound is None:
+                bound = get_shared_llm().bind_tools(list(tools))
+                _bound_llms[key] = bound
+    return bound
+
+
+def get_graph():
+    """Return the compiled medical graph, compiling it on first use."""
+    global _graph
+    if _graph is None:
+        with _lock:
+            if _graph is None:
+                from src.graph import build_medical_graph
+
+                _graph = build_medical_graph()
+    return _graph
+
+
+def get_resumable_graph():
+    """Return the medical graph compiled with the configured checkpointer.
+
+    Runs need a ``configurable.thread_id`` (the analysis ID); use it through
+    ``resilience.ainvoke_resumable`` / ``astream_resumable``. The SQLite
+    checkpointer belongs to the event loop it was created on, so a caller on
+    another loop (e.g. a second ``asyncio.run``) gets a graph of its own.
+    """
+    global _resumable_graph, _resumable_loop
+    loop = _running_loop()
+    if _resumable_graph is None or _resumable_loop is not loop:
+        with _lock:
+            if _resumable_graph is None or _resumable_loop is not loop:
+                from src.checkpoints import create_checkpointer
+                from src.graph import build_medical_graph
+
+                _discard(_resumable_graph)
+                _resumable_graph = build_medical_graph(checkpointer=create_checkpointer())
+                _resumable_loop = loop
+    return _resumable_graph
+
+
+def warm_up() -> dict[str, float]:
+    """Eagerly build the LLM, tool bindings, graph, tokenizer and literature indexes.
+
+    Returns the time spent on each step in milliseconds.
+    """
+    from src.agents import diagnosis, intake
+    from src.context_budget import count_tokens
+    from src.data import medical_articles
+
+    timings = {}
+
+    start = time.perf_counter()
+    get_shared_llm()
+    timings["llm"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    get_bound_llm(intake.TOOLS)
+    get_bound_llm(diagnosis.TOOLS)
+    timings["bind_tools"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    get_graph()
+    if _running_loop() is not None:
+        get_resumable_graph()  # its checkpointer must be created on the serving loop
+    timings["graph"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    count_tokens("")  # loading the encoding may hit the network
+    timings["tokenizer"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    medical_articles.build_indexes()
+    timings["literature_index"] = (time.perf_counter() - start) * 1000
+
+    return timings
+
+
+async def aclose() -> None:
+    """Release the resumable graph's checkpoint storage and the article store (on shutdown)."""
+    global _resumable_graph, _resumable_loop
+    from src.data import medical_articles
+
+    with _lock:
+        graph, _resumable_graph = _resumable_graph, None
+        _resumable_loop = None
+    medical_articles.close()
+    if graph is not None:
+        from src.checkpoints import close_checkpointer
+
+        await close_checkpointer(graph.checkpointer)
+
+
+def reset() -> None:
+    """Drop every cached object so the next access rebuilds it."""
+    global _llm, _graph, _resumable_graph, _resumable_loop
+    with _lock:
+        _discard(_resumable_graph)
+        _llm = None
+        _graph = None
+        _resumable_graph = None
+        _resumable_loop = None
+        _bound_llms.clear()
@@ -0,0 +1,332 @@
+"""Timeouts, retries and a circuit breaker for model and tool calls, and
+node-level resume for whole analyses.
+
+Every model call made through ``cached_ainvoke`` goes through
+``call_llm``: each attempt is bounded by ``LLM_CALL_TIMEOUT``, transient
+failures (timeouts, connection errors, HTTP 408/429/5xx) are retried
+with exponential backoff and full jitter, and the process-wide breaker
+from ``get_llm_breaker()`` opens after ``LLM_BREAKER_FAILURES`` consecutive failed
+attempts. While it is open, calls fail immediately with
+``CircuitOpenError`` instead of waiting on a backend that is down; after
+``LLM_BREAKER_RESET`` seconds one trial call is let through to probe it.
+Tool calls get the same timeout/retry treatment via ``call_tool`` (no
+breaker, since tools are local).
+
+``ainvoke_resumable`` and ``astream_resumable`` run the graph with a
+checkpointer and a thread ID. If a node still fails with a transient
+error, the run is resumed from the last completed node (up to
+``ANALYSIS_RESUME_ATTEMPTS`` times) rather than starting over with intake.
+
+Configured with:
+    LLM_CALL_TIMEOUT          seconds per model call attempt (default 120)
+    LLM_MAX_RETRIES           retries after the first attempt (default 2)
+    LLM_RETRY_BASE_DELAY      backoff base in seconds (default 0.5)
+    LLM_RETRY_MAX_DELAY       backoff cap in seconds (default 8)
+    LLM_BREAKER_FAILURES      consecutive failures that open the breaker (default 5)
+    LLM_BREAKER_RESET         seconds before a trial call (default 30)
+    TOOL_CALL_TIMEOUT         seconds per tool call attempt (default 30)
+    TOOL_MAX_RETRIES          retries after the first attempt (default 1)
+    ANALYSIS_RESUME_ATTEMPTS  node-level resumes per analysis (default 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from src.checkpoints import claim_analysis, is_persistent
+from src.streaming import stream_analysis
+from src.telemetry import METRICS
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 429}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_after:.1f}s)")
+        self.retry_after = retry_after
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` looks transient: worth retrying the same call."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    # openai.APIConnectionError / APITimeoutError and httpx.TransportError,
+    # matched by name so neither package has to be imported here.
+    return any(
+        cls.__name__ in ("APIConnectionError", "TransportError")
+        for cls in type(error).__mro__
+    )
+
+
+def describe(error: BaseException) -> str:
+    """Error message, falling back to the type name (timeouts have no message)."""
+    return str(error) or type(error).__name__
+
+
+@dataclass
+class RetryPolicy:
+    timeout: float | None = 120.0
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @classmethod
+    def from_env(cls, prefix: str, timeout: float, max_retries: int) -> "RetryPolicy":
+        return cls(
+            timeout=float(os.getenv(f"{prefix}_CALL_TIMEOUT", str(timeout))) or None,
+            max_retries=int(os.getenv(f"{prefix}_MAX_RETRIES", str(max_retries))),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (1-based): full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed → open → half-open)."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30")),
+        )
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            METRICS.inc(
+                "circuit_breaker_transitions_total",
+                help="Circuit breaker state changes",
+                breaker=self.name, state=state,
+            )
+            print(f"Circuit breaker '{self.name}' is now {state}")
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` unless a call may proceed now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+        METRICS.inc("circuit_breaker_rejections_total",
+                    help="Calls rejected by an open circuit breaker", breaker=self.name)
+        raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_running = False
+            self._set_state(CLOSED)
+
+    def release_trial(self) -> None:
+        """Let another caller probe a half-open breaker (the trial was cancelled)."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures}
+
+
+_breaker: CircuitBreaker | None = None
+_policies: dict[str, RetryPolicy] = {}
+
+
+def get_llm_breaker() -> CircuitBreaker:
+    """The process-wide circuit breaker guarding the model backend."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker.from_env("llm")
+    return _breaker
+
+
+def get_policy(kind: str) -> RetryPolicy:
+    """Retry policy for ``kind`` ("llm" or "tool"), read from the environment once."""
+    policy = _policies.get(kind)
+    if policy is None:
+        if kind == "llm":
+            policy = RetryPolicy.from_env("LLM", timeout=120.0, max_retries=2)
+        else:
+            policy = RetryPolicy.from_env("TOOL", timeout=30.0, max_retries=1)
+        _policies[kind] = policy
+    return policy
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    kind: str,
+    breaker: CircuitBreaker | None = None,
+) -> T:
+    """Await ``call()`` with ``policy``'s timeout and retries, gated by ``breaker``."""
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            if policy.timeout:
+                result = await asyncio.wait_for(call(), policy.timeout)
+            else:
+                result = await call()
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        except Exception as e:
+            retryable = is_retryable(e)
+            if isinstance(e, asyncio.TimeoutError):
+                METRICS.inc("call_timeouts_total", help="Model and tool call attempts that timed out", kind=kind)
+            if breaker is not None:
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    # The backend answered; a bad request is not an outage.
+                    breaker.record_success()
+            if not retryable or attempt >= policy.max_retries:
+                raise
+            attempt += 1
+            METRICS.inc("call_retries_total", help="Model and tool call retries", kind=kind)
+            await asyncio.sleep(policy.backoff(attempt))
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+async def call_llm(call: Callable[[], Awaitable[T]]) -> T:
+    """Run one model call under the LLM retry policy and circuit breaker."""
+    return await call_with_retry(call, get_policy("llm"), "llm", get_llm_breaker())
+
+
+async def call_tool(call: Callable[[], Awaitable[T]]) -> T:
+    """Run one tool call under the tool retry policy."""
+    return await call_with_retry(call, get_policy("tool"), "tool")
+
+
+# ── node-level resume ──
+
+def _resume_attempts() -> int:
+    return int(os.getenv("ANALYSIS_RESUME_ATTEMPTS", "1"))
+
+
+def with_thread_id(config: dict | None) -> dict:
+    """Copy of ``config`` with a ``configurable.thread_id``, generating one if absent."""
+    config = dict(config or {})
+    configurable = dict(config.get("configurable") or {})
+    configurable.setdefault("thread_id", uuid.uuid4().hex)
+    config["configurable"] = configurable
+    return config
+
+
+async def _resume_point(graph, config: dict, error: Exception, attempt: int) -> list[str]:
+    """Return the nodes a retry after ``error`` will re-run.
+
+    Re-raises ``error`` when it is not transient or no attempts are left.
+    An empty list means nothing was checkpointed and the run starts over.
+    """
+    if attempt >= _resume_attempts() or not is_retryable(error):
+        raise error
+    snapshot = await graph.aget_state(config)
+    nodes = list(snapshot.next)
+    for node in nodes:
+        METRICS.inc("analysis_resumes_total", help="Analyses resumed from a checkpoint", node=node)
+    print(f"Resuming analysis at {', '.join(nodes) or 'start'} after: {describe(error)[:120]}")
+    await asyncio.sleep(get_policy("llm").backoff(attempt + 1))
+    return nodes
+
+
+async def _forget(graph, config: dict) -> None:
+    # Persistent checkpoints are kept for later resume/re-run (checkpoints.py).
+    if not is_persistent(graph.checkpointer):
+        await graph.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+
+async def ainvoke_resumable(graph, inputs: dict | None, config: dict | None = None) -> dict:
+    """``graph.ainvoke`` that resumes from the last completed node on transient failure.
+
+    ``graph`` must be compiled with a checkpointer (``registry.get_resumable_graph``).
+    ``inputs=None`` continues the thread in ``config`` from its last checkpoint.
+    Raises ``AnalysisRunningError`` if the thread is already running.
+    """
+    config = with_thread_id(config)
+    graph_input = inputs
+    with claim_analysis(config["configurable"]["thread_id"]):
+        try:
+            for attempt in range(_resume_attempts() + 1):
+                try:
+                    return await graph.ainvoke(graph_input, config=config)
+                except Exception as e:
+                    nodes = await _resume_point(graph, config, e, attempt)
+                    graph_input = None if nodes else inputs
+        finally:
+            await _forget(graph, config)
+
+
+async def astream_resumable(graph, inputs: dict | None, config: dict | None = None) -> AsyncIterator[dict]:
+    """``stream_analysis`` that resumes from the last completed node on transient failure.
+
+    Yields the same events, plus ``{"type": "resume", "attempt", "nodes", "error"}``
+    before each resumed run. Raises ``AnalysisRunningError`` if the thread
+    is already running.
+    """
+    config = with_thread_id(config)
+    graph_input = inputs
+    with claim_analysis(config["configurable"]["thread_id"]):
+        try:
+            for attempt in range(_resume_attempts() + 1):
+                try:
+                    async for event in stream_analysis(graph, graph_input, config=config):
+                        yield event
+                    return
+                except Exception as e:
+                    nodes = await _resume_point(graph, config, e, attempt)
+                    graph_input = None if nodes else inputs
+                    yield {"type": "resume", "attempt": attempt + 1, "nodes": nodes, "error": describe(e)}
+        finally:
+            await _forget(graph, config)
@@ -0,0 +1,196 @@
+"""Deterministic, offline stand-in for the chat model.
+
+``ScriptedChatModel`` replays a fixed script of tool calls and answers for
+each agent, after a configurable delay, so the full pipeline can run with
+no network or API key: for load tests, benchmarks, and measuring the
+orchestrator's own overhead separately from model latency.
+
+The agent is recognised from the system prompt, and the step within its
+script is the number of model turns already in the conversation. Tool-call
+steps are skipped when the model is called without tools (e.g. the intake
+fast path), so every agent always ends with its final answer. The same
+input always produces the same output and the same delay.
+
+When the caller streams (``astream``, or ``astream_events`` as used by
+``/api/analyze/stream``), the answer is emitted word by word with the
+delay spread across the chunks, so token streaming can be exercised
+without a live model.
+
+Selected with ``LLM_BACKEND=scripted`` (see config.py) and tuned with:
+    SCRIPTED_LLM_LATENCY  mean seconds per call (default 0)
+    SCRIPTED_LLM_JITTER   +/- fraction of the latency (default 0)
+    SCRIPTED_LLM_SCRIPT   path to a JSON file replacing ``DEFAULT_SCRIPT``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_PATIENT_ID_RE = re.compile(r"\bP-\d+\b")
+_STREAM_CHUNK_RE = re.compile(r"\s*\S+\s*")
+
+# Agent -> list of steps. A step is {"tool_calls": [{"name", "args"}]} or
+# {"content": "..."}. "{patient_id}" in strings is filled from the conversation.
+DEFAULT_SCRIPT: dict[str, list[dict]] = {
+    "intake": [
+        {"tool_calls": [{"name": "get_patient_record", "args": {"patient_id": "{patient_id}"}}]},
+        {"content": "INTAKE SUMMARY ({patient_id})\nScripted structured summary of demographics, "
+                    "conditions, medications, allergies, labs and recent visits."},
+    ],
+    "diagnosis": [
+        {"tool_calls": [
+            {"name": "search_medical_literature", "args": {"query": "hypertension management"}},
+            {"name": "search_medical_literature", "args": {"query": "diabetes metformin"}},
+        ]},
+        {"content": "DIAGNOSTIC ASSESSMENT ({patient_id})\n1. Scripted problem list with "
+                    "supporting evidence, literature findings and medication concerns."},
+    ],
+    "care_plan": [
+        {"content": "CARE PLAN ({patient_id})\n- Medication adjustments\n- Monitoring\n"
+                    "- Lifestyle\n- Referrals\n- Follow-up in 4 weeks"},
+    ],
+    "default": [
+        {"content": "Scripted response."},
+    ],
+}
+
+# System prompt marker -> script key.
+AGENT_MARKERS = {
+    "Medical Intake Agent": "intake",
+    "Medical Diagnosis Reasoning Agent": "diagnosis",
+    "Medical Care Plan Agent": "care_plan",
+}
+
+
+def _fill(value: Any, patient_id: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{patient_id}", patient_id)
+    if isinstance(value, list):
+        return [_fill(v, patient_id) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, patient_id) for k, v in value.items()}
+    return value
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replays ``script`` with ``latency`` seconds per call."""
+
+    script: dict[str, list[dict]] = DEFAULT_SCRIPT
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ScriptedChatModel":
+        script = DEFAULT_SCRIPT
+        path = os.getenv("SCRIPTED_LLM_SCRIPT")
+        if path:
+            with open(path) as f:
+                script = {**DEFAULT_SCRIPT, **json.load(f)}
+        return cls(
+            script=script,
+            latency=float(os.getenv("SCRIPTED_LLM_LATENCY", "0")),
+            jitter=float(os.getenv("SCRIPTED_LLM_JITTER", "0")),
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"latency": self.latency, "jitter": self.jitter, "script": self.script}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _agent(self, messages: list[BaseMessage]) -> str:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        for marker, agent in AGENT_MARKERS.items():
+            if marker in system:
+                return agent
+        return "default"
+
+    def _seed(self, messages: list[BaseMessage]) -> int:
+        text = "\n".join(str(m.content) for m in messages)
+        return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+    def _delay(self, messages: list[BaseMessage]) -> float:
+        if not self.latency:
+            return 0.0
+        spread = random.Random(self._seed(messages)).uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency * (1 + spread))
+
+    def _reply(self, messages: list[BaseMessage], tools: list | None) -> AIMessage:
+        agent = self._agent(messages)
+        steps = self.script.get(agent) or self.script["default"]
+        if not tools:
+            steps = [s for s in steps if "tool_calls" not in s] or [{"content": ""}]
+        turn = sum(isinstance(m, AIMessage) for m in messages)
+        step = steps[min(turn, len(steps) - 1)]
+
+        found = _PATIENT_ID_RE.search("\n".join(str(m.content) for m in messages))
+        step = _fill(copy.deepcopy(step), found.group(0) if found else "unknown")
+        prompt_tokens = sum(_estimate_tokens(str(m.content)) for m in messages)
+
+        tool_calls = [
+            {"name": call["name"], "args": call["args"], "id": f"call_{agent}_{turn}_{i}"}
+            for i, call in enumerate(step.get("tool_calls", []))
+        ]
+        content = step.get("content", "")
+        completion_tokens = _estimate_tokens(content) + sum(
+            _estimate_tokens(json.dumps(c["args"])) for c in tool_calls
+        )
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self._delay(messages))
+        message = self._reply(messages, kwargs.get("tools"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self._delay(messages))
+        message = self._reply(messages, kwargs.get("tools"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._reply(messages, kwargs.get("tools"))
+        words = _STREAM_CHUNK_RE.findall(message.content) or [""]
+        pause = self._delay(messages) / len(words)
+        for word in words[:-1]:
+            await asyncio.sleep(pause)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+        # The last chunk carries the tool calls and usage, as provider streams do.
+        await asyncio.sleep(pause)
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content=words[-1],
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+        ))
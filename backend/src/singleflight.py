@@ -0,0 +1,67 @@
+"""Single-flight deduplication of concurrent identical calls.
+
+When several callers ask for the same thing at once (e.g. a care team
+opening the same chart on several screens, each firing ``/api/analyze``),
+only the first call runs; the others wait on its task and share its result
+or exception. The key is dropped as soon as the call finishes, so a
+request that arrives afterwards starts a fresh run. Nothing is cached.
+
+The shared call runs in its own task, shielded from the callers: one
+client disconnecting does not cancel the run the others are waiting on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from src.telemetry import METRICS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent ``do(key, fn)`` calls that share a ``key``."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.executed = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Await ``fn()``, or the call already in flight for ``key``.
+
+        Returns ``(result, coalesced)``; ``coalesced`` is true when this
+        caller joined another caller's run.
+        """
+        task = self._flights.get(key)
+        coalesced = task is not None
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        METRICS.inc(
+            "singleflight_calls_total",
+            help="Calls through a single-flight group, by whether they joined a run in flight",
+            group=self.name, outcome="coalesced" if coalesced else "executed",
+        )
+        return await asyncio.shield(task), coalesced
+
+    def _land(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    def stats(self) -> dict:
+        total = self.executed + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 3) if total else None,
+        }
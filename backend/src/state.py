@@ -11,20 +11,39 @@ class PatientState(TypedDict, total=False):
 
     Attributes:
         patient_input: Raw intake text from the patient or clinician.
+        patient_record: Structured record supplied by the caller; when set,
+            the Intake agent skips its tool loop.
+        intake_mode: "llm" (default) to summarize the record with one LLM
+            call, or "template" for a fully templated summary.
+        patient_id: ID of the patient record the Intake agent resolved, if any.
+        medications: The patient's medication list as written in the record.
         intake_summary: Structured summary produced by the Intake agent.
         patient_history: Retrieved patient history records.
         search_results: Results from medical database searches.
         drug_interactions: Drug interaction check results.
+        medication_info: Drug database entries for the current medications.
         diagnosis: Diagnostic reasoning produced by the Diagnosis agent.
+        context_usage: Prompt token counts and savings from the Diagnosis
+            agent's context budget (see context_budget.py).
         care_plan: Final care plan produced by the Care Plan agent.
+        clinician_notes: Free-text guidance from a clinician, added when a
+            stage is re-run (see checkpoints.py); read by the Diagnosis and
+            Care Plan agents.
         messages: Append-only message log for traceability.
     """
 
     patient_input: str
+    patient_record: dict
+    intake_mode: str
+    patient_id: str
+    medications: list[str]
     intake_summary: str
     patient_history: str
     search_results: str
     drug_interactions: str
+    medication_info: str
     diagnosis: str
+    context_usage: dict
     care_plan: str
+    clinician_notes: str
     messages: Annotated[list[str], operator.add]
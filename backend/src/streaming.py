@@ -0,0 +1,81 @@
+"""Translate LangGraph ``astream_events`` into compact progress events.
+
+The API exposes these as server-sent events so clients can render each
+agent's progress, tool calls and generated text while the pipeline runs,
+instead of waiting for the final result.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, AsyncIterator
+
+# Nodes whose model output is streamed to the client token by token.
+TOKEN_STREAM_NODES = {"diagnosis_agent", "care_plan_agent"}
+
+
+async def stream_analysis(graph, inputs: dict, config: dict | None = None) -> AsyncIterator[dict]:
+    """Run ``graph`` and yield progress events as plain dicts.
+
+    Event types:
+        node_start: ``{"node"}``
+        node_end:   ``{"node", "duration_ms", "output"}``
+        tool_start: ``{"node", "tool", "input"}``
+        tool_end:   ``{"node", "tool", "duration_ms"}``
+        token:      ``{"node", "text"}``
+        result:     ``{"state"}`` — the final PatientState, always last.
+    """
+    started: dict[str, float] = {}
+    node_names = set(graph.nodes) - {"__start__"}
+
+    async for event in graph.astream_events(inputs, config=config, version="v2"):
+        kind = event["event"]
+        name = event["name"]
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chain_start" and name in node_names and name == node:
+            started[event["run_id"]] = time.perf_counter()
+            yield {"type": "node_start", "node": name}
+
+        elif kind == "on_chain_end" and name in node_names and name == node:
+            duration = time.perf_counter() - started.pop(event["run_id"], time.perf_counter())
+            output = event["data"].get("output") or {}
+            yield {
+                "type": "node_end",
+                "node": name,
+                "duration_ms": round(duration * 1000, 2),
+                "output": {k: v for k, v in output.items() if k != "messages"},
+            }
+
+        elif kind == "on_tool_start":
+            started[event["run_id"]] = time.perf_counter()
+            yield {
+                "type": "tool_start",
+                "node": node,
+                "tool": name,
+                "input": event["data"].get("input"),
+            }
+
+        elif kind == "on_tool_end":
+            duration = time.perf_counter() - started.pop(event["run_id"], time.perf_counter())
+            yield {
+                "type": "tool_end",
+                "node": node,
+                "tool": name,
+                "duration_ms": round(duration * 1000, 2),
+            }
+
+        elif kind == "on_chat_model_stream" and node in TOKEN_STREAM_NODES:
+            text = event["data"]["chunk"].content
+            if text:
+                yield {"type": "token", "node": node, "text": text}
+
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            yield {"type": "result", "state": event["data"].get("output") or {}}
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    """Encode an event dict as one server-sent-events frame."""
+    payload = {k: v for k, v in event.items() if k != "type"}
+    return f"event: {event['type']}\ndata: {json.dumps(payload, default=str)}\n\n"
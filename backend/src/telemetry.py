@@ -0,0 +1,358 @@
+"""Timing spans for graph nodes, LLM calls and tool calls.
+
+A ``SpanCollector`` is passed to the graph as a LangChain callback
+(``config={"callbacks": [collector]}``) and records one span per node run,
+chat model call (with iteration number within the node and token counts)
+and tool call, without any changes to the agents themselves. When the run
+is over, ``finish()`` feeds the spans into the process-wide ``METRICS``
+(served at ``/metrics`` in the Prometheus text format) and, if
+``OTEL_EXPORTER_OTLP_ENDPOINT`` is set and the OpenTelemetry SDK is
+installed, exports them to that collector.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class Span:
+    """One timed operation within an analysis.
+
+    Attributes:
+        id: Run ID of the operation.
+        parent_id: Run ID of the enclosing span, if any.
+        kind: "graph", "node", "llm" or "tool".
+        name: Node, model or tool name.
+        node: Graph node the operation ran in.
+        start_ms: Start time relative to the beginning of the trace.
+        duration_ms: Wall-clock duration.
+        attributes: Extra details (iteration, token counts, error, ...).
+    """
+
+    id: str
+    parent_id: str | None
+    kind: str
+    name: str
+    node: str | None
+    start_ms: float
+    duration_ms: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default=0, repr=False)
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        del data["start_ns"]
+        return data
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _labels(labels: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """Minimal thread-safe counters and histograms in the Prometheus text format."""
+
+    def __init__(self, prefix: str = "medical_ai"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: dict[str, dict[tuple, Histogram]] = defaultdict(dict)
+        self._help: dict[str, tuple[str, str]] = {}
+
+    def inc(self, metric: str, value: float = 1.0, help: str = "", **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(metric, ("counter", help))
+            self._counters[metric][key] += value
+
+    def observe(self, metric: str, value: float, help: str = "", **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(metric, ("histogram", help))
+            histogram = self._histograms[metric].get(key)
+            if histogram is None:
+                histogram = self._histograms[metric][key] = Histogram()
+            histogram.observe(value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help) in sorted(self._help.items()):
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {help}")
+                lines.append(f"# TYPE {full} {kind}")
+                if kind == "counter":
+                    for labels, value in self._counters[name].items():
+                        lines.append(f"{full}{_labels(labels)} {value:g}")
+                    continue
+                for labels, h in self._histograms[name].items():
+                    bounds = [f"{bound:g}" for bound in h.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, [*h.counts, h.count]):
+                        le = f'le="{bound}"'
+                        lines.append(f"{full}_bucket{_labels(labels, le)} {count}")
+                    lines.append(f"{full}_sum{_labels(labels)} {h.sum:.6f}")
+                    lines.append(f"{full}_count{_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._help.clear()
+
+
+METRICS = Metrics()
+
+
+class SpanCollector(BaseCallbackHandler):
+    """Callback handler recording spans for one analysis run."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: list[Span] = []
+        self._open: dict[UUID, tuple[Span, float]] = {}
+        self._llm_calls: dict[UUID | None, int] = defaultdict(int)
+        self._origin = time.perf_counter()
+        self._finished = False
+
+    def _start(self, run_id: UUID, parent_run_id: UUID | None, kind: str, name: str, node: str | None, **attributes) -> None:
+        now = time.perf_counter()
+        span = Span(
+            id=str(run_id),
+            parent_id=str(parent_run_id) if parent_run_id else None,
+            kind=kind,
+            name=name,
+            node=node,
+            start_ms=round((now - self._origin) * 1000, 2),
+            attributes=attributes,
+            start_ns=time.time_ns(),
+        )
+        self._open[run_id] = (span, now)
+
+    def _end(self, run_id: UUID, **attributes) -> None:
+        entry = self._open.pop(run_id, None)
+        if entry is None:
+            return
+        span, started = entry
+        span.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        span.attributes.update({k: v for k, v in attributes.items() if v is not None})
+        self.spans.append(span)
+
+    # ── graph and nodes ──
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "")
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            self._start(run_id, None, "graph", name or "graph", None)
+        elif node and name == node and not name.startswith("__"):
+            self._start(run_id, parent_run_id, "node", name, node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+    # ── LLM calls ──
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._llm_calls[parent_run_id] += 1
+        self._start(
+            run_id,
+            parent_run_id,
+            "llm",
+            kwargs.get("name") or (serialized or {}).get("name", "chat_model"),
+            (metadata or {}).get("langgraph_node"),
+            iteration=self._llm_calls[parent_run_id],
+            input_messages=len(messages[0]) if messages else 0,
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        usage: dict = {}
+        tool_calls = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    usage = getattr(message, "usage_metadata", None) or usage
+                    tool_calls += len(getattr(message, "tool_calls", []) or [])
+        if not usage:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            usage = {
+                "input_tokens": token_usage.get("prompt_tokens"),
+                "output_tokens": token_usage.get("completion_tokens"),
+                "total_tokens": token_usage.get("total_tokens"),
+            }
+        self._end(
+            run_id,
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+            total_tokens=usage.get("total_tokens"),
+            tool_calls=tool_calls,
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+    # ── tools ──
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._start(
+            run_id,
+            parent_run_id,
+            "tool",
+            kwargs.get("name") or (serialized or {}).get("name", "tool"),
+            (metadata or {}).get("langgraph_node"),
+        )
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+    # ── results ──
+
+    def finish(self, status: str = "ok") -> list[dict]:
+        """Close the trace, record metrics, export if configured, and
+        return the spans as dicts ordered by start time."""
+        if not self._finished:
+            self._finished = True
+            self.spans.sort(key=lambda s: s.start_ms)
+            record_metrics(self.spans, status)
+            export_otel(self.trace_id, self.spans)
+        return [span.as_dict() for span in self.spans]
+
+    def summary(self) -> str:
+        """One log line with node timings and LLM/tool totals."""
+        nodes = [f"{s.name} {s.duration_ms:.0f}ms" for s in self.spans if s.kind == "node"]
+        llm = [s for s in self.spans if s.kind == "llm"]
+        tools = [s for s in self.spans if s.kind == "tool"]
+        tokens = sum(s.attributes.get("total_tokens") or 0 for s in llm)
+        return (
+            f"{', '.join(nodes)} | llm {len(llm)} calls {sum(s.duration_ms for s in llm):.0f}ms"
+            f" {tokens} tokens | tools {len(tools)} calls {sum(s.duration_ms for s in tools):.0f}ms"
+        )
+
+
+def record_metrics(spans: list[Span], status: str = "ok") -> None:
+    METRICS.inc("analyses_total", help="Completed analysis runs.", status=status)
+    for span in spans:
+        METRICS.observe(
+            "span_duration_seconds",
+            span.duration_ms / 1000,
+            help="Duration of graph, node, LLM and tool spans.",
+            kind=span.kind,
+            name=span.name,
+        )
+        if span.kind == "llm":
+            for kind in ("input", "output"):
+                tokens = span.attributes.get(f"{kind}_tokens")
+                if tokens:
+                    METRICS.inc(
+                        "llm_tokens_total",
+                        tokens,
+                        help="Tokens consumed by LLM calls.",
+                        node=span.node or "",
+                        type=kind,
+                    )
+
+
+_tracer = None
+_tracer_configured = False
+_tracer_lock = threading.Lock()
+
+
+def _get_tracer():
+    """Return an OpenTelemetry tracer if export is configured and available."""
+    global _tracer, _tracer_configured
+    if _tracer_configured:
+        return _tracer
+    with _tracer_lock:
+        if _tracer_configured:
+            return _tracer
+        _tracer_configured = True
+        if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            return None
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            print(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but OpenTelemetry is not installed; "
+                "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"
+            )
+            return None
+
+        provider = TracerProvider(resource=Resource.create({
+            "service.name": os.getenv("OTEL_SERVICE_NAME", "medical-ai-assistant"),
+        }))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        _tracer = provider.get_tracer("medical-ai-assistant")
+        return _tracer
+
+
+def export_otel(trace_id: str, spans: list[Span]) -> None:
+    """Replay finished spans into OpenTelemetry, keeping the parent links."""
+    tracer = _get_tracer()
+    if tracer is None:
+        return
+    from opentelemetry import trace
+
+    started = {}
+    for span in spans:  # sorted by start, so parents come first
+        parent = started.get(span.parent_id)
+        otel_span = tracer.start_span(
+            f"{span.kind} {span.name}",
+            context=trace.set_span_in_context(parent) if parent is not None else None,
+            start_time=span.start_ns,
+            attributes={
+                "analysis.trace_id": trace_id,
+                "span.kind": span.kind,
+                **({"graph.node": span.node} if span.node else {}),
+                **{
+                    f"analysis.{k}": v
+                    for k, v in span.attributes.items()
+                    if isinstance(v, (str, bool, int, float))
+                },
+            },
+        )
+        started[span.id] = otel_span
+    for span in spans:
+        started[span.id].end(end_time=span.start_ns + int(span.duration_ms * 1_000_000))
@@ -3,23 +3,13 @@
 from langchain_core.tools import tool
 
 from src.data.drug_database import check_interactions, lookup_drug
+from src.data.medications import canonical_drug_names
 
 
-@tool
-def lookup_drug_info(drug_name: str) -> str:
-    """Look up detailed information about a specific drug.
-
-    Returns drug class, indications, side effects, and warnings.
-
-    Args:
-        drug_name: The name of the drug (e.g. "metformin", "lisinopril").
-    """
-    info = lookup_drug(drug_name)
-    if info is None:
-        return f"Drug '{drug_name}' not found in the database."
-
+def format_drug_info(name: str, info: dict) -> str:
+    """Render a drug database entry as tool output."""
     return (
-        f"Drug: {drug_name.title()}\n"
+        f"Drug: {name.title()}\n"
         f"Class: {info['class']}\n"
         f"Indications: {', '.join(info['indications'])}\n"
         f"Common Side Effects: {', '.join(info['common_side_effects'])}\n"
@@ -27,15 +17,8 @@ def lookup_drug_info(drug_name: str) -> str:
     )
 
 
-@tool
-def check_drug_interactions(drug_names: list[str]) -> str:
-    """Check for known drug-drug interactions among a list of medications.
-
-    Args:
-        drug_names: List of drug names to check for interactions
-                    (e.g. ["warfarin", "aspirin"]).
-    """
-    interactions = check_interactions(drug_names)
+def format_interactions(interactions: list[dict], drug_names: list[str]) -> str:
+    """Render interaction check results as tool output."""
     if not interactions:
         return f"No known interactions found among: {', '.join(drug_names)}."
 
@@ -46,3 +29,40 @@ def check_drug_interactions(drug_names: list[str]) -> str:
             f"  {ix['description']}\n"
         )
     return "\n".join(output_parts)
+
+
+@tool
+def lookup_drug_info(drug_name: str) -> str:
+    """Look up detailed information about a specific drug.
+
+    Returns drug class, indications, side effects, and warnings. A
+    combination product (e.g. "Advair") returns an entry per ingredient.
+
+    Args:
+        drug_name: The name of the drug as generic, brand, or as written in
+                   the chart (e.g. "metformin", "Coumadin", "lisinopril 20mg daily").
+    """
+    names = canonical_drug_names([drug_name]) or [drug_name]
+    entries = []
+    for name in names:
+        info = lookup_drug(name)
+        if info is None:
+            entries.append(f"Drug '{name}' not found in the database.\n")
+        else:
+            entries.append(format_drug_info(name, info))
+    if len(names) == 1 and lookup_drug(names[0]) is None:
+        return f"Drug '{drug_name}' not found in the database."
+    return "\n".join(entries)
+
+
+@tool
+def check_drug_interactions(drug_names: list[str]) -> str:
+    """Check for known drug-drug interactions among a list of medications.
+
+    Args:
+        drug_names: List of drug names to check for interactions, as generic
+                    names, brands, or chart entries
+                    (e.g. ["warfarin", "aspirin 81mg daily"]).
+    """
+    interactions = check_interactions(canonical_drug_names(drug_names))
+    return format_interactions(interactions, drug_names)
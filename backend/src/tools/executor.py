@@ -0,0 +1,55 @@
+"""Shared tool registry and concurrent execution of LLM tool calls."""
+
+from __future__ import annotations
+
+import asyncio
+
+from langchain_core.messages import ToolMessage
+from langchain_core.messages.tool import ToolCall
+from langchain_core.tools import BaseTool
+
+from src.resilience import call_tool, describe
+from src.tools.drug_interactions import check_drug_interactions, lookup_drug_info
+from src.tools.medical_search import search_medical_literature
+from src.tools.patient_records import get_patient_record, search_patient_records
+
+ALL_TOOLS: list[BaseTool] = [
+    get_patient_record,
+    search_patient_records,
+    search_medical_literature,
+    lookup_drug_info,
+    check_drug_interactions,
+]
+
+TOOLS_BY_NAME: dict[str, BaseTool] = {t.name: t for t in ALL_TOOLS}
+
+
+async def _run_tool_call(tool_call: ToolCall) -> ToolMessage:
+    tool_fn = TOOLS_BY_NAME.get(tool_call["name"])
+    if tool_fn is None:
+        return ToolMessage(
+            content=f"Unknown tool '{tool_call['name']}'. Available tools: {', '.join(TOOLS_BY_NAME)}",
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+    try:
+        result = await call_tool(lambda: tool_fn.ainvoke(tool_call["args"]))
+    except Exception as e:
+        return ToolMessage(
+            content=f"Tool '{tool_call['name']}' failed: {describe(e)}",
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+    return ToolMessage(content=result, tool_call_id=tool_call["id"])
+
+
+async def execute_tool_calls(tool_calls: list[ToolCall]) -> list[ToolMessage]:
+    """Run every tool call from one LLM turn concurrently.
+
+    Synchronous tools are dispatched to the default thread pool by
+    ``ainvoke``. Results are returned in the same order as ``tool_calls``
+    so the message history stays deterministic. Each call runs under the
+    tool timeout/retry policy; a call that still fails comes back as an
+    error ``ToolMessage`` so the agent can carry on without it.
+    """
+    return list(await asyncio.gather(*(_run_tool_call(tc) for tc in tool_calls)))
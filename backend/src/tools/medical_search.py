@@ -9,6 +9,8 @@ from src.data.medical_articles import search_articles
 def search_medical_literature(query: str) -> str:
     """Search medical literature for articles matching the query.
 
+    Returns the most relevant articles first.
+
     Use this to find clinical guidelines, treatment evidence, and medical
     research relevant to a patient's condition. Provide keywords like
     disease names, symptoms, or drug names.
@@ -19,9 +21,13 @@ def search_medical_literature(query: str) -> str:
     results = search_articles(query)
     if not results:
         return "No articles found matching the query."
+    return format_articles(results)
+
 
+def format_articles(articles: list[dict]) -> str:
+    """Render articles as "[ID] Title (Year)" headlines with their abstracts."""
     output_parts = []
-    for article in results:
+    for article in articles:
         output_parts.append(
             f"[{article['id']}] {article['title']} ({article['year']})\n"
             f"  {article['abstract']}\n"
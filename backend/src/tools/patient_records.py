@@ -4,24 +4,27 @@ import json
 
 from langchain_core.tools import tool
 
-from src.data.patient_database import get_patient, list_all_patient_ids, search_patients
+from src.data.patient_database import (
+    count_patients,
+    get_patient,
+    list_all_patient_ids,
+    search_patients,
+)
 
+MAX_LISTED_IDS = 20
+MAX_SEARCH_RESULTS = 20
 
-@tool
-def get_patient_record(patient_id: str) -> str:
-    """Retrieve a patient's full medical record by their ID.
 
-    Returns demographics, conditions, medications, allergies, recent labs,
-    and visit history.
+def _available_ids() -> str:
+    """List patient IDs for "not found" messages, truncated for large stores."""
+    ids = list_all_patient_ids(MAX_LISTED_IDS)
+    total = count_patients()
+    suffix = f", ... ({total} total)" if total > len(ids) else ""
+    return ", ".join(ids) + suffix
 
-    Args:
-        patient_id: The patient identifier (e.g. "P-1001").
-    """
-    patient = get_patient(patient_id)
-    if patient is None:
-        available = ", ".join(list_all_patient_ids())
-        return f"Patient '{patient_id}' not found. Available IDs: {available}"
 
+def format_patient_record(patient: dict) -> str:
+    """Render a patient record as the text returned by ``get_patient_record``."""
     labs = "\n".join(f"    {k}: {v}" for k, v in patient["recent_labs"].items())
     visits = "\n".join(
         f"    [{v['date']}] {v['reason']} — {v['notes']}"
@@ -39,6 +42,23 @@ def get_patient_record(patient_id: str) -> str:
     )
 
 
+@tool
+def get_patient_record(patient_id: str) -> str:
+    """Retrieve a patient's full medical record by their ID.
+
+    Returns demographics, conditions, medications, allergies, recent labs,
+    and visit history.
+
+    Args:
+        patient_id: The patient identifier (e.g. "P-1001").
+    """
+    patient = get_patient(patient_id)
+    if patient is None:
+        return f"Patient '{patient_id}' not found. Available IDs: {_available_ids()}"
+
+    return format_patient_record(patient)
+
+
 @tool
 def search_patient_records(query: str) -> str:
     """Search patient records by name or condition.
@@ -46,10 +66,9 @@ def search_patient_records(query: str) -> str:
     Args:
         query: Patient name or condition to search for (e.g. "Garcia", "Diabetes").
     """
-    results = search_patients(query)
+    results = search_patients(query, limit=MAX_SEARCH_RESULTS)
     if not results:
-        available = ", ".join(list_all_patient_ids())
-        return f"No patients found matching '{query}'. Available IDs: {available}"
+        return f"No patients found matching '{query}'. Available IDs: {_available_ids()}"
 
     output_parts = []
     for p in results:
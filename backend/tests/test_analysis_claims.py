@@ -0,0 +1,50 @@
+"""A resume or re-run of an analysis that is still running is refused."""
+
+import asyncio
+import os
+
+import httpx
+
+from src import registry
+from src.checkpoints import analysis_config, is_running
+from src.graph import initial_state
+from src.resilience import ainvoke_resumable
+from src.scripted_llm import ScriptedChatModel
+
+
+def test_resume_and_rerun_conflict_while_running(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHECKPOINTER", "sqlite")
+    monkeypatch.setenv("CHECKPOINT_DB_PATH", os.fspath(tmp_path / "checkpoints.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE", "off")
+    from api import app
+    from src.data.patient_database import get_patient
+
+    async def scenario():
+        registry.reset()
+        registry._llm = ScriptedChatModel(latency=0.3)
+        graph = registry.get_resumable_graph()
+        run = asyncio.create_task(ainvoke_resumable(
+            graph,
+            initial_state("P-1001", patient_record=get_patient("P-1001")),
+            config=analysis_config("slow-run"),
+        ))
+        while not is_running("slow-run"):
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)  # let the first checkpoints land
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            status = (await client.get("/api/analyses/slow-run")).json()["status"]
+            resume = await client.post("/api/analyses/slow-run/resume")
+            rerun = await client.post("/api/analyses/slow-run/rerun", json={"stage": "diagnosis"})
+            await run
+            after = await client.post("/api/analyses/slow-run/rerun", json={"stage": "care_plan"})
+        await registry.aclose()
+        return status, resume, rerun, after
+
+    status, resume, rerun, after = asyncio.run(scenario())
+    assert status == "running"
+    assert resume.status_code == 409 and "already running" in resume.json()["detail"]
+    assert rerun.status_code == 409 and "already running" in rerun.json()["detail"]
+    assert after.status_code == 200
+    assert not is_running("slow-run")
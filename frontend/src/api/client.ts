@@ -21,7 +21,20 @@ export interface PatientDetailed extends Patient {
     }>;
 }
 
+export interface TimingSpan {
+    id: string;
+    parent_id: string | null;
+    kind: 'graph' | 'node' | 'llm' | 'tool';
+    name: string;
+    node: string | null;
+    start_ms: number;
+    duration_ms: number;
+    attributes: { [key: string]: string | number };
+}
+
 export interface AnalysisResult {
+    analysis_id?: string;
+    coalesced?: boolean;
     patient_info: PatientDetailed;
     intake_summary: string;
     diagnosis: string;
@@ -30,11 +43,22 @@ export interface AnalysisResult {
     search_results?: string;
     processing_time: number;
     agent_logs: string[];
+    spans?: TimingSpan[];
 }
 
-export async function fetchPatients(): Promise<Patient[]> {
+export interface PatientPage {
+    items: Patient[];
+    next_cursor: string | null;
+}
+
+export async function fetchPatients(cursor?: string | null): Promise<PatientPage> {
     try {
-        const response = await fetch(`${API_BASE}/api/patients`);
+        const params = new URLSearchParams();
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        const query = params.toString();
+        const response = await fetch(`${API_BASE}/api/patients${query ? `?${query}` : ''}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -78,4 +102,86 @@ export async function analyzePatient(patientId: string): Promise<AnalysisResult>
         console.error("Error analyzing patient:", error);
         throw error;
     }
-}
\ No newline at end of file
+}
+
+export type AnalysisStreamEvent =
+    | { type: "start"; patient_id: string }
+    | { type: "node_start"; node: string }
+    | { type: "node_end"; node: string; duration_ms: number; output: { [key: string]: unknown } }
+    | { type: "tool_start"; node: string; tool: string; input: unknown }
+    | { type: "tool_end"; node: string; tool: string; duration_ms: number }
+    | { type: "token"; node: string; text: string }
+    | ({ type: "complete" } & AnalysisResult)
+    | { type: "error"; detail: string };
+
+function parseSseFrame(frame: string): AnalysisStreamEvent | null {
+    let eventType = "message";
+    const dataLines: string[] = [];
+    for (const line of frame.split("\n")) {
+        if (line.startsWith("event:")) {
+            eventType = line.slice(6).trim();
+        } else if (line.startsWith("data:")) {
+            dataLines.push(line.slice(5).trim());
+        }
+    }
+    if (dataLines.length === 0) {
+        return null;
+    }
+    return { type: eventType, ...JSON.parse(dataLines.join("\n")) } as AnalysisStreamEvent;
+}
+
+export async function analyzePatientStream(
+    patientId: string,
+    onEvent: (event: AnalysisStreamEvent) => void
+): Promise<AnalysisResult> {
+    const response = await fetch(`${API_BASE}/api/analyze/stream`, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            Accept: "text/event-stream",
+        },
+        body: JSON.stringify({ patient_id: patientId }),
+    });
+
+    if (!response.ok || !response.body) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || `HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let result: AnalysisResult | null = null;
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf("\n\n");
+        while (boundary !== -1) {
+            const event = parseSseFrame(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf("\n\n");
+
+            if (!event) {
+                continue;
+            }
+            onEvent(event);
+            if (event.type === "error") {
+                throw new Error(event.detail);
+            }
+            if (event.type === "complete") {
+                const { type, ...rest } = event;
+                result = rest;
+            }
+        }
+    }
+
+    if (!result) {
+        throw new Error("Analysis stream ended before completion");
+    }
+    return result;
+}
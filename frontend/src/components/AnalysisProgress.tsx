@@ -1,26 +1,114 @@
 import React from 'react';
+import { AnalysisStreamEvent } from '../api/client';
 
-export const AnalysisProgress: React.FC = () => {
+type StepStatus = 'waiting' | 'active' | 'completed';
+
+interface ToolCall {
+    tool: string;
+    durationMs?: number;
+}
+
+interface StepState {
+    status: StepStatus;
+    durationMs?: number;
+    tools: ToolCall[];
+    text: string;
+}
+
+export interface ProgressState {
+    steps: { [node: string]: StepState };
+}
+
+export const AGENT_STEPS: Array<{ node: string; label: string }> = [
+    { node: 'intake_agent', label: 'Intake Agent - Retrieving patient record' },
+    { node: 'medication_safety', label: 'Medication Safety - Checking drug interactions' },
+    { node: 'diagnosis_agent', label: 'Diagnosis Agent - Searching medical literature' },
+    { node: 'care_plan_agent', label: 'Care Plan Agent - Generating care plan' },
+];
+
+export function initialProgress(): ProgressState {
+    const steps: { [node: string]: StepState } = {};
+    for (const { node } of AGENT_STEPS) {
+        steps[node] = { status: 'waiting', tools: [], text: '' };
+    }
+    return { steps };
+}
+
+export function reduceProgress(state: ProgressState, event: AnalysisStreamEvent): ProgressState {
+    if (!('node' in event) || !state.steps[event.node]) {
+        return state;
+    }
+    const step = { ...state.steps[event.node] };
+
+    switch (event.type) {
+        case 'node_start':
+            step.status = 'active';
+            break;
+        case 'node_end':
+            step.status = 'completed';
+            step.durationMs = event.duration_ms;
+            break;
+        case 'tool_start':
+            step.tools = [...step.tools, { tool: event.tool }];
+            break;
+        case 'tool_end': {
+            const index = step.tools.findIndex(t => t.tool === event.tool && t.durationMs === undefined);
+            if (index !== -1) {
+                step.tools = step.tools.map((t, i) => (i === index ? { ...t, durationMs: event.duration_ms } : t));
+            }
+            break;
+        }
+        case 'token':
+            step.text += event.text;
+            break;
+    }
+
+    return { steps: { ...state.steps, [event.node]: step } };
+}
+
+interface Props {
+    progress: ProgressState;
+}
+
+export const AnalysisProgress: React.FC<Props> = ({ progress }) => {
     return (
         <div className="analysis-progress">
             <h2>Analyzing Patient...</h2>
 
             <div className="progress-steps">
-                <div className="step completed">
-                    Intake Agent - Retrieving patient record
-                </div>
-                <div className="step active">
-                    Diagnosis Agent - Searching medical literature
-                </div>
-                <div className="step waiting">
-                    Care Plan Agent - Waiting to start
-                </div>
+                {AGENT_STEPS.map(({ node, label }) => {
+                    const step = progress.steps[node];
+                    return (
+                        <div key={node} className={`step ${step.status}`}>
+                            <div style={{ width: '100%' }}>
+                                <div>
+                                    {label}
+                                    {step.durationMs !== undefined && (
+                                        <span style={{ color: '#6B7280' }}>
+                                            {' '}({(step.durationMs / 1000).toFixed(1)}s)
+                                        </span>
+                                    )}
+                                </div>
+                                {step.tools.map((t, i) => (
+                                    <div key={i} style={{ fontSize: '0.875rem', color: '#6B7280' }}>
+                                        🔧 {t.tool}
+                                        {t.durationMs !== undefined ? ` — ${t.durationMs.toFixed(0)}ms` : ' …'}
+                                    </div>
+                                ))}
+                                {step.text && (
+                                    <div style={{ whiteSpace: 'pre-wrap', fontSize: '0.875rem', marginTop: '0.5rem' }}>
+                                        {step.text}
+                                    </div>
+                                )}
+                            </div>
+                        </div>
+                    );
+                })}
             </div>
 
             <div className="loading mt-4">
                 <div className="loading-spinner"></div>
-                <p>This may take 20-30 seconds...</p>
             </div>
         </div>
     );
-};
\ No newline at end of file
+};
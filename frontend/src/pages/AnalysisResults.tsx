@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { analyzePatient, AnalysisResult } from '../api/client';
-import { AnalysisProgress } from '../components/AnalysisProgress';
+import { analyzePatientStream, AnalysisResult } from '../api/client';
+import { AnalysisProgress, initialProgress, reduceProgress } from '../components/AnalysisProgress';
 import { IntakeSummary } from '../components/IntakeSummary';
 import { DiagnosisView } from '../components/DiagnosisView';
 import { CarePlanView } from '../components/CarePlanView';
@@ -15,10 +15,12 @@ export const AnalysisResults: React.FC = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [activeTab, setActiveTab] = useState<Tab>('intake');
+    const [progress, setProgress] = useState(initialProgress);
 
     useEffect(() => {
         if (patientId) {
-            analyzePatient(patientId)
+            setProgress(initialProgress());
+            analyzePatientStream(patientId, event => setProgress(prev => reduceProgress(prev, event)))
                 .then(setResult)
                 .catch(err => {
                     console.error('Analysis failed:', err);
@@ -29,7 +31,7 @@ export const AnalysisResults: React.FC = () => {
     }, [patientId]);
 
     if (loading) {
-        return <AnalysisProgress />;
+        return <AnalysisProgress progress={progress} />;
     }
 
     if (error) {
@@ -7,11 +7,16 @@ export const PatientSelection: React.FC = () => {
     const [patients, setPatients] = useState<Patient[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const navigate = useNavigate();
 
     useEffect(() => {
         fetchPatients()
-            .then(setPatients)
+            .then(page => {
+                setPatients(page.items);
+                setNextCursor(page.next_cursor);
+            })
             .catch(err => {
                 console.error('Failed to load patients:', err);
                 setError('Failed to load patients. Is the backend running?');
@@ -19,6 +24,17 @@ export const PatientSelection: React.FC = () => {
             .finally(() => setLoading(false));
     }, []);
 
+    const handleLoadMore = () => {
+        setLoadingMore(true);
+        fetchPatients(nextCursor)
+            .then(page => {
+                setPatients(prev => [...prev, ...page.items]);
+                setNextCursor(page.next_cursor);
+            })
+            .catch(err => console.error('Failed to load more patients:', err))
+            .finally(() => setLoadingMore(false));
+    };
+
     const handleAnalyze = (patientId: string) => {
         navigate(`/analyze/${patientId}`);
     };
@@ -59,6 +75,14 @@ export const PatientSelection: React.FC = () => {
                     />
                 ))}
             </div>
+
+            {nextCursor && (
+                <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+                    <button className="analyze-btn" onClick={handleLoadMore} disabled={loadingMore}>
+                        {loadingMore ? 'Loading...' : 'Load more patients'}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
\ No newline at end of file